@@ -0,0 +1,289 @@
+"""
+Background refill of the question bank for the Quiz Generator system.
+The worker keeps the inventory of every (passage, standard, difficulty) key
+between a low and a high watermark, generating validated questions and their
+explanations at a steady pace during off-peak hours and within a daily token
+budget, so interactive quizzes can be served from the bank.
+"""
+
+import asyncio
+import datetime
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Import the shared question bank
+from question_bank import question_bank
+
+# Import process-wide token accounting
+from claude_client import billed_tokens
+
+
+def parse_hour_window(window: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an hour window such as "22-6" (which wraps past midnight).
+    
+    Args:
+        window: "START-END" in local 24-hour clock hours, or an empty string
+    
+    Returns:
+        (start, end) tuple, or None if the window is empty
+    """
+    if not window.strip():
+        return None
+    try:
+        start, end = (int(part) % 24 for part in window.split("-", 1))
+    except ValueError:
+        raise ValueError(f"Invalid off-peak window '{window}', expected START-END hours such as 22-6")
+    return start, end
+
+
+class BankRefillWorker:
+    """
+    Tops up the question bank from a long-running background loop.
+    
+    Each scan counts the banked questions of every key in scope and queues the
+    keys below the low watermark, emptiest first. Each queued key is filled up to
+    the high watermark, one question at a time, with question starts spaced
+    evenly over the hour.
+    """
+    
+    def __init__(self,
+                 generator: Any,
+                 standards: Optional[List[str]] = None,
+                 low_watermark: int = config.REFILL_LOW_WATERMARK,
+                 high_watermark: int = config.REFILL_HIGH_WATERMARK,
+                 off_peak_hours: str = config.REFILL_OFF_PEAK_HOURS,
+                 max_per_hour: int = config.REFILL_MAX_PER_HOUR,
+                 daily_token_budget: int = config.REFILL_DAILY_TOKEN_BUDGET,
+                 interval: float = config.REFILL_INTERVAL,
+                 previous_limit: int = config.REFILL_PREVIOUS_QUESTIONS):
+        """
+        Initialize the worker.
+        
+        Args:
+            generator: A QuizGenerator with its data loaded
+            standards: Standards to keep stocked (default: REFILL_STANDARDS, or every standard with passages)
+            low_watermark: Refill a key once it holds fewer questions than this
+            high_watermark: Fill a key up to this many questions
+            off_peak_hours: Local hour window in which to generate, such as "22-6"; empty means any time
+            max_per_hour: Most questions started per hour (0 means unpaced)
+            daily_token_budget: Most tokens billed per day (0 means unlimited)
+            interval: Seconds between inventory scans
+            previous_limit: Most recent questions of a key that new ones must not repeat (0 means all)
+        """
+        if not question_bank.storing:
+            raise ValueError("Bank refill needs QUESTION_BANK_MODE set to store or serve")
+        if high_watermark < low_watermark:
+            raise ValueError("REFILL_HIGH_WATERMARK must not be below REFILL_LOW_WATERMARK")
+        
+        self.generator = generator
+        if not standards:
+            standards = [s.strip() for s in config.REFILL_STANDARDS.split(",") if s.strip()]
+        self.standards = standards or sorted(
+            standard for standard, passages in generator.passages_by_standard.items() if passages
+        )
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.off_peak = parse_hour_window(off_peak_hours)
+        self.min_spacing = 3600.0 / max_per_hour if max_per_hour > 0 else 0.0
+        self.daily_token_budget = daily_token_budget
+        self.interval = interval
+        self.previous_limit = previous_limit
+        
+        self._last_start = None
+        self._budget_day = None
+        self._day_start_tokens = 0
+    
+    def in_off_peak(self, now: Optional[datetime.datetime] = None) -> bool:
+        """
+        Check whether generation is allowed at this hour.
+        
+        Args:
+            now: Time to check (default: the current local time)
+        
+        Returns:
+            True if inside the off-peak window, or if no window is configured
+        """
+        if self.off_peak is None:
+            return True
+        start, end = self.off_peak
+        hour = (now or datetime.datetime.now()).hour
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+    
+    def tokens_spent_today(self) -> int:
+        """
+        Tokens billed since the start of the current day.
+        
+        Returns:
+            Token count
+        """
+        today = datetime.date.today()
+        if self._budget_day != today:
+            self._budget_day = today
+            self._day_start_tokens = billed_tokens()
+        return billed_tokens() - self._day_start_tokens
+    
+    def budget_left(self) -> bool:
+        """
+        Check whether today's token budget still has room.
+        
+        Returns:
+            True if more questions may be generated today
+        """
+        return self.daily_token_budget <= 0 or self.tokens_spent_today() < self.daily_token_budget
+    
+    def plan(self) -> List[Dict[str, Any]]:
+        """
+        Find the keys below the low watermark.
+        
+        Returns:
+            Refill targets (passage, standard, difficulty name and value, example type,
+            current count, needed), emptiest first
+        """
+        targets = []
+        for standard_id in self.standards:
+            for passage in self.generator.passages_by_standard.get(standard_id, []):
+                example_type = "writing" if passage.get("type", "") == "Draft" else "reading"
+                for difficulty_name, difficulty_value in config.DIFFICULTY_MAP.items():
+                    if not self.generator.examples_by_standard_and_difficulty.get((standard_id, difficulty_value)):
+                        continue
+                    count = question_bank.count(passage.get("id", ""), standard_id, difficulty_value, example_type)
+                    if count < self.low_watermark:
+                        targets.append({
+                            "passage": passage,
+                            "standard_id": standard_id,
+                            "difficulty_name": difficulty_name,
+                            "difficulty_value": difficulty_value,
+                            "example_type": example_type,
+                            "count": count,
+                            "needed": self.high_watermark - count
+                        })
+        
+        targets.sort(key=lambda target: target["count"])
+        return targets
+    
+    async def _pace(self) -> None:
+        """
+        Wait until the next question may start under REFILL_MAX_PER_HOUR.
+        """
+        if self._last_start is not None and self.min_spacing:
+            wait = self._last_start + self.min_spacing - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        self._last_start = time.monotonic()
+    
+    async def refill_key(self, target: Dict[str, Any], ignore_window: bool = False) -> int:
+        """
+        Generate questions for one key until it reaches the high watermark.
+        New questions must not repeat the most recent ones banked under the key
+        (previous_limit of them, which keeps the prompt and QC input bounded as
+        the key grows), and a question the bank already holds does not count as added.
+        
+        Args:
+            target: Refill target from plan()
+            ignore_window: Keep generating outside the off-peak window
+        
+        Returns:
+            Number of questions added to the bank
+        """
+        passage = target["passage"]
+        standard_id = target["standard_id"]
+        difficulty_name = target["difficulty_name"]
+        banked = question_bank.questions(
+            passage.get("id", ""), standard_id, target["difficulty_value"], target["example_type"]
+        )
+        added = []
+        
+        for _ in range(target["needed"] * 2):  # room for failed attempts
+            if len(added) >= target["needed"]:
+                break
+            if not self.budget_left() or not (ignore_window or self.in_off_peak()):
+                break
+            
+            # A fresh slot per question so each one draws its own example
+            slots = self.generator._build_question_slots(passage, {standard_id: {difficulty_name: 1}})
+            if not slots:
+                break
+            slot = slots[0]
+            
+            previous_questions = banked + added
+            if self.previous_limit > 0:
+                previous_questions = previous_questions[-self.previous_limit:]
+            
+            await self._pace()
+            question = await self.generator.generate_question_for_standard_and_difficulty(
+                passage=passage,
+                standard_id=standard_id,
+                difficulty_level=slot["difficulty_value"],
+                example_question=slot["example"],
+                previous_questions=previous_questions,
+                task_id=f"refill_{slot['task_id']}"
+            )
+            # Budget fallbacks did not pass QC, so they are not banked
+            if not question or question.get("_budget_fallback"):
+                continue
+            
+            bank_id, inserted = question_bank.store(
+                passage.get("id", ""), standard_id, slot["difficulty_value"], slot["example_type"],
+                self.generator._public_question(question), question.get("_quality_checks")
+            )
+            if bank_id is None or not inserted:
+                continue
+            question["_bank_id"] = bank_id
+            added.append(question)
+            
+            # Explanations are banked too, so served quizzes make no Claude calls at all
+            await self.generator.generate_explanation(question, passage)
+        
+        return len(added)
+    
+    async def refill_once(self, ignore_window: bool = False) -> int:
+        """
+        Run one scan and refill every key below the low watermark.
+        
+        Args:
+            ignore_window: Generate even outside the off-peak window
+        
+        Returns:
+            Number of questions added to the bank
+        """
+        targets = self.plan()
+        logger.info(f"Question bank refill: {len(targets)} keys below the low watermark of {self.low_watermark}")
+        
+        added = 0
+        for target in targets:
+            if not self.budget_left():
+                logger.info(f"Daily refill token budget of {self.daily_token_budget} reached")
+                break
+            if not (ignore_window or self.in_off_peak()):
+                logger.info("Off-peak window closed, pausing refill")
+                break
+            added += await self.refill_key(target, ignore_window)
+        
+        logger.info(f"Question bank refill added {added} questions "
+                    f"({self.tokens_spent_today()} tokens billed today)")
+        return added
+    
+    async def run(self) -> None:
+        """
+        Refill the bank forever, scanning every REFILL_INTERVAL seconds.
+        """
+        logger.info(f"Starting question bank refill for {len(self.standards)} standards "
+                    f"(watermarks {self.low_watermark}/{self.high_watermark})")
+        while True:
+            if self.in_off_peak() and self.budget_left():
+                try:
+                    await self.refill_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Question bank refill failed: {str(e)}")
+            await asyncio.sleep(self.interval)
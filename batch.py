@@ -0,0 +1,211 @@
+"""
+Batch quiz generation for the Quiz Generator system.
+Runs every quiz of a JSONL manifest inside one process, so they share the
+loaded data, the Claude client pool, the admission controller and the rate
+limiter, and records each quiz in a results file as soon as it finishes.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Import the checkpoint journal
+from checkpoint import QuizJournal, job_key
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Read a batch manifest.
+    
+    Each non-empty line is a JSON object with "lesson" or "standard", and
+    optionally "difficulty" (default 1), "num_questions" (default 6), "output"
+    (path of the quiz file, default OUTPUT_DIR/<manifest>_<id>.json) and "id" (default: the line number).
+    
+    Args:
+        manifest_path: Path of the JSONL manifest
+    
+    Returns:
+        List of job dictionaries; lines that cannot be used carry an "error" key
+    """
+    jobs = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                jobs.append({"id": str(line_number), "error": f"Invalid JSON on line {line_number}: {str(e)}"})
+                continue
+            if not isinstance(entry, dict):
+                jobs.append({"id": str(line_number), "error": f"Line {line_number} is not a JSON object"})
+                continue
+            
+            job = {
+                "id": str(entry.get("id", line_number)),
+                "lesson": entry.get("lesson"),
+                "standard": entry.get("standard"),
+                "difficulty": entry.get("difficulty", 1),
+                "num_questions": entry.get("num_questions", 6),
+                "output": entry.get("output")
+            }
+            if bool(job["lesson"]) == bool(job["standard"]):
+                job["error"] = "Exactly one of lesson or standard is required"
+            elif job["difficulty"] not in (1, 2, 3):
+                job["error"] = f"Invalid difficulty {job['difficulty']!r}, expected 1, 2 or 3"
+            elif not isinstance(job["num_questions"], int) or not 1 <= job["num_questions"] <= 12:
+                job["error"] = "num_questions must be between 1 and 12"
+            jobs.append(job)
+    
+    return jobs
+
+
+def completed_job_ids(results_path: str) -> set:
+    """
+    IDs of the jobs that already succeeded according to a results file.
+    
+    Args:
+        results_path: Path of the JSONL results file
+    
+    Returns:
+        Set of job IDs
+    """
+    completed = set()
+    if not os.path.exists(results_path):
+        return completed
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if result.get("status") == "ok":
+                completed.add(result.get("id"))
+    return completed
+
+
+def default_results_path(manifest_path: str) -> str:
+    """
+    Results file used when none is given: next to the manifest.
+    
+    Args:
+        manifest_path: Path of the JSONL manifest
+    
+    Returns:
+        Path of the results file
+    """
+    root, _ = os.path.splitext(manifest_path)
+    return f"{root}.results.jsonl"
+
+
+async def run_batch(generator: Any,
+                    manifest_path: str,
+                    results_path: str,
+                    save: Callable[[Dict[str, Any], Optional[str]], str],
+                    concurrency: int = config.BATCH_CONCURRENCY,
+                    resume: bool = False) -> Dict[str, int]:
+    """
+    Generate every quiz in a manifest with at most `concurrency` quizzes in flight.
+    
+    Claude calls from all quizzes still go through the shared admission
+    controller (MAX_WORKERS) and rate limiter. One JSON line per quiz is
+    appended to the results file in completion order.
+    
+    A quiz that came back with an error in its metadata (a deadline or a
+    generation failure) is recorded as partial rather than ok. With CHECKPOINTS
+    on, every job keeps a checkpoint journal. On resume, jobs already marked ok
+    in the results file are skipped; partial and unfinished ones continue from
+    their journals.
+    
+    Args:
+        generator: A QuizGenerator with its data loaded
+        manifest_path: Path of the JSONL manifest
+        results_path: Path of the JSONL results file
+        save: Function that saves a quiz to the given path (or a default one) and returns the path
+        concurrency: Most quizzes generated at once
+        resume: Continue an interrupted run of the same manifest
+    
+    Returns:
+        Counts of succeeded, partial and failed jobs
+    """
+    jobs = load_manifest(manifest_path)
+    manifest_name = os.path.splitext(os.path.basename(manifest_path))[0]
+    for job in jobs:
+        if not job.get("output"):
+            job["output"] = os.path.join(config.OUTPUT_DIR, f"{manifest_name}_{job['id']}.json")
+    if resume:
+        completed = completed_job_ids(results_path)
+        jobs = [job for job in jobs if job["id"] not in completed]
+        logger.info(f"Resuming batch: skipping {len(completed)} jobs already completed")
+    logger.info(f"Loaded {len(jobs)} jobs from {manifest_path}; running up to {concurrency} at once")
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+        result = {"id": job["id"], "lesson": job.get("lesson"), "standard": job.get("standard")}
+        if "error" in job:
+            result.update(status="error", error=job["error"])
+            return result
+        if job["lesson"] and job["lesson"] not in generator.standards_by_lesson:
+            result.update(status="error", error=f"Lesson '{job['lesson']}' not found")
+            return result
+        if job["standard"] and job["standard"] not in generator.lessons_by_standard:
+            result.update(status="error", error=f"Standard '{job['standard']}' not found")
+            return result
+        
+        async with semaphore:
+            start_time = time.time()
+            logger.info(f"Batch job {job['id']}: generating quiz")
+            try:
+                journal = None
+                if config.CHECKPOINTS:
+                    key = job_key(job["lesson"], job["standard"], job["difficulty"], job["num_questions"], job["id"])
+                    journal = QuizJournal.for_job(key, resume=resume)
+                quiz = await generator.generate_quiz(
+                    lesson_name=job["lesson"],
+                    standard_id=job["standard"],
+                    difficulty=job["difficulty"],
+                    num_questions=job["num_questions"],
+                    journal=journal
+                )
+                output_file = save(quiz, job["output"])
+            except Exception as e:
+                logger.error(f"Batch job {job['id']} failed: {str(e)}")
+                result.update(status="error", error=str(e), elapsed=round(time.time() - start_time, 2))
+                return result
+        
+        metadata = quiz.get("metadata", {})
+        result.update(
+            status="partial" if metadata.get("error") else "ok",
+            output=output_file,
+            num_questions_generated=metadata.get("num_questions_generated", 0),
+            elapsed=round(time.time() - start_time, 2)
+        )
+        if metadata.get("error"):
+            result["warning"] = metadata["error"]
+        return result
+    
+    counts = {"ok": 0, "partial": 0, "error": 0}
+    results_dir = os.path.dirname(results_path)
+    if results_dir and not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+    
+    with open(results_path, "a", encoding="utf-8") as results_file:
+        for finished in asyncio.as_completed([run_job(job) for job in jobs]):
+            result = await finished
+            counts[result["status"]] += 1
+            results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+            logger.info(f"Batch job {result['id']}: {result['status']} "
+                        f"({sum(counts.values())}/{len(jobs)} done)")
+    
+    return counts
@@ -0,0 +1,191 @@
+"""
+Per-slot call and token budgets for question generation.
+A budget travels with each question slot in a ContextVar. Every Claude call
+made for the slot, including its quality checks and improvements, reserves a
+call before it is sent and is charged the tokens reported in the response's
+usage, so runaway retry fan-out on hard standards is capped.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# What a slot does when its budget runs out
+POLICY_STOP = "stop"  # give up on the slot
+POLICY_BEST = "best"  # use the best-scoring candidate seen, even though it failed QC
+POLICY_REGENERATE = "regenerate"  # as stop, but skip improvements the budget cannot cover
+BUDGET_POLICIES = (POLICY_STOP, POLICY_BEST, POLICY_REGENERATE)
+
+
+class BudgetExhausted(Exception):
+    """Raised instead of making a Claude call that the slot's budget does not allow."""
+
+
+class CallBudget:
+    """
+    Limits on the Claude calls, tokens and wall time spent on one question slot.
+    A limit of 0 means unlimited.
+    """
+    
+    def __init__(self,
+                 max_calls: int = 0,
+                 max_input_tokens: int = 0,
+                 max_output_tokens: int = 0,
+                 max_seconds: float = 0,
+                 policy: str = POLICY_STOP):
+        """
+        Initialize the budget; the wall-time clock starts now.
+        
+        Args:
+            max_calls: Most Claude calls
+            max_input_tokens: Most input tokens billed at the full rate (uncached input plus cache writes)
+            max_output_tokens: Most output tokens
+            max_seconds: Most seconds of wall time
+            policy: One of stop, best or regenerate
+        """
+        if policy not in BUDGET_POLICIES:
+            logger.warning(f"Unknown slot budget policy '{policy}', using {POLICY_STOP}")
+            policy = POLICY_STOP
+        self.max_calls = max_calls
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.max_seconds = max_seconds
+        self.policy = policy
+        
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.started_at = time.monotonic()
+        
+        # Best candidate that failed QC, kept for the "best" policy
+        self.best_candidate: Optional[Dict[str, Any]] = None
+        self.best_score = -1
+    
+    @classmethod
+    def from_config(cls) -> "CallBudget":
+        """
+        Create a budget with the SLOT_* limits from the configuration.
+        
+        Returns:
+            A new budget
+        """
+        return cls(
+            max_calls=config.SLOT_MAX_CALLS,
+            max_input_tokens=config.SLOT_MAX_INPUT_TOKENS,
+            max_output_tokens=config.SLOT_MAX_OUTPUT_TOKENS,
+            max_seconds=config.SLOT_MAX_SECONDS,
+            policy=config.SLOT_BUDGET_POLICY
+        )
+    
+    def exhausted_reason(self, calls_needed: int = 1) -> Optional[str]:
+        """
+        Explain why the budget cannot cover more calls.
+        
+        Args:
+            calls_needed: Number of further calls the caller wants to make
+        
+        Returns:
+            Reason string, or None if the calls fit in the budget
+        """
+        if self.max_calls and self.calls + calls_needed > self.max_calls:
+            return f"call budget of {self.max_calls} used up"
+        if self.max_input_tokens and self.input_tokens >= self.max_input_tokens:
+            return f"input token budget of {self.max_input_tokens} used up"
+        if self.max_output_tokens and self.output_tokens >= self.max_output_tokens:
+            return f"output token budget of {self.max_output_tokens} used up"
+        if self.max_seconds and time.monotonic() - self.started_at >= self.max_seconds:
+            return f"time budget of {self.max_seconds}s used up"
+        return None
+    
+    def can_afford(self, calls_needed: int) -> bool:
+        """
+        Check whether the budget covers a number of further calls.
+        
+        Args:
+            calls_needed: Number of further calls
+        
+        Returns:
+            True if they fit
+        """
+        return self.exhausted_reason(calls_needed) is None
+    
+    def reserve_call(self) -> None:
+        """
+        Count a call that is about to be sent.
+        
+        Raises:
+            BudgetExhausted: If the budget does not allow another call
+        """
+        reason = self.exhausted_reason()
+        if reason:
+            raise BudgetExhausted(reason)
+        self.calls += 1
+    
+    def charge(self, usage: Any) -> None:
+        """
+        Charge the tokens of a response.
+        
+        Args:
+            usage: The response's usage object
+        """
+        if usage is None:
+            return
+        self.input_tokens += (getattr(usage, "input_tokens", 0) or 0) + \
+            (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+    
+    def charge_share(self, spent: "CallBudget", index: int, shares: int) -> None:
+        """
+        Charge one of several equal shares of the calls and tokens another budget
+        recorded, for calls made on behalf of several slots at once. Remainders go
+        to the lowest indexes, so the shares add up to what was spent.
+        
+        Args:
+            spent: Budget that recorded the shared calls
+            index: This budget's share, from 0 to shares - 1
+            shares: Number of budgets sharing the calls
+        """
+        def share(total: int) -> int:
+            return total // shares + (1 if index < total % shares else 0)
+        
+        self.calls += share(spent.calls)
+        self.input_tokens += share(spent.input_tokens)
+        self.output_tokens += share(spent.output_tokens)
+    
+    def offer_candidate(self, question: Dict[str, Any], validation_result: Dict[str, Any]) -> None:
+        """
+        Remember a candidate that failed QC if it scores better than the previous best.
+        The score is the number of quality checks it passed.
+        
+        Args:
+            question: The candidate question
+            validation_result: Its validation result
+        """
+        quality_checks = validation_result.get("quality_checks", {})
+        # A candidate the local pre-validation rejected is malformed, never a usable fallback
+        if not quality_checks.get("prevalidation", {}).get("passes", True):
+            return
+        score = sum(1 for check in quality_checks.values() if check.get("passes"))
+        if score > self.best_score:
+            self.best_score = score
+            self.best_candidate = dict(question, _quality_checks=quality_checks)
+    
+    def summary(self) -> str:
+        """
+        Describe what has been spent.
+        
+        Returns:
+            Human-readable summary
+        """
+        return (f"{self.calls} calls, {self.input_tokens} input and {self.output_tokens} output tokens, "
+                f"{time.monotonic() - self.started_at:.1f}s")
+
+
+# Budget of the slot being generated in the current task (inherited by its subtasks)
+current_budget: ContextVar[Optional[CallBudget]] = ContextVar("current_budget", default=None)
@@ -0,0 +1,224 @@
+"""
+Write-ahead checkpoint journal for quiz generation.
+Every accepted question (with its QC verdicts) and every explanation is
+appended to a per-job JSONL file as soon as it exists, so an interrupted quiz
+or batch can be resumed without paying for that work again.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+
+def job_key(lesson_name: Optional[str],
+            standard_id: Optional[str],
+            difficulty: int,
+            num_questions: int,
+            job_id: Optional[str] = None) -> str:
+    """
+    Build a file-safe key that identifies a quiz job by its parameters.
+    
+    Args:
+        lesson_name: Name of the lesson, if any
+        standard_id: Standard ID, if any
+        difficulty: Quiz difficulty
+        num_questions: Number of questions requested
+        job_id: Optional batch job ID
+    
+    Returns:
+        Key such as "claims_d2_n8_1a2b3c4d"
+    """
+    params = json.dumps([job_id, lesson_name, standard_id, difficulty, num_questions])
+    digest = hashlib.sha256(params.encode("utf-8")).hexdigest()[:8]
+    slug = re.sub(r"[^a-z0-9]+", "-", str(lesson_name or standard_id or "quiz").lower()).strip("-")
+    return f"{slug}_d{difficulty}_n{num_questions}_{digest}"
+
+
+class QuizJournal:
+    """
+    Append-only JSONL journal of one quiz job.
+    
+    Record types, in the order they are written:
+    - "passage": the selected passage ID
+    - "distribution": the question distribution, which fixes the slot order
+    - "question": an accepted question with its QC verdicts, by slot index
+    - "explanation": the explanation of the question in a slot
+    - "complete": the finished quiz
+    """
+    
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Open a journal. Without resume any previous journal at the path is discarded.
+        
+        Args:
+            path: Path of the journal file
+            resume: Load the existing journal instead of starting over
+        """
+        self.path = path
+        self.passage_id = None
+        self.distribution = None
+        self.questions: Dict[int, Dict[str, Any]] = {}
+        self.explanations: Dict[int, str] = {}
+        self.quiz = None
+        
+        if resume and os.path.exists(path):
+            self._load()
+        elif os.path.exists(path):
+            os.remove(path)
+    
+    @classmethod
+    def for_job(cls, key: str, resume: bool = False, directory: str = config.CHECKPOINT_DIR) -> "QuizJournal":
+        """
+        Open the journal of a job in the checkpoint directory.
+        
+        Args:
+            key: Job key from job_key()
+            resume: Load the existing journal instead of starting over
+            directory: Directory holding the journals
+        
+        Returns:
+            The journal
+        """
+        return cls(os.path.join(directory, f"{key}.jsonl"), resume=resume)
+    
+    @property
+    def resumed(self) -> bool:
+        """Whether any progress was loaded from an earlier run."""
+        return self.passage_id is not None
+    
+    def _load(self) -> None:
+        """
+        Replay the journal. A torn last line from a crash is ignored.
+        """
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable checkpoint record in {self.path}")
+                    continue
+                
+                record_type = record.get("type")
+                if record_type == "passage":
+                    self.passage_id = record["passage_id"]
+                elif record_type == "distribution":
+                    self.distribution = record["distribution"]
+                elif record_type == "question":
+                    self.questions[record["slot"]] = record["question"]
+                elif record_type == "explanation":
+                    self.explanations[record["slot"]] = record["explanation"]
+                elif record_type == "complete":
+                    self.quiz = record["quiz"]
+        
+        logger.info(f"Resuming from checkpoint {self.path}: {len(self.questions)} questions, "
+                    f"{len(self.explanations)} explanations" + (", complete" if self.quiz else ""))
+    
+    def discard(self) -> None:
+        """
+        Forget all progress, in memory and on disk, so the quiz starts over.
+        Used when the journaled passage can no longer be found.
+        """
+        self.passage_id = None
+        self.distribution = None
+        self.questions = {}
+        self.explanations = {}
+        self.quiz = None
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            logger.warning(f"Could not discard checkpoint {self.path}: {str(e)}")
+    
+    def _append(self, record: Dict[str, Any]) -> None:
+        """
+        Durably append one record.
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.warning(f"Checkpoint write to {self.path} failed: {str(e)}")
+    
+    def record_passage(self, passage_id: str) -> None:
+        """
+        Record the selected passage.
+        
+        Args:
+            passage_id: ID of the passage
+        """
+        if self.passage_id != passage_id:
+            self.passage_id = passage_id
+            self._append({"type": "passage", "passage_id": passage_id})
+    
+    def record_distribution(self, distribution: Dict[str, Dict[str, int]]) -> None:
+        """
+        Record the question distribution.
+        
+        Args:
+            distribution: Distribution of questions by standard and difficulty
+        """
+        if self.distribution != distribution:
+            self.distribution = distribution
+            self._append({"type": "distribution", "distribution": distribution})
+    
+    def record_question(self, slot_index: int, question: Dict[str, Any]) -> None:
+        """
+        Record an accepted question and its QC verdicts.
+        
+        Args:
+            slot_index: Position of the question in the distribution
+            question: The question, including its hidden bookkeeping keys
+        """
+        if slot_index not in self.questions:
+            self.questions[slot_index] = question
+            self._append({"type": "question", "slot": slot_index, "question": question})
+    
+    def record_explanation(self, slot_index: int, explanation: str) -> None:
+        """
+        Record the explanation of a question.
+        
+        Args:
+            slot_index: Position of the question in the distribution
+            explanation: The explanation
+        """
+        if slot_index not in self.explanations:
+            self.explanations[slot_index] = explanation
+            self._append({"type": "explanation", "slot": slot_index, "explanation": explanation})
+    
+    def record_complete(self, quiz: Dict[str, Any]) -> None:
+        """
+        Record the finished quiz.
+        
+        Args:
+            quiz: The complete quiz
+        """
+        self.quiz = quiz
+        self._append({"type": "complete", "quiz": quiz})
+    
+    def resumed_questions(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Journaled questions by slot index, carrying their journaled explanations.
+        
+        Returns:
+            Dictionary mapping slot index to question
+        """
+        questions = {}
+        for slot_index, question in self.questions.items():
+            question = dict(question)
+            if slot_index in self.explanations:
+                question["_explanation"] = self.explanations[slot_index]
+            questions[slot_index] = question
+        return questions
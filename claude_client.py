@@ -0,0 +1,350 @@
+"""
+Shared asynchronous Claude client for the Quiz Generator system.
+A single AsyncAnthropic client, and the HTTP connection pool it owns,
+is created per process and shared by every component that calls Claude.
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import anthropic
+import httpx
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Import the shared rate limiter
+from rate_limiter import rate_limiter, estimate_input_tokens
+
+# Import the shared response cache
+from response_cache import response_cache
+
+# Import per-slot budgets
+from budget import current_budget
+
+# Process-wide client and the event loop its connection pool is bound to
+_client: Optional[anthropic.AsyncAnthropic] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Call stages with their own concurrency pools
+STAGE_GENERATION = "generation"
+STAGE_QC = "qc"
+STAGE_EXPLANATION = "explanation"
+
+# Stands in for the passage text inside prompts when the passage is sent as a cached prefix block
+PASSAGE_REFERENCE = "[the passage given at the start of this message]"
+
+# Tokens used by API calls made in this process (responses served from the cache are not counted)
+usage_totals: Dict[str, int] = {
+    "input_tokens": 0,
+    "cache_creation_input_tokens": 0,
+    "cache_read_input_tokens": 0,
+    "output_tokens": 0,
+}
+
+
+class AdmissionController:
+    """
+    Limits how many Claude calls are in flight at once.
+    
+    Every call holds one slot of the global pool (MAX_WORKERS) and one slot of
+    its stage's pool (GENERATION_WORKERS, QC_WORKERS or EXPLANATION_WORKERS,
+    each defaulting to MAX_WORKERS). Slots are held only for the duration of
+    a single API request, never across retries or backoff sleeps.
+    """
+    
+    def __init__(self, max_workers: int, stage_limits: Dict[str, int]):
+        """
+        Initialize the admission controller.
+        
+        Args:
+            max_workers: Maximum number of concurrent calls across all stages
+            stage_limits: Maximum number of concurrent calls per stage (0 means max_workers)
+        """
+        self.max_workers = max(1, max_workers)
+        self.stage_limits = {
+            stage: max(1, limit or self.max_workers) for stage, limit in stage_limits.items()
+        }
+        # Semaphores are created lazily per event loop
+        self._loop = None
+        self._global = None
+        self._stages = {}
+    
+    def _ensure_semaphores(self) -> None:
+        """
+        Create the semaphores for the running event loop if needed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_workers)
+            self._stages = {
+                stage: asyncio.Semaphore(limit) for stage, limit in self.stage_limits.items()
+            }
+    
+    @asynccontextmanager
+    async def admit(self, stage: str):
+        """
+        Wait for a free slot in the stage pool and the global pool.
+        
+        Args:
+            stage: The call stage (generation, qc or explanation)
+        """
+        self._ensure_semaphores()
+        stage_semaphore = self._stages.get(stage)
+        if stage_semaphore is None:
+            raise ValueError(f"Unknown call stage: {stage}")
+        
+        async with stage_semaphore:
+            async with self._global:
+                yield
+
+
+admission = AdmissionController(
+    config.MAX_WORKERS,
+    {
+        STAGE_GENERATION: config.GENERATION_WORKERS,
+        STAGE_QC: config.QC_WORKERS,
+        STAGE_EXPLANATION: config.EXPLANATION_WORKERS
+    }
+)
+
+
+def _resolve_api_key(api_key: Optional[str] = None) -> str:
+    """
+    Resolve the API key to use, preferring an explicit key, then the environment
+    (which the CLI may have updated after startup), then the loaded configuration.
+    
+    Args:
+        api_key: Optional explicit API key
+        
+    Returns:
+        The API key
+    """
+    api_key = api_key or os.environ.get("ANTHROPIC_API_KEY") or config.ANTHROPIC_API_KEY
+    if not api_key:
+        raise ValueError("No API key provided. Set ANTHROPIC_API_KEY environment variable.")
+    return api_key
+
+
+def get_client(api_key: Optional[str] = None) -> anthropic.AsyncAnthropic:
+    """
+    Return the process-wide AsyncAnthropic client, creating it on first use.
+    
+    The connection pool is bound to the event loop it was created on, so a new
+    client is built if this is called from a different loop (e.g. a second
+    asyncio.run in the same process).
+    
+    Args:
+        api_key: Optional API key used when the client is first created
+        
+    Returns:
+        The shared AsyncAnthropic client
+    """
+    global _client, _client_loop
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    
+    if _client is not None and (_client_loop is None or _client_loop is loop):
+        return _client
+    
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(config.API_TIMEOUT, connect=10.0)
+    )
+    # SDK-level retries are disabled so that 429s reach the rate limiter;
+    # callers retry through utils.with_retry
+    _client = anthropic.AsyncAnthropic(
+        api_key=_resolve_api_key(api_key),
+        http_client=http_client,
+        max_retries=0
+    )
+    _client_loop = loop
+    logger.info(f"Initialized shared async Claude client (max connections: {config.HTTP_MAX_CONNECTIONS})")
+    
+    return _client
+
+
+def passage_context_block(passage: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the cache-controlled content block holding a passage.
+    
+    The block's text depends only on the passage, so every generation, QC and
+    explanation call about the same passage starts with an identical prefix
+    that the API can serve from its prompt cache. Such calls must not send a
+    system prompt, which would come before the passage; explanation calls put
+    their instructions after the passage block instead.
+    
+    Args:
+        passage: The passage dictionary
+        
+    Returns:
+        A text content block with ephemeral cache control
+    """
+    passage_info = f"{passage.get('title', 'Untitled')} by {passage.get('author', 'Unknown')} ({passage.get('type', 'Unknown')})"
+    return {
+        "type": "text",
+        "text": f"PASSAGE INFORMATION:\n{passage_info}\n\nPASSAGE:\n{passage.get('text', '')}",
+        "cache_control": {"type": "ephemeral"}
+    }
+
+
+def passage_text_for_prompt(passage: Dict[str, Any]) -> str:
+    """
+    Text to substitute for the passage inside a prompt.
+    
+    Args:
+        passage: The passage dictionary
+        
+    Returns:
+        A reference to the passage prefix block when PROMPT_CACHING is enabled,
+        otherwise the passage text itself
+    """
+    if config.PROMPT_CACHING:
+        return PASSAGE_REFERENCE
+    return passage.get("text", "")
+
+
+def build_user_content(prompt: str,
+                       passage: Optional[Dict[str, Any]] = None,
+                       cache: bool = True) -> Any:
+    """
+    Build the content of a user message, putting the passage first as a cached prefix.
+    
+    Args:
+        prompt: The call-specific part of the prompt
+        passage: The passage the call is about, if any
+        cache: Whether to mark the passage block for prompt caching
+        
+    Returns:
+        A list of content blocks when PROMPT_CACHING is enabled and a passage is
+        given, otherwise the prompt string unchanged
+    """
+    if passage is None or not config.PROMPT_CACHING:
+        return prompt
+    
+    passage_block = passage_context_block(passage)
+    if not cache:
+        passage_block.pop("cache_control")
+    return [passage_block, {"type": "text", "text": prompt}]
+
+
+async def create_message(stage: str,
+                         api_key: Optional[str] = None,
+                         cache_salt: Optional[str] = None,
+                         min_text_length: int = 1,
+                         **request: Any) -> anthropic.types.Message:
+    """
+    Send a Messages API request through the shared client, once the rate
+    limiter has room for it and the admission controller has a free slot for
+    the call's stage. Responses are served from and stored in the response cache
+    according to LLM_CACHE_MODE; a response is only stored once it has passed
+    the text check, so a retry after an empty reply makes a fresh request.
+    Calls made for a question slot are reserved against, and charged to, the
+    slot's budget.
+    
+    Args:
+        stage: The call stage (generation, qc or explanation)
+        api_key: Optional API key used if the shared client has not been created yet
+        cache_salt: Keeps sampled calls with the same prompt apart in the response cache,
+                    e.g. the generation attempt, so each attempt gets its own sample
+        min_text_length: Fewest characters of text an acceptable response has
+        **request: Keyword arguments for messages.create (model, max_tokens, system, messages, ...)
+        
+    Returns:
+        The Message returned by the API
+        
+    Raises:
+        BudgetExhausted: If the current slot's budget does not allow the call
+        ValueError: If the response has no text or less than min_text_length characters
+    """
+    cached = response_cache.get(request, cache_salt)
+    if cached is not None:
+        return cached
+    
+    budget = current_budget.get()
+    if budget is not None:
+        budget.reserve_call()
+    
+    client = get_client(api_key)
+    # Wait for the rate limiter before taking admission slots, so a delayed
+    # call does not keep other stages' calls out while it sleeps
+    estimated_input_tokens = estimate_input_tokens(request)
+    await rate_limiter.acquire(estimated_input_tokens)
+    request_sent = False
+    try:
+        async with admission.admit(stage):
+            request_sent = True
+            try:
+                raw_response = await client.messages.with_raw_response.create(**request)
+            except anthropic.RateLimitError as e:
+                rate_limiter.record_rate_limited(e.response.headers)
+                raise
+            
+            message = await raw_response.parse()
+    except BaseException:
+        # Failed, rejected and cancelled calls hand their reservation back
+        rate_limiter.release(estimated_input_tokens, request_sent)
+        raise
+    
+    rate_limiter.record_response(raw_response.headers, estimated_input_tokens, message.usage)
+    record_usage(message.usage)
+    if budget is not None:
+        budget.charge(message.usage)
+    
+    if not message.content or not getattr(message.content[0], "text", ""):
+        raise ValueError("Empty response from Claude API")
+    if len(message.content[0].text) < min_text_length:
+        raise ValueError(f"Response too short: '{message.content[0].text}'")
+    
+    response_cache.put(request, message, cache_salt)
+    return message
+
+
+def record_usage(usage: Any) -> None:
+    """
+    Add a response's token usage to the process-wide totals.
+    
+    Args:
+        usage: The response's usage object
+    """
+    if usage is None:
+        return
+    for key in usage_totals:
+        usage_totals[key] += getattr(usage, key, 0) or 0
+
+
+def billed_tokens() -> int:
+    """
+    Tokens billed at the full rate so far: uncached input, cache writes and output.
+    
+    Returns:
+        Total token count
+    """
+    return (usage_totals["input_tokens"] + usage_totals["cache_creation_input_tokens"]
+            + usage_totals["output_tokens"])
+
+
+async def close_client() -> None:
+    """
+    Close the shared client and its connection pool.
+    """
+    global _client, _client_loop
+    
+    if _client is not None:
+        await _client.close()
+        logger.info("Closed shared async Claude client")
+    _client = None
+    _client_loop = None
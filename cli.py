@@ -15,6 +15,11 @@ import time
 # Import centralized logging
 from logging_config import logger, configure_logging
 
+# In --stream mode stdout carries NDJSON only, so move console logs to stderr
+# before importing modules that log on import
+if "--stream" in sys.argv[1:]:
+    configure_logging(console_stream=sys.stderr)
+
 # Import centralized configuration
 from config import config
 
@@ -33,6 +38,15 @@ except ImportError:
     logger.warning("Publishing features will not be available")
     PublishQuestions = None
 
+# Import the background bank refill worker
+from bank_refill import BankRefillWorker
+
+# Import manifest-driven batch generation
+from batch import run_batch, default_results_path
+
+# Import the checkpoint journal
+from checkpoint import QuizJournal, job_key
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Generate educational quizzes using Claude.")
@@ -56,6 +70,29 @@ def parse_args():
     parser.add_argument("--output-file", type=str, help="Path to save the output JSON")
     parser.add_argument("--api-key", type=str, help="Anthropic API key (overrides environment variable)")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted quiz or --batch run from its checkpoint journal")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write passage, question, explanation and quiz events to stdout as NDJSON while generating")
+    
+    # Batch generation options
+    batch_group = parser.add_argument_group("Batch generation")
+    batch_group.add_argument("--batch", type=str, metavar="MANIFEST",
+                             help="Generate every quiz listed in a JSONL manifest in this process")
+    batch_group.add_argument("--batch-results", type=str, metavar="PATH",
+                             help="JSONL file that receives one result line per finished quiz "
+                                  "(default: <manifest>.results.jsonl)")
+    batch_group.add_argument("--batch-concurrency", type=int, default=config.BATCH_CONCURRENCY,
+                             help="Number of quizzes generated at once")
+    
+    # Question bank refill options
+    refill_group = parser.add_argument_group("Question bank refill")
+    refill_mode = refill_group.add_mutually_exclusive_group()
+    refill_mode.add_argument("--refill-bank", action="store_true",
+                             help="Run the background worker that keeps the question bank between its watermarks "
+                                  "(scoped by --lesson or --standard if given)")
+    refill_mode.add_argument("--refill-once", action="store_true",
+                             help="Run a single refill pass now, ignoring REFILL_OFF_PEAK_HOURS, and exit")
     
     # Publishing options
     publish_group = parser.add_argument_group("Publishing options")
@@ -79,13 +116,30 @@ def parse_args():
     args = parser.parse_args()
     
     # Validate arguments - require lesson or standard if not listing or publishing only
-    if not (args.list_lessons or args.list_standards or args.publish_only) and not (args.lesson or args.standard):
-        parser.error("One of --lesson or --standard is required when not using list operations or --publish-only")
+    refilling = args.refill_bank or args.refill_once
+    if not (args.list_lessons or args.list_standards or args.publish_only or refilling or args.batch) and not (args.lesson or args.standard):
+        parser.error("One of --lesson or --standard is required when not using list operations, --publish-only, --refill-bank or --batch")
     
     # Check if publishing is available when requested    
     if (args.publish or args.publish_only) and PublishQuestions is None:
         parser.error("Publishing features are not available. Make sure publish_questions.py is in the same directory.")
     
+    if args.stream and (args.publish or args.publish_only):
+        parser.error("--stream cannot be combined with --publish or --publish-only")
+    
+    if refilling and (args.stream or args.publish or args.publish_only):
+        parser.error("--refill-bank and --refill-once cannot be combined with --stream or publishing")
+    
+    if args.batch and (args.lesson or args.standard or args.stream or args.publish or args.publish_only or refilling):
+        parser.error("--batch takes lessons and standards from the manifest and cannot be combined with "
+                     "--lesson, --standard, --stream, publishing or refill options")
+    
+    if args.batch_results and not args.batch:
+        parser.error("--batch-results requires --batch")
+    
+    if args.resume and not config.CHECKPOINTS:
+        parser.error("--resume requires CHECKPOINTS to be enabled")
+    
     # Validate the update-module format if provided
     if args.update_module and ":" not in args.update_module:
         parser.error("--update-module requires the format COURSE_ID:MODULE_ID")
@@ -336,13 +390,77 @@ async def publish_existing_quiz(file_path: str, args) -> Dict[str, Any]:
             "messages": [f"Error: {str(e)}"]
         }
 
+def open_journal(args) -> Optional[QuizJournal]:
+    """
+    Open the checkpoint journal for the quiz described by the arguments.
+    
+    Args:
+        args: Command-line arguments
+        
+    Returns:
+        The journal, or None if CHECKPOINTS is off
+    """
+    if not config.CHECKPOINTS:
+        return None
+    key = job_key(args.lesson, args.standard, args.difficulty, args.num_questions)
+    return QuizJournal.for_job(key, resume=args.resume)
+
+async def stream_quiz(generator: QuizGenerator, args, journal: Optional[QuizJournal] = None) -> Dict[str, Any]:
+    """
+    Generate a quiz and write each event to stdout as one JSON line.
+    
+    Args:
+        generator: The quiz generator
+        args: Command-line arguments
+        journal: Optional checkpoint journal
+        
+    Returns:
+        The complete quiz from the final event
+    """
+    quiz = None
+    async for event in generator.generate_quiz_stream(
+        lesson_name=args.lesson,
+        standard_id=args.standard,
+        difficulty=args.difficulty,
+        num_questions=args.num_questions,
+        journal=journal
+    ):
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+        if event["event"] == "quiz":
+            quiz = event["quiz"]
+    return quiz
+
+async def refill_bank(generator: QuizGenerator, args) -> int:
+    """
+    Run the question bank refill worker.
+    
+    Args:
+        generator: The quiz generator
+        args: Command-line arguments
+        
+    Returns:
+        Number of questions added (only returns for --refill-once)
+    """
+    standards = None
+    if args.lesson:
+        standards = generator.get_standards_for_lesson(args.lesson)
+    elif args.standard:
+        standards = [args.standard]
+    
+    worker = BankRefillWorker(generator, standards=standards)
+    if args.refill_once:
+        return await worker.refill_once(ignore_window=True)
+    await worker.run()
+    return 0
+
 async def main():
     """Main entry point for the CLI."""
     args = parse_args()
 
     # Set log level based on verbosity
     if args.verbose:
-        configure_logging(logging.DEBUG)
+        configure_logging(logging.DEBUG, console_stream=sys.stderr if args.stream else None)
 
     # Set API key if provided
     if args.api_key:
@@ -387,6 +505,34 @@ async def main():
     if args.list_standards:
         list_available_standards(generator)
         return
+    
+    # Handle the question bank refill worker
+    if args.refill_bank or args.refill_once:
+        try:
+            added = await refill_bank(generator, args)
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        except KeyboardInterrupt:
+            logger.info("Question bank refill stopped by user")
+            return
+        print(f"Added {added} questions to the question bank")
+        return
+    
+    # Handle batch generation from a manifest
+    if args.batch:
+        results_path = args.batch_results or default_results_path(args.batch)
+        try:
+            counts = await run_batch(generator, args.batch, results_path, save_output,
+                                     args.batch_concurrency, resume=args.resume)
+        except FileNotFoundError:
+            logger.error(f"Batch manifest not found: {args.batch}")
+            sys.exit(1)
+        print(f"Batch finished: {counts['ok']} quizzes generated, {counts['partial']} partial, {counts['error']} failed")
+        print(f"Results written to: {results_path}")
+        if counts["error"]:
+            sys.exit(1)
+        return
 
     # Validate args
     if args.num_questions < 1 or args.num_questions > 12:
@@ -411,12 +557,16 @@ async def main():
                     logger.info("Use --list-lessons to see all available lessons")
                 sys.exit(1)
 
-            # Use await to properly handle the coroutine
-            quiz = await generator.generate_quiz(
-                lesson_name=args.lesson,
-                difficulty=args.difficulty,
-                num_questions=args.num_questions
-            )
+            if args.stream:
+                quiz = await stream_quiz(generator, args, open_journal(args))
+            else:
+                # Use await to properly handle the coroutine
+                quiz = await generator.generate_quiz(
+                    lesson_name=args.lesson,
+                    difficulty=args.difficulty,
+                    num_questions=args.num_questions,
+                    journal=open_journal(args)
+                )
         else:
             # Check if standard exists
             if args.standard not in generator.lessons_by_standard:
@@ -428,18 +578,29 @@ async def main():
                     logger.info("Use --list-standards to see all available standards")
                 sys.exit(1)
 
-            # Use await to properly handle the coroutine
-            quiz = await generator.generate_quiz(
-                standard_id=args.standard,
-                difficulty=args.difficulty,
-                num_questions=args.num_questions
-            )
+            if args.stream:
+                quiz = await stream_quiz(generator, args, open_journal(args))
+            else:
+                # Use await to properly handle the coroutine
+                quiz = await generator.generate_quiz(
+                    standard_id=args.standard,
+                    difficulty=args.difficulty,
+                    num_questions=args.num_questions,
+                    journal=open_journal(args)
+                )
 
         # Check if quiz was generated successfully
         error_message = quiz.get("metadata", {}).get("error")
         if error_message:
             logger.warning(f"Quiz generated with warnings: {error_message}")
         
+        # The stream already ended with the full quiz; only save it if asked to
+        if args.stream:
+            if args.output_file:
+                output_file = save_output(quiz, args.output_file)
+                logger.info(f"Output saved to: {output_file}")
+            return
+        
         # Print a summary
         passage_title = quiz.get("passage", {}).get("title", "Unknown title")
         passage_author = quiz.get("passage", {}).get("author", "Unknown author")
@@ -30,11 +30,103 @@ class Config:
     
     # Timeout configuration
     API_TIMEOUT = int(os.environ.get("API_TIMEOUT", "240"))  # seconds
-    BATCH_TIMEOUT = int(os.environ.get("BATCH_TIMEOUT", "360"))  # seconds
+    BATCH_TIMEOUT = int(os.environ.get("BATCH_TIMEOUT", "360"))  # seconds, deadline for a whole quiz (0 disables)
+    
+    # Degradation ladder: cheaper shortcuts once a quiz has used this fraction of BATCH_TIMEOUT (0 disables a rung)
+    DEGRADED_MODE = os.environ.get("DEGRADED_MODE", "true").lower() in ("1", "true", "yes")
+    DEGRADE_FEWER_ATTEMPTS_AT = float(os.environ.get("DEGRADE_FEWER_ATTEMPTS_AT", "0.5"))
+    DEGRADE_SKIP_IMPROVEMENT_AT = float(os.environ.get("DEGRADE_SKIP_IMPROVEMENT_AT", "0.6"))
+    DEGRADE_BATCHED_CHECKS_AT = float(os.environ.get("DEGRADE_BATCHED_CHECKS_AT", "0.7"))
+    DEGRADE_TEMPLATE_EXPLANATIONS_AT = float(os.environ.get("DEGRADE_TEMPLATE_EXPLANATIONS_AT", "0.8"))
     
     # Concurrency configuration
     MAX_WORKERS = int(os.environ.get("MAX_WORKERS", "5"))
+    # Generate all question slots of a quiz concurrently (bounded by MAX_WORKERS)
+    CONCURRENT_GENERATION = os.environ.get("CONCURRENT_GENERATION", "true").lower() in ("1", "true", "yes")
+    # Per-stage caps on in-flight Claude calls; 0 means "use MAX_WORKERS".
+    # MAX_WORKERS always caps the total across all stages.
+    GENERATION_WORKERS = int(os.environ.get("GENERATION_WORKERS", "0"))
+    QC_WORKERS = int(os.environ.get("QC_WORKERS", "0"))
+    EXPLANATION_WORKERS = int(os.environ.get("EXPLANATION_WORKERS", "0"))
+    # Start each question's explanation as soon as it passes QC, while other slots are still generating
+    PIPELINE_EXPLANATIONS = os.environ.get("PIPELINE_EXPLANATIONS", "true").lower() in ("1", "true", "yes")
+    EXPLANATION_QUEUE_SIZE = int(os.environ.get("EXPLANATION_QUEUE_SIZE", "4"))  # accepted questions waiting for a worker
+    # Quizzes generated at once by cli.py --batch; their Claude calls still share MAX_WORKERS
+    BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+    
+    # Speculative generation: race several candidates per slot and keep the first valid one
+    SPECULATIVE_GENERATION = os.environ.get("SPECULATIVE_GENERATION", "false").lower() in ("1", "true", "yes")
+    SPECULATIVE_MAX_PARALLEL = int(os.environ.get("SPECULATIVE_MAX_PARALLEL", "3"))  # upper bound on candidates in flight
+    SPECULATIVE_MAX_CANDIDATES = int(os.environ.get("SPECULATIVE_MAX_CANDIDATES", "3"))  # candidates started per slot
+    SPECULATIVE_TARGET = float(os.environ.get("SPECULATIVE_TARGET", "0.9"))  # wanted chance that one in-flight candidate passes
+    
+    # Budget for each question slot (generation, QC and improvement calls); 0 means unlimited
+    SLOT_MAX_CALLS = int(os.environ.get("SLOT_MAX_CALLS", "0"))
+    SLOT_MAX_INPUT_TOKENS = int(os.environ.get("SLOT_MAX_INPUT_TOKENS", "0"))  # uncached input plus cache writes
+    SLOT_MAX_OUTPUT_TOKENS = int(os.environ.get("SLOT_MAX_OUTPUT_TOKENS", "0"))
+    SLOT_MAX_SECONDS = float(os.environ.get("SLOT_MAX_SECONDS", "0"))
+    # When the budget runs out: "stop", "best" (use the best-scoring failed candidate) or
+    # "regenerate" (skip improvements the budget cannot cover and try fresh candidates instead)
+    SLOT_BUDGET_POLICY = os.environ.get("SLOT_BUDGET_POLICY", "stop").lower()
+    
+    # HTTP connection pool for the shared async Claude client
+    HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "50"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30.0"))  # seconds
+    
+    # Proactive rate limiting; 0 means "learn the limit from the API's rate-limit headers"
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_RPM = int(os.environ.get("RATE_LIMIT_RPM", "0"))
+    RATE_LIMIT_INPUT_TPM = int(os.environ.get("RATE_LIMIT_INPUT_TPM", "0"))
+    RATE_LIMIT_OUTPUT_TPM = int(os.environ.get("RATE_LIMIT_OUTPUT_TPM", "0"))
+    
+    # On-disk Claude response cache: "off", "read-write" or "read-only"
+    LLM_CACHE_MODE = os.environ.get("LLM_CACHE_MODE", "off").lower()
+    LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3"))
+    LLM_CACHE_MAX_MB = int(os.environ.get("LLM_CACHE_MAX_MB", "500"))  # 0 means unbounded
+    LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds, 0 means forever
     
+    # Send the passage as a cache-controlled prefix shared by every call about the same passage
+    PROMPT_CACHING = os.environ.get("PROMPT_CACHING", "true").lower() in ("1", "true", "yes")
+    
+    # Persistent bank of validated questions: "off", "store" (save only) or "serve" (save and reuse)
+    QUESTION_BANK_MODE = os.environ.get("QUESTION_BANK_MODE", "off").lower()
+    QUESTION_BANK_PATH = os.environ.get("QUESTION_BANK_PATH", os.path.join(".cache", "question_bank.sqlite3"))
+    
+    # Background bank refill (cli.py --refill-bank)
+    # A (passage, standard, difficulty) key is refilled up to the high watermark once it falls below the low one
+    REFILL_LOW_WATERMARK = int(os.environ.get("REFILL_LOW_WATERMARK", "2"))
+    REFILL_HIGH_WATERMARK = int(os.environ.get("REFILL_HIGH_WATERMARK", "5"))
+    REFILL_STANDARDS = os.environ.get("REFILL_STANDARDS", "")  # comma-separated; empty means every standard with passages
+    REFILL_OFF_PEAK_HOURS = os.environ.get("REFILL_OFF_PEAK_HOURS", "")  # local hours such as "22-6"; empty means any time
+    REFILL_MAX_PER_HOUR = int(os.environ.get("REFILL_MAX_PER_HOUR", "60"))  # questions started per hour, 0 means unpaced
+    REFILL_DAILY_TOKEN_BUDGET = int(os.environ.get("REFILL_DAILY_TOKEN_BUDGET", "2000000"))  # 0 means unlimited
+    REFILL_INTERVAL = int(os.environ.get("REFILL_INTERVAL", "900"))  # seconds between inventory scans
+    REFILL_PREVIOUS_QUESTIONS = int(os.environ.get("REFILL_PREVIOUS_QUESTIONS", "10"))  # 0 means every banked question
+    
+    # Write-ahead checkpoint journals that let cli.py --resume pick up interrupted quizzes and batches
+    CHECKPOINTS = os.environ.get("CHECKPOINTS", "true").lower() in ("1", "true", "yes")
+    CHECKPOINT_DIR = os.environ.get("CHECKPOINT_DIR", os.path.join(".cache", "checkpoints"))
+    
+    # Quality control configuration
+    # Reject malformed questions with local checks before any Claude QC call
+    LOCAL_PREVALIDATION = os.environ.get("LOCAL_PREVALIDATION", "true").lower() in ("1", "true", "yes")
+    # As part of pre-validation, reject quoted spans that a local n-gram index cannot find in the passage
+    QUOTE_VERIFICATION = os.environ.get("QUOTE_VERIFICATION", "true").lower() in ("1", "true", "yes")
+    QUOTE_MATCH_THRESHOLD = float(os.environ.get("QUOTE_MATCH_THRESHOLD", "0.5"))  # share of a quote's word trigrams found
+    # Comma-separated QC checks that are sent only the paragraphs a question cites instead of the whole passage
+    PASSAGE_EXCERPT_CHECKS = os.environ.get("PASSAGE_EXCERPT_CHECKS", "")
+    # "batched" judges all distractors in one call, "individual" makes one call per distractor
+    PLAUSIBILITY_MODE = os.environ.get("PLAUSIBILITY_MODE", "batched").lower()
+    # "separate" sends one call per QC rubric, "fused" judges every rubric in one structured call
+    QC_MODE = os.environ.get("QC_MODE", "separate").lower()
+    # Validate questions that concurrent slots generate for the same passage together, one call per check;
+    # a batch waits up to QC_BATCH_WINDOW seconds for more questions (0 disables batching)
+    QC_BATCH_WINDOW = float(os.environ.get("QC_BATCH_WINDOW", "0"))
+    QC_BATCH_SIZE = int(os.environ.get("QC_BATCH_SIZE", "12"))
+    # After an improvement, carry over verdicts of checks whose inputs did not change
+    INCREMENTAL_REVALIDATION = os.environ.get("INCREMENTAL_REVALIDATION", "true").lower() in ("1", "true", "yes")
+
     # File paths
     DATA_DIR = os.environ.get("DATA_DIR", "")  # Empty string means current directory
     LESSONS_FILE = os.path.join(DATA_DIR, os.environ.get("LESSONS_FILE", "lang_lessons.json"))
@@ -0,0 +1,116 @@
+"""
+Deadline-aware degradation ladder for quiz generation.
+As a quiz uses up its time budget (BATCH_TIMEOUT), progressively cheaper
+shortcuts are switched on: fewer generation attempts, no improvement step,
+batched QC checks and template explanations. The shortcuts actually taken are
+recorded so they can be reported in the quiz metadata.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Shortcuts, from the first to the last one switched on
+FEWER_ATTEMPTS = "fewer_attempts"
+SKIP_IMPROVEMENT = "skip_improvement"
+BATCHED_CHECKS = "batched_checks"
+TEMPLATE_EXPLANATIONS = "template_explanations"
+
+# Fraction of the quiz time budget after which each shortcut applies
+LADDER = {
+    FEWER_ATTEMPTS: config.DEGRADE_FEWER_ATTEMPTS_AT,
+    SKIP_IMPROVEMENT: config.DEGRADE_SKIP_IMPROVEMENT_AT,
+    BATCHED_CHECKS: config.DEGRADE_BATCHED_CHECKS_AT,
+    TEMPLATE_EXPLANATIONS: config.DEGRADE_TEMPLATE_EXPLANATIONS_AT,
+}
+
+
+class DegradationLadder:
+    """
+    Tracks how much of one quiz's time budget is used and which shortcuts were taken.
+    """
+    
+    def __init__(self, deadline: Optional[float], budget: float, ladder: Optional[Dict[str, float]] = None):
+        """
+        Initialize the ladder.
+        
+        Args:
+            deadline: Event-loop time by which the quiz must finish, or None for no deadline
+            budget: Length of the time budget in seconds
+            ladder: Shortcut name to budget fraction (defaults to LADDER)
+        """
+        self.deadline = deadline
+        self.budget = budget
+        self.ladder = ladder if ladder is not None else LADDER
+        self.taken: List[str] = []
+    
+    def used_fraction(self) -> float:
+        """
+        Fraction of the time budget already used.
+        
+        Returns:
+            0.0 at the start, 1.0 at the deadline; always 0.0 without a deadline
+        """
+        if self.deadline is None or self.budget <= 0:
+            return 0.0
+        remaining = self.deadline - asyncio.get_running_loop().time()
+        return min(1.0, max(0.0, 1.0 - remaining / self.budget))
+    
+    def active(self, shortcut: str) -> bool:
+        """
+        Check whether a shortcut applies now, without recording it.
+        
+        Args:
+            shortcut: Shortcut name
+        
+        Returns:
+            True if the budget fraction for the shortcut has been reached
+        """
+        threshold = self.ladder.get(shortcut)
+        if threshold is None or threshold <= 0 or self.deadline is None:
+            return False
+        return self.used_fraction() >= threshold
+    
+    def take(self, shortcut: str) -> bool:
+        """
+        Check whether a shortcut applies now, and record it if so.
+        
+        Args:
+            shortcut: Shortcut name
+        
+        Returns:
+            True if the caller should take the shortcut
+        """
+        if not self.active(shortcut):
+            return False
+        if shortcut not in self.taken:
+            logger.warning(f"Quiz has used {self.used_fraction():.0%} of its time budget; taking shortcut: {shortcut}")
+            self.taken.append(shortcut)
+        return True
+
+
+# Ladder of the quiz being generated in the current task (inherited by its subtasks)
+current_ladder: ContextVar[Optional[DegradationLadder]] = ContextVar("current_ladder", default=None)
+
+
+def take_shortcut(shortcut: str) -> bool:
+    """
+    Check the current quiz's ladder for a shortcut and record it if it applies.
+    
+    Args:
+        shortcut: Shortcut name
+    
+    Returns:
+        True if the caller should take the shortcut; always False when
+        DEGRADED_MODE is off or no quiz ladder is current
+    """
+    ladder = current_ladder.get()
+    if ladder is None or not config.DEGRADED_MODE:
+        return False
+    return ladder.take(shortcut)
@@ -7,13 +7,14 @@ import logging
 import sys
 import os
 
-def configure_logging(log_level=None):
+def configure_logging(log_level=None, console_stream=None):
     """
     Configure logging for the entire application.
     
     Args:
         log_level: Optional override for the log level. If None, uses the environment variable
                   LOG_LEVEL or defaults to INFO.
+        console_stream: Stream for console log output; defaults to stdout
     
     Returns:
         The configured logger
@@ -28,10 +29,10 @@ def configure_logging(log_level=None):
             log_level = logging.INFO
     
     # Create handlers with immediate flushing
-    file_handler = logging.FileHandler("quiz_generator.log")
+    file_handler = logging.FileHandler(os.environ.get("LOG_FILE", "quiz_generator.log"))
     file_handler.setLevel(log_level)
     
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(console_stream or sys.stdout)
     console_handler.setLevel(log_level)
     
     # Configure the format
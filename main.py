@@ -1,13 +1,41 @@
 import json
 import asyncio
+import math
 import random
 import os
 import re
 import datetime
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Callable, Awaitable, AsyncIterator
 import anthropic
-from functools import partial
-from quality_control import QuestionQualityControl
+from quality_control import QuestionQualityControl, ValidationBatcher
+
+# Import the shared async Claude client
+from claude_client import (
+    create_message, build_user_content, passage_text_for_prompt,
+    PASSAGE_REFERENCE, STAGE_GENERATION, STAGE_EXPLANATION
+)
+
+# Import the persistent question bank
+from question_bank import question_bank
+
+# Import the checkpoint journal
+from checkpoint import QuizJournal
+
+# Import per-slot budgets
+from budget import CallBudget, BudgetExhausted, current_budget, POLICY_BEST, POLICY_REGENERATE
+
+# Import paragraph reference parsing
+from passage_index import cited_paragraphs
+
+# Import the deadline degradation ladder
+from degradation import (
+    DegradationLadder,
+    current_ladder,
+    take_shortcut,
+    FEWER_ATTEMPTS,
+    SKIP_IMPROVEMENT,
+    TEMPLATE_EXPLANATIONS,
+)
 
 # Import centralized logging configuration
 from logging_config import logger
@@ -40,6 +68,17 @@ MAX_RETRIES = config.MAX_RETRIES
 RETRY_DELAY = config.RETRY_DELAY
 MODEL = config.MODEL
 MAX_WORKERS = config.MAX_WORKERS
+BATCH_TIMEOUT = config.BATCH_TIMEOUT
+CONCURRENT_GENERATION = config.CONCURRENT_GENERATION
+PROMPT_CACHING = config.PROMPT_CACHING
+PIPELINE_EXPLANATIONS = config.PIPELINE_EXPLANATIONS
+EXPLANATION_QUEUE_SIZE = config.EXPLANATION_QUEUE_SIZE
+EXPLANATION_WORKERS = config.EXPLANATION_WORKERS
+SPECULATIVE_GENERATION = config.SPECULATIVE_GENERATION
+SPECULATIVE_MAX_PARALLEL = config.SPECULATIVE_MAX_PARALLEL
+SPECULATIVE_MAX_CANDIDATES = config.SPECULATIVE_MAX_CANDIDATES
+SPECULATIVE_TARGET = config.SPECULATIVE_TARGET
+QC_BATCH_WINDOW = config.QC_BATCH_WINDOW
 
 # File paths from config
 LESSONS_FILE = config.LESSONS_FILE
@@ -63,16 +102,6 @@ else:
 # Log configuration
 config.log_config(logger)
 
-# Initialize Anthropic client
-try:
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-    # Test the API key validity with a simple operation
-    client.api_key  # Just access the property to verify it's set
-    logger.info("Anthropic client initialized successfully")
-except Exception as e:
-    logger.warning(f"Error initializing Anthropic client: {str(e)}. Will attempt to initialize later.")
-    client = None
-
 class QuizGenerator:
     def __init__(self):
         self.lessons_data = []
@@ -83,7 +112,11 @@ class QuizGenerator:
         self.lessons_by_standard = {}
         self.passages_by_standard = {}
         self.examples_by_standard_and_difficulty = {}
+        # (standard, difficulty) -> [candidates finished, candidates valid], for adaptive speculation
+        self.candidate_stats = {}
         self.quality_control = QuestionQualityControl()
+        # Coalesces the QC of questions that concurrent slots generate for the same passage
+        self.validation_batcher = ValidationBatcher(self.quality_control) if QC_BATCH_WINDOW > 0 else None
         self.load_data()
     
     def load_data(self):
@@ -215,6 +248,10 @@ class QuizGenerator:
             logger.info(f"Found {standards_with_passages} standards with at least one passage")
             logger.info(f"Created {total_mappings} passage-standard mappings")
             
+            # Index the passage text and paragraphs once, so quality control can check
+            # quotes and paragraph references locally and send excerpts
+            self.quality_control.index_passages(self.passages_data)
+            
             # Load example questions
             with open(EXAMPLES_FILE, 'r', encoding='utf-8') as f:
                 self.examples_data = json.load(f)
@@ -375,7 +412,8 @@ class QuizGenerator:
                     lesson_name: str = None, 
                     standard_id: str = None, 
                     difficulty: int = 1, 
-                    num_questions: int = 6) -> Dict[str, Any]:
+                    num_questions: int = 6,
+                    journal: Optional[QuizJournal] = None) -> Dict[str, Any]:
         """
         Main function to generate a complete quiz
         
@@ -384,12 +422,123 @@ class QuizGenerator:
             standard_id: Alternative to lesson_name, specific standard to quiz
             difficulty: Quiz difficulty (1, 2, or 3)
             num_questions: Number of questions to generate (6-12)
+            journal: Optional checkpoint journal to record progress in and resume from
+            
+        Returns:
+            Complete quiz as a JSON-serializable dictionary
+        """
+        quiz = None
+        async for event in self.generate_quiz_stream(lesson_name, standard_id, difficulty, num_questions, journal):
+            if event["event"] == "quiz":
+                quiz = event["quiz"]
+        return quiz
+    
+    async def generate_quiz_stream(self,
+                                   lesson_name: str = None,
+                                   standard_id: str = None,
+                                   difficulty: int = 1,
+                                   num_questions: int = 6,
+                                   journal: Optional[QuizJournal] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a quiz, yielding events as soon as each part is ready.
+        
+        Every event is a dictionary with an "event" key:
+        - "passage": the selected passage, under "passage"
+        - "question": a question that passed quality control, under "question",
+          with its position in the question distribution under "slot"
+        - "explanation": the explanation for the question in "slot", under "explanation"
+        - "quiz": the complete quiz, under "quiz"; always the last event
+        
+        The final quiz lists the accepted questions in slot order.
+        
+        Args:
+            lesson_name: Name of the lesson to create quiz for
+            standard_id: Alternative to lesson_name, specific standard to quiz
+            difficulty: Quiz difficulty (1, 2, or 3)
+            num_questions: Number of questions to generate (6-12)
+            journal: Optional checkpoint journal to record progress in and resume from
+            
+        Yields:
+            Event dictionaries
+        """
+        events = asyncio.Queue()
+        
+        async def produce() -> None:
+            try:
+                quiz = await self._generate_quiz(lesson_name, standard_id, difficulty, num_questions,
+                                                 emit=events.put, journal=journal)
+            except Exception as e:
+                logger.error(f"Unexpected error in generate_quiz_stream: {str(e)}", exc_info=True)
+                quiz = self._handle_missing_data(standard_id=standard_id, lesson_name=lesson_name)
+            await events.put({"event": "quiz", "quiz": quiz})
+        
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event["event"] == "quiz":
+                    break
+        finally:
+            # Stop generating if the consumer goes away early, and let the producer unwind
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+    
+    async def _generate_quiz(self,
+                             lesson_name: str,
+                             standard_id: str,
+                             difficulty: int,
+                             num_questions: int,
+                             emit: Callable[[Dict[str, Any]], Awaitable[None]],
+                             journal: Optional[QuizJournal] = None) -> Dict[str, Any]:
+        """
+        Generate a complete quiz, reporting progress through emit.
+        
+        With a journal, the passage, distribution, accepted questions and
+        explanations are recorded as they happen. A journal resumed from an
+        earlier run reuses its passage and distribution and only generates the
+        slots and explanations it is missing.
+        
+        Args:
+            lesson_name: Name of the lesson to create quiz for
+            standard_id: Alternative to lesson_name, specific standard to quiz
+            difficulty: Quiz difficulty (1, 2, or 3)
+            num_questions: Number of questions to generate (6-12)
+            emit: Coroutine function awaited with each passage, question and explanation event
+            journal: Optional checkpoint journal
             
         Returns:
             Complete quiz as a JSON-serializable dictionary
         """
+        if journal and journal.quiz:
+            logger.info("Quiz already completed in checkpoint; rebuilding it from the journal")
+            quiz = journal.quiz
+            # Replay the finished quiz so stream consumers see the same events as a fresh run
+            if quiz.get("passage"):
+                await emit({"event": "passage", "passage": quiz["passage"]})
+            slot_indices = sorted(journal.questions)
+            for position, question in enumerate(quiz.get("questions", [])):
+                slot_index = slot_indices[position] if position < len(slot_indices) else position
+                question_data = {key: value for key, value in question.items() if key != "explanation"}
+                await emit({"event": "question", "slot": slot_index, "question": question_data})
+                if question.get("explanation"):
+                    await emit({"event": "explanation", "slot": slot_index, "explanation": question["explanation"]})
+            return quiz
+        
         logger.info(f"Generating quiz with: {'Lesson: '+lesson_name if lesson_name else 'Standard: '+standard_id}, Difficulty: {difficulty}, Questions: {num_questions}")
         
+        # The whole quiz, including explanations, must finish within BATCH_TIMEOUT
+        deadline = self._quiz_deadline()
+        
+        # Shortcuts get cheaper as the deadline approaches. _generate_quiz runs in its own
+        # task (see generate_quiz_stream), so the ladder is seen by this quiz's subtasks only
+        ladder = DegradationLadder(deadline, BATCH_TIMEOUT)
+        current_ladder.set(ladder)
+        
         try:
             # Get the standards for this quiz
             lesson_standards = []
@@ -425,10 +574,15 @@ class QuizGenerator:
             # Primary standard for the lesson
             primary_standard = lesson_standards[0]
             
-            # Select a passage for the quiz
+            # Select a passage for the quiz, keeping the one from a resumed checkpoint
+            passage = self._passage_by_id(journal.passage_id) if journal and journal.passage_id else None
+            if journal and journal.passage_id and not passage:
+                # The journaled slots and questions belong to that passage, so start over
+                logger.warning(f"Checkpointed passage {journal.passage_id} no longer exists; discarding the checkpoint")
+                journal.discard()
+            
             # Try to find a passage that works for all lesson standards
-            passage = None
-            if len(lesson_standards) > 1:
+            if not passage and len(lesson_standards) > 1:
                 # Find common passages across all standards based on passage IDs
                 # First, get passage IDs for the first standard
                 first_std = lesson_standards[0]
@@ -528,19 +682,57 @@ class QuizGenerator:
                 
                 if passage:
                     logger.info(f"Selected passage for standard: {primary_standard}, type: {passage.get('type', 'Unknown')}")
+            
+            # Let stream consumers show the passage while questions are generated
+            await emit({"event": "passage", "passage": self.format_quiz_output([], passage)["passage"]})
                 
             # Determine question distribution based on difficulty and standards
-            question_distribution = self.distribute_questions(
-                num_questions, 
-                difficulty, 
-                lesson_standards,
-                all_previous_standards
-            )
+            if journal and journal.distribution:
+                question_distribution = journal.distribution
+            else:
+                question_distribution = self.distribute_questions(
+                    num_questions, 
+                    difficulty, 
+                    lesson_standards,
+                    all_previous_standards
+                )
             
-            # Generate questions
+            resumed_questions = None
+            if journal:
+                resumed_questions = journal.resumed_questions()
+                journal.record_passage(passage.get("id", ""))
+                journal.record_distribution(question_distribution)
+            
+            async def on_question(slot_index: int, question: Dict[str, Any]) -> None:
+                accepted_slots.append(slot_index)
+                if journal:
+                    journal.record_question(slot_index, question)
+                await emit({"event": "question", "slot": slot_index, "question": self._public_question(question)})
+            
+            # Resumed and bank-served questions go straight to the output; the journal
+            # ignores slots it already holds, so only bank-served ones are written
+            on_filled = on_question
+            
+            async def on_explanation(slot_index: int, explanation: str) -> None:
+                if journal:
+                    journal.record_explanation(slot_index, explanation)
+                await emit({"event": "explanation", "slot": slot_index, "explanation": explanation})
+            
+            # Generate questions, overlapping explanation generation when pipelining
+            accepted_slots = []
+            explanations = None
             try:
-                # Use await to properly handle the coroutine
-                questions = await self.generate_questions(passage, question_distribution)
+                if PIPELINE_EXPLANATIONS:
+                    questions, explanations = await self._generate_questions_with_explanations(
+                        passage, question_distribution, deadline=deadline,
+                        on_question=on_question, on_explanation=on_explanation, prefilled=resumed_questions,
+                        on_filled=on_filled
+                    )
+                else:
+                    questions = await self.generate_questions(
+                        passage, question_distribution, deadline=deadline, on_question=on_question,
+                        prefilled=resumed_questions, on_filled=on_filled
+                    )
             except Exception as e:
                 logger.error(f"Error generating questions: {str(e)}")
                 # Return a partial quiz with the passage but no questions
@@ -558,11 +750,17 @@ class QuizGenerator:
                 return quiz
             
             # Generate explanations for questions that passed quality control
-            try:
-                explanations = await self.generate_explanations_for_quiz(questions, passage)
-            except Exception as e:
-                logger.error(f"Error generating explanations: {str(e)}")
-                explanations = {}  # Empty dict if explanations fail
+            if explanations is None:
+                try:
+                    explanations = await self.generate_explanations_for_quiz(questions, passage, deadline=deadline)
+                except Exception as e:
+                    logger.error(f"Error generating explanations: {str(e)}")
+                    explanations = {}  # Empty dict if explanations fail
+                
+                # Questions come back in slot order, so question n is the n-th accepted slot
+                for position, slot_index in enumerate(sorted(accepted_slots)):
+                    if str(position) in explanations:
+                        await on_explanation(slot_index, explanations[str(position)])
             
             # Format the quiz for output with explanations
             quiz = self.format_quiz_output(questions, passage, explanations)
@@ -577,12 +775,68 @@ class QuizGenerator:
                 "timestamp": self.get_timestamp()
             }
             
+            if ladder.taken:
+                quiz["metadata"]["degradations"] = list(ladder.taken)
+            
+            budget_fallbacks = sum(1 for question in questions if question.get("_budget_fallback"))
+            if budget_fallbacks:
+                quiz["metadata"]["budget_fallbacks"] = budget_fallbacks
+            
+            if self._time_remaining(deadline) == 0:
+                quiz["metadata"]["deadline_exceeded"] = True
+                quiz["metadata"]["error"] = f"Quiz deadline of {BATCH_TIMEOUT}s was reached; some questions or explanations may be missing."
+            
+            # A partial quiz stays resumable; only a finished one is marked complete
+            if journal and not quiz["metadata"].get("error"):
+                journal.record_complete(quiz)
+            
             return quiz
         
         except Exception as e:
             logger.error(f"Unexpected error in generate_quiz: {str(e)}", exc_info=True)
             return self._handle_missing_data(standard_id=standard_id, lesson_name=lesson_name)
     
+    def _passage_by_id(self, passage_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a loaded passage by its ID.
+        
+        Args:
+            passage_id: ID of the passage
+            
+        Returns:
+            The passage, or None if it is not loaded
+        """
+        for passage in self.passages_data:
+            if passage.get("id") == passage_id:
+                return passage
+        logger.warning(f"Checkpointed passage {passage_id} not found; selecting a new passage")
+        return None
+    
+    def _quiz_deadline(self) -> Optional[float]:
+        """
+        Compute the event-loop time by which the current quiz must be finished.
+        
+        Returns:
+            Deadline in event-loop time, or None if BATCH_TIMEOUT is disabled
+        """
+        if BATCH_TIMEOUT <= 0:
+            return None
+        return asyncio.get_running_loop().time() + BATCH_TIMEOUT
+
+    def _time_remaining(self, deadline: Optional[float]) -> Optional[float]:
+        """
+        Seconds left until a deadline.
+        
+        Args:
+            deadline: Deadline in event-loop time, or None for no deadline
+            
+        Returns:
+            Remaining seconds (never negative), or None if there is no deadline
+        """
+        if deadline is None:
+            return None
+        return max(0.0, deadline - asyncio.get_running_loop().time())
+
     def select_passage(self, standard_id: str) -> Dict[str, Any]:
         """
         Select an appropriate passage for the given standard
@@ -954,6 +1208,11 @@ class QuizGenerator:
         """
         Generate a single question for a specific standard and difficulty
         
+        All Claude calls for the question, across attempts, quality checks and
+        improvements, share one CallBudget (SLOT_MAX_* settings). When it runs out
+        the slot stops, or with SLOT_BUDGET_POLICY=best returns the best-scoring
+        candidate that failed QC, marked with a hidden _budget_fallback key.
+        
         Args:
             passage: The passage to generate a question for
             standard_id: The standard to target
@@ -965,86 +1224,63 @@ class QuizGenerator:
         Returns:
             Generated question dictionary
         """
+        budget = CallBudget.from_config()
+        token = current_budget.set(budget)
+        try:
+            if SPECULATIVE_GENERATION:
+                question = await self._generate_speculatively(
+                    passage, standard_id, difficulty_level, example_question, previous_questions, task_id
+                )
+            else:
+                question = await self._generate_sequentially(
+                    passage, standard_id, difficulty_level, example_question, previous_questions, task_id
+                )
+        finally:
+            current_budget.reset(token)
+        
+        logger.info(f"{task_id}: Slot spent {budget.summary()}")
+        if question is None and budget.policy == POLICY_BEST and budget.best_candidate and not budget.can_afford(1):
+            logger.warning(f"{task_id}: Budget exhausted; using the best candidate, which passed "
+                           f"{budget.best_score} quality checks")
+            question = dict(budget.best_candidate, _budget_fallback=True)
+        return question
+    
+    async def _generate_sequentially(self,
+                                     passage: Dict[str, Any],
+                                     standard_id: str,
+                                     difficulty_level: str,
+                                     example_question: Dict[str, Any],
+                                     previous_questions: List[Dict[str, Any]],
+                                     task_id: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Make up to three generation attempts, one after another.
+        
+        Args:
+            passage: The passage to generate a question for
+            standard_id: The standard to target
+            difficulty_level: easy, medium, or hard
+            example_question: Example question for this standard and difficulty
+            previous_questions: List of previously generated questions
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            The first valid question, or None
+        """
         max_attempts = 3
         
         for attempt in range(max_attempts):
+            if attempt > 0 and take_shortcut(FEWER_ATTEMPTS):
+                logger.warning(f"{task_id}: Quiz deadline is near; giving up after {attempt} attempts")
+                break
             try:
-                # Build the prompt to send to Claude
-                prompt = build_prompt(
-                    passage=passage,
-                    standard_id=standard_id, 
-                    difficulty_level=difficulty_level,
-                    example_question=example_question,
-                    previous_questions=previous_questions
-                )
-                
-                # Call Claude
-                response = await self.call_claude_with_retry(prompt)
-                
-                # Parse the response
-                question = parse_claude_response(response)
-                
-                # If parsing failed, try again
-                if not question:
-                    logger.warning(f"Failed to parse Claude response on attempt {attempt+1}/{max_attempts}")
-                    continue
-                    
-                # Add standard and difficulty to the question
-                question["standard"] = standard_id
-                question["difficulty"] = difficulty_level
-                
-                # Skip basic validation and just use quality control
-                
-                # Advanced quality control check
-                validation_result = await self.quality_control.validate_question(
-                    question=question,
-                    passage=passage,
-                    standard_id=standard_id,
-                    previous_questions=previous_questions
+                question = await self._attempt_question(
+                    passage, standard_id, difficulty_level, example_question, previous_questions, attempt, task_id
                 )
-                
-                # Log validation results
-                if validation_result.get("warnings", []):
-                    for warning in validation_result["warnings"]:
-                        logger.warning(f"Question warning: {warning}")
-                        
-                if validation_result.get("improvement_suggestions", []):
-                    for suggestion in validation_result["improvement_suggestions"]:
-                        logger.info(f"Improvement suggestion: {suggestion}")
-                
-                # Check if the question passes all validation checks
-                if validation_result["is_valid"]:
-                    logger.info(f"Generated valid question for standard {standard_id}, difficulty {difficulty_level}")
+                if question:
                     return question
-                else:
-                    # Log validation errors
-                    for error in validation_result.get("errors", []):
-                        logger.warning(f"Question error: {error}")
-                    
-                    # Try to improve the question
-                    logger.info(f"Attempting to improve invalid question (attempt {attempt+1})")
-                    improved_question = await self.quality_control.improve_question(
-                        question=question,
-                        validation_result=validation_result,
-                        passage=passage,
-                        standard_id=standard_id
-                    )
-                    
-                    if improved_question:
-                        # Validate the improved question
-                        improved_validation = await self.quality_control.validate_question(
-                            question=improved_question,
-                            passage=passage,
-                            standard_id=standard_id,
-                            previous_questions=previous_questions
-                        )
-                        
-                        if improved_validation["is_valid"]:
-                            logger.info(f"Successfully improved question for standard {standard_id}")
-                            return improved_question
-                        else:
-                            logger.warning("Improved question still failed validation")
-            
+            except BudgetExhausted as e:
+                logger.warning(f"{task_id}: Stopping after {attempt+1} attempts: {str(e)}")
+                return None
             except Exception as e:
                 logger.error(f"Error generating question: {str(e)}")
                 
@@ -1052,6 +1288,243 @@ class QuizGenerator:
         logger.error(f"Failed to generate valid question after {max_attempts} attempts")
         return None
     
+    async def _attempt_question(self,
+                                passage: Dict[str, Any],
+                                standard_id: str,
+                                difficulty_level: str,
+                                example_question: Dict[str, Any],
+                                previous_questions: List[Dict[str, Any]],
+                                attempt: int = 0,
+                                task_id: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Make one generation attempt: generate, validate and, if needed, improve once.
+        
+        Args:
+            passage: The passage to generate a question for
+            standard_id: The standard to target
+            difficulty_level: easy, medium, or hard
+            example_question: Example question for this standard and difficulty
+            previous_questions: List of previously generated questions
+            attempt: Zero-based attempt number (for logging)
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            A question that passed validation, or None
+        """
+        # Build the prompt to send to Claude
+        prompt = build_prompt(
+            passage=passage,
+            standard_id=standard_id, 
+            difficulty_level=difficulty_level,
+            example_question=example_question,
+            previous_questions=previous_questions,
+            include_passage_text=not PROMPT_CACHING
+        )
+        
+        # Call Claude, sending the passage as a cached prefix
+        response = await self.call_claude_with_retry(prompt, passage=passage, cache_salt=f"attempt {attempt}")
+        
+        # Parse the response
+        question = parse_claude_response(response)
+        
+        # If parsing failed, try again
+        if not question:
+            logger.warning(f"Failed to parse Claude response on attempt {attempt+1}")
+            return None
+            
+        # Add standard and difficulty to the question
+        question["standard"] = standard_id
+        question["difficulty"] = difficulty_level
+        
+        # Skip basic validation and just use quality control
+        budget = current_budget.get()
+        calls_before_validation = budget.calls if budget is not None else 0
+        
+        # Advanced quality control check, shared with other slots' questions when QC batching is on
+        if self.validation_batcher is not None:
+            validation_result = await self.validation_batcher.validate(
+                question=question,
+                passage=passage,
+                standard_id=standard_id,
+                previous_questions=previous_questions
+            )
+        else:
+            validation_result = await self.quality_control.validate_question(
+                question=question,
+                passage=passage,
+                standard_id=standard_id,
+                previous_questions=previous_questions
+            )
+        
+        # Log validation results
+        if validation_result.get("warnings", []):
+            for warning in validation_result["warnings"]:
+                logger.warning(f"Question warning: {warning}")
+                
+        if validation_result.get("improvement_suggestions", []):
+            for suggestion in validation_result["improvement_suggestions"]:
+                logger.info(f"Improvement suggestion: {suggestion}")
+        
+        # Check if the question passes all validation checks
+        if validation_result["is_valid"]:
+            logger.info(f"Generated valid question for standard {standard_id}, difficulty {difficulty_level}")
+            # Keep the verdicts with the question for the question bank; hidden keys are not output
+            question["_quality_checks"] = validation_result.get("quality_checks", {})
+            return question
+        else:
+            # Log validation errors
+            for error in validation_result.get("errors", []):
+                logger.warning(f"Question error: {error}")
+            
+            budget = current_budget.get()
+            if budget is not None:
+                budget.offer_candidate(question, validation_result)
+            
+            # Near the quiz deadline a fresh attempt is cheaper than improve-and-revalidate
+            if take_shortcut(SKIP_IMPROVEMENT):
+                logger.info(f"Skipping improvement of invalid question (attempt {attempt+1}) near the quiz deadline")
+                return None
+            
+            # An improvement costs one call plus a revalidation at most as large as this validation
+            if budget is not None and budget.policy == POLICY_REGENERATE:
+                improvement_calls = 1 + budget.calls - calls_before_validation
+                if not budget.can_afford(improvement_calls + 1):
+                    logger.info(f"Skipping improvement (attempt {attempt+1}); the slot budget only covers a fresh candidate")
+                    return None
+            
+            # Try to improve the question; improve_question also validates the result
+            logger.info(f"Attempting to improve invalid question (attempt {attempt+1})")
+            improved_question, improved_validation = await self.quality_control.improve_question(
+                question=question,
+                validation_result=validation_result,
+                passage=passage,
+                standard_id=standard_id,
+                previous_questions=previous_questions
+            )
+            
+            if improved_question and improved_validation:
+                if improved_validation["is_valid"]:
+                    logger.info(f"Successfully improved question for standard {standard_id}")
+                    improved_question["_quality_checks"] = improved_validation.get("quality_checks", {})
+                    return improved_question
+                else:
+                    logger.warning("Improved question still failed validation")
+                    if budget is not None:
+                        budget.offer_candidate(improved_question, improved_validation)
+        
+        return None
+    
+    def _speculative_width(self, standard_id: str, difficulty_level: str) -> int:
+        """
+        Choose how many candidates to keep in flight for a slot.
+        
+        Uses the observed pass rate of candidates for this standard and difficulty
+        (falling back to all candidates so far), Laplace-smoothed, and picks the
+        smallest K for which at least one of K candidates passes with probability
+        SPECULATIVE_TARGET.
+        
+        Args:
+            standard_id: The standard to target
+            difficulty_level: The difficulty value
+            
+        Returns:
+            Number of candidates to run in parallel, between 1 and SPECULATIVE_MAX_PARALLEL
+        """
+        max_parallel = max(1, min(SPECULATIVE_MAX_PARALLEL, SPECULATIVE_MAX_CANDIDATES))
+        
+        finished, valid = self.candidate_stats.get((standard_id, difficulty_level), (0, 0))
+        if finished == 0:
+            finished = sum(stats[0] for stats in self.candidate_stats.values())
+            valid = sum(stats[1] for stats in self.candidate_stats.values())
+        pass_rate = (valid + 1) / (finished + 2)
+        
+        if pass_rate >= SPECULATIVE_TARGET:
+            return 1
+        if SPECULATIVE_TARGET >= 1:
+            return max_parallel
+        width = math.ceil(math.log(1 - SPECULATIVE_TARGET) / math.log(1 - pass_rate))
+        return max(1, min(max_parallel, width))
+    
+    async def _generate_speculatively(self,
+                                      passage: Dict[str, Any],
+                                      standard_id: str,
+                                      difficulty_level: str,
+                                      example_question: Dict[str, Any],
+                                      previous_questions: List[Dict[str, Any]],
+                                      task_id: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Race several candidate attempts for one slot and keep the first valid question.
+        
+        Up to _speculative_width candidates run at once; a failed candidate is replaced
+        while fewer than SPECULATIVE_MAX_CANDIDATES have been started. As soon as one
+        candidate passes, the others are cancelled, which also aborts their in-flight
+        API requests.
+        
+        Args:
+            passage: The passage to generate a question for
+            standard_id: The standard to target
+            difficulty_level: easy, medium, or hard
+            example_question: Example question for this standard and difficulty
+            previous_questions: List of previously generated questions
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            The first valid question, or None if every candidate failed
+        """
+        budget = max(1, SPECULATIVE_MAX_CANDIDATES)
+        width = self._speculative_width(standard_id, difficulty_level)
+        stats_key = (standard_id, difficulty_level)
+        logger.info(f"{task_id}: Speculating with {width} parallel candidates (budget {budget})")
+        
+        started = 0
+        running = set()
+        
+        def start_candidate() -> None:
+            nonlocal started
+            running.add(asyncio.ensure_future(self._attempt_question(
+                passage, standard_id, difficulty_level, example_question, previous_questions,
+                attempt=started, task_id=f"{task_id} candidate {started+1}"
+            )))
+            started += 1
+        
+        try:
+            while started < min(width, budget):
+                start_candidate()
+            
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        question = task.result()
+                    except BudgetExhausted as e:
+                        logger.warning(f"{task_id}: Candidate stopped: {str(e)}")
+                        question = None
+                    except Exception as e:
+                        logger.error(f"{task_id}: Error generating candidate: {str(e)}")
+                        question = None
+                    
+                    finished, valid = self.candidate_stats.get(stats_key, (0, 0))
+                    self.candidate_stats[stats_key] = (finished + 1, valid + (1 if question else 0))
+                    
+                    if question:
+                        logger.info(f"{task_id}: Accepted candidate after starting {started}; cancelling {len(running)} others")
+                        return question
+                
+                # Near the quiz deadline, or with the slot budget spent, let the candidates
+                # in flight finish but start no more
+                if started < budget and (take_shortcut(FEWER_ATTEMPTS) or not current_budget.get().can_afford(1)):
+                    budget = started
+                while len(running) < width and started < budget:
+                    start_candidate()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        logger.error(f"{task_id}: All {started} speculative candidates failed")
+        return None
+    
     @with_retry(
     max_retries=config.MAX_RETRIES,
     retry_delay=config.RETRY_DELAY,
@@ -1062,43 +1535,37 @@ class QuizGenerator:
         ValueError,
         Exception
     ],
-    timeout=config.API_TIMEOUT
+    exceptions_not_to_retry=[BudgetExhausted]
     )
-    async def call_claude_with_retry(self, prompt: str) -> str:
+    async def call_claude_with_retry(self,
+                                     prompt: str,
+                                     passage: Optional[Dict[str, Any]] = None,
+                                     cache_salt: Optional[str] = None) -> str:
         """
         Call Claude API with retry logic
         
         Args:
             prompt: The prompt to send to Claude
+            passage: Optional passage to send ahead of the prompt as a cached prefix
+            cache_salt: Tells apart attempts with the same prompt in the response cache
             
         Returns:
             Claude's response
         """
         logger.info("Calling Claude API")
         
-        # Initialize client if needed
-        if not hasattr(self, 'client') or self.client is None:
-            api_key = ANTHROPIC_API_KEY
-            if not api_key:
-                raise ValueError("No API key provided. Set ANTHROPIC_API_KEY environment variable.")
-            self.client = anthropic.Anthropic(api_key=api_key)
-            logger.info("Initialized Claude client")
-        
-        # Make API call using asyncio.to_thread for thread safety
-        response = await asyncio.to_thread(
-            lambda: self.client.messages.create(
-                model=MODEL,
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        # Make API call through the shared async client
+        # create_message rejects empty responses before they can be cached
+        response = await create_message(
+            stage=STAGE_GENERATION,
+            cache_salt=cache_salt,
+            model=MODEL,
+            max_tokens=4096,
+            messages=[
+                {"role": "user", "content": build_user_content(prompt, passage)}
+            ]
         )
         
-        # Check for empty response
-        if not response or not response.content or not response.content[0].text:
-            raise ValueError("Empty response from Claude API")
-        
         return response.content[0].text
     
     def format_quiz_output(self, questions: List[Dict[str, Any]], passage: Dict[str, Any], explanations: Dict[str, str] = None) -> Dict[str, Any]:
@@ -1127,7 +1594,7 @@ class QuizGenerator:
         
         # Add questions with explanations if available
         for i, question in enumerate(questions):
-            question_data = question.copy()  # Make a copy to avoid modifying the original
+            question_data = self._public_question(question)  # Copy without internal bookkeeping keys
             
             # Add explanation if available
             if explanations and str(i) in explanations:
@@ -1137,6 +1604,18 @@ class QuizGenerator:
             
         return quiz
 
+    def _public_question(self, question: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a question without its internal keys (those starting with an underscore).
+        
+        Args:
+            question: The question dictionary
+            
+        Returns:
+            A copy of the question that is safe to output
+        """
+        return {key: value for key, value in question.items() if not key.startswith("_")}
+
     def get_timestamp(self) -> str:
         """
         Get the current timestamp in a formatted string
@@ -1249,7 +1728,14 @@ class QuizGenerator:
         logger.warning(f"No writing examples found for standard: {standard_id}")
         return False
 
-    async def generate_questions(self, passage: Dict[str, Any], question_distribution: Dict[str, Dict[str, int]]) -> List[Dict[str, Any]]:
+    async def generate_questions(self,
+                                 passage: Dict[str, Any],
+                                 question_distribution: Dict[str, Dict[str, int]],
+                                 concurrent: Optional[bool] = None,
+                                 deadline: Optional[float] = None,
+                                 on_question: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None,
+                                 prefilled: Optional[Dict[int, Dict[str, Any]]] = None,
+                                 on_filled: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None) -> List[Dict[str, Any]]:
         """
         Generate questions for a passage according to the specified distribution.
         Uses different example types based on passage type:
@@ -1259,13 +1745,72 @@ class QuizGenerator:
         Args:
             passage: The passage to generate questions for
             question_distribution: Distribution of questions by standard and difficulty
+            concurrent: Generate all slots concurrently (defaults to CONCURRENT_GENERATION)
+            deadline: Optional event-loop time after which unfinished slots are abandoned
+            on_question: Optional coroutine function awaited with (slot index, question)
+                         as soon as each newly generated question passes quality control
+            prefilled: Questions that already fill some slots, by slot index (e.g. from a checkpoint)
+            on_filled: Optional coroutine function awaited with (slot index, question) for each
+                       prefilled or bank-served slot, before generation starts
             
         Returns:
-            List of generated question dictionaries
+            List of generated question dictionaries, in distribution order
         """
         logger.info(f"Generating questions for passage: {passage.get('title', 'Unknown')}")
         logger.info(f"Passage type: {passage.get('type', 'Unknown')}")
         
+        if concurrent is None:
+            concurrent = CONCURRENT_GENERATION
+        
+        # Expand the distribution into an ordered list of question slots
+        slots = self._build_question_slots(passage, question_distribution)
+        
+        # Keep prefilled slots, fill what we can from the question bank and generate only the shortfall
+        questions_by_slot = dict(prefilled or {})
+        open_indices = [index for index in range(len(slots)) if index not in questions_by_slot]
+        served = self._serve_slots_from_bank(passage, [slots[index] for index in open_indices])
+        for open_index, question in served.items():
+            questions_by_slot[open_indices[open_index]] = question
+        for slot_index in sorted(questions_by_slot):
+            if on_filled:
+                await on_filled(slot_index, questions_by_slot[slot_index])
+        
+        pending_indices = [index for index in range(len(slots)) if index not in questions_by_slot]
+        pending_slots = [slots[index] for index in pending_indices]
+        
+        async def on_generated(pending_index: int, question: Dict[str, Any]) -> None:
+            slot_index = pending_indices[pending_index]
+            questions_by_slot[slot_index] = question
+            if on_question:
+                await on_question(slot_index, question)
+        
+        served_questions = [questions_by_slot[index] for index in sorted(questions_by_slot)]
+        if concurrent:
+            await self._generate_slots_concurrently(passage, pending_slots, deadline, on_generated, served_questions)
+        else:
+            await self._generate_slots_sequentially(passage, pending_slots, deadline, on_generated, served_questions)
+        
+        questions = [questions_by_slot[index] for index in sorted(questions_by_slot)]
+        
+        # Log summary of generation
+        logger.info(f"Generated {len(questions)} questions in total")
+        
+        return questions
+
+    def _build_question_slots(self,
+                              passage: Dict[str, Any],
+                              question_distribution: Dict[str, Dict[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Expand a question distribution into an ordered list of generation slots,
+        picking the example question for each slot up front.
+        
+        Args:
+            passage: The passage to generate questions for
+            question_distribution: Distribution of questions by standard and difficulty
+            
+        Returns:
+            List of slot dictionaries in deterministic distribution order
+        """
         # Determine what type of examples to use based on passage type
         passage_type = passage.get("type", "")
         use_writing_examples = (passage_type == "Draft")
@@ -1275,12 +1820,7 @@ class QuizGenerator:
         else:
             logger.info("This is a non-Draft passage - will use 'reading' type examples only")
         
-        # Prepare to collect all generated questions
-        all_questions = []
-        
-        # Track generation tasks
-        tasks = []
-        results = []
+        slots = []
         
         # Process each standard and difficulty level
         for standard_id, difficulty_counts in question_distribution.items():
@@ -1312,35 +1852,284 @@ class QuizGenerator:
                     logger.error(f"No examples found for standard {standard_id} at difficulty {difficulty_value}")
                     continue
                 
-                # Generate multiple questions for this standard/difficulty
                 for i in range(count):
-                    # Pick a random example to use as template
-                    example = random.choice(examples)
-                    
-                    task_id = f"{standard_id}_{difficulty_value}_{i+1}"
-                    logger.info(f"Generating question {i+1}/{count} for standard {standard_id}, difficulty {difficulty_name}")
-                    
-                    # Generate a new question
-                    question = await self.generate_question_for_standard_and_difficulty(
-                        passage=passage,
-                        standard_id=standard_id,
-                        difficulty_level=difficulty_value,
-                        example_question=example,
-                        previous_questions=all_questions,
-                        task_id=task_id
+                    slots.append({
+                        "standard_id": standard_id,
+                        "difficulty_name": difficulty_name,
+                        "difficulty_value": difficulty_value,
+                        "example_type": "writing" if use_writing_examples else "reading",
+                        # Pick a random example to use as template
+                        "example": random.choice(examples),
+                        "task_id": f"{standard_id}_{difficulty_value}_{i+1}",
+                        "position": i + 1,
+                        "count": count
+                    })
+        
+        return slots
+
+    def _serve_slots_from_bank(self,
+                               passage: Dict[str, Any],
+                               slots: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Fill slots with validated questions from the question bank.
+        
+        Args:
+            passage: The passage of the quiz
+            slots: Ordered list of slots from _build_question_slots
+            
+        Returns:
+            Dictionary mapping slot index to a banked question (empty unless QUESTION_BANK_MODE is serve)
+        """
+        served = {}
+        if not question_bank.serving:
+            return served
+        
+        # Group slot indices by bank key so each key is looked up once
+        slots_by_key = {}
+        for index, slot in enumerate(slots):
+            key = (slot["standard_id"], slot["difficulty_value"], slot["example_type"])
+            slots_by_key.setdefault(key, []).append(index)
+        
+        for (standard_id, difficulty_value, example_type), indices in slots_by_key.items():
+            banked = question_bank.take(
+                passage.get("id", ""), standard_id, difficulty_value, example_type, len(indices)
+            )
+            for index, question in zip(indices, banked):
+                served[index] = question
+        
+        logger.info(f"Served {len(served)} of {len(slots)} slots from the question bank")
+        return served
+
+    async def _generate_slots_sequentially(self,
+                                           passage: Dict[str, Any],
+                                           slots: List[Dict[str, Any]],
+                                           deadline: Optional[float] = None,
+                                           on_question: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None,
+                                           previous_questions: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate one question per slot, one slot at a time.
+        
+        Args:
+            passage: The passage to generate questions for
+            slots: Ordered list of slots from _build_question_slots
+            deadline: Optional event-loop time after which remaining slots are skipped
+            on_question: Optional coroutine function awaited with (slot index, question) for each accepted question
+            previous_questions: Questions already in the quiz, which new ones must not repeat
+            
+        Returns:
+            List of generated question dictionaries
+        """
+        all_questions = list(previous_questions or [])
+        generated_questions = []
+        
+        for index, slot in enumerate(slots):
+            try:
+                question = await asyncio.wait_for(
+                    self._generate_slot(passage, slot, previous_questions=all_questions),
+                    timeout=self._time_remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Quiz deadline reached; skipping remaining slots from {slot['task_id']}")
+                break
+            if question:
+                all_questions.append(question)
+                generated_questions.append(question)
+                if on_question:
+                    await on_question(index, question)
+        
+        return generated_questions
+
+    async def _generate_slots_concurrently(self,
+                                           passage: Dict[str, Any],
+                                           slots: List[Dict[str, Any]],
+                                           deadline: Optional[float] = None,
+                                           on_question: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None,
+                                           previous_questions: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate every slot as its own task, with at most MAX_WORKERS slots in flight.
+        Each task de-duplicates against a snapshot of the questions accepted when it
+        starts, and results are returned in slot order regardless of completion order.
+        
+        Args:
+            passage: The passage to generate questions for
+            slots: Ordered list of slots from _build_question_slots
+            deadline: Optional event-loop time after which unfinished slots are cancelled
+            on_question: Optional coroutine function awaited with (slot index, question) for
+                         each accepted question, after the slot has released its worker
+            previous_questions: Questions already in the quiz, which new ones must not repeat
+            
+        Returns:
+            List of generated question dictionaries
+        """
+        semaphore = asyncio.Semaphore(max(1, MAX_WORKERS))
+        accepted_questions = list(previous_questions or [])
+        results = [None] * len(slots)
+        
+        async def run_slot(index: int, slot: Dict[str, Any]):
+            async with semaphore:
+                # Snapshot so the prompt and QC see a stable list for the whole slot
+                previous_questions = list(accepted_questions)
+                question = await self._generate_slot(passage, slot, previous_questions=previous_questions)
+            if question:
+                accepted_questions.append(question)
+                results[index] = question
+                if on_question:
+                    await on_question(index, question)
+        
+        logger.info(f"Generating {len(slots)} questions concurrently with up to {MAX_WORKERS} workers")
+        tasks = [asyncio.ensure_future(run_slot(index, slot)) for index, slot in enumerate(slots)]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self._time_remaining(deadline))
+            if pending:
+                logger.warning(f"Quiz deadline reached; cancelling {len(pending)} unfinished slots")
+                for task in pending:
+                    task.cancel()
+            # Surface unexpected errors and let cancelled tasks finish unwinding
+            for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error generating question: {str(outcome)}")
+        
+        return [question for question in results if question]
+
+    async def _generate_questions_with_explanations(self,
+                                                    passage: Dict[str, Any],
+                                                    question_distribution: Dict[str, Dict[str, int]],
+                                                    deadline: Optional[float] = None,
+                                                    on_question: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None,
+                                                    on_explanation: Optional[Callable[[int, str], Awaitable[None]]] = None,
+                                                    prefilled: Optional[Dict[int, Dict[str, Any]]] = None,
+                                                    on_filled: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Generate questions and explanations as a producer/consumer pipeline.
+        Every question that passes quality control is put on a bounded queue and
+        explained by a pool of workers while the remaining slots are still being
+        generated; a full queue makes slot tasks wait before handing over more work.
+        Prefilled and bank-served questions keep their stored explanations and are
+        only queued if they have none.
+        
+        Args:
+            passage: The passage to generate questions for
+            question_distribution: Distribution of questions by standard and difficulty
+            deadline: Optional event-loop time after which unfinished work is abandoned
+            on_question: Optional coroutine function awaited with (slot index, question) for each newly generated question
+            on_explanation: Optional coroutine function awaited with (slot index, explanation) for each explanation
+            prefilled: Questions that already fill some slots, by slot index (e.g. from a checkpoint)
+            on_filled: Optional coroutine function awaited with (slot index, question) for each prefilled or bank-served slot
+            
+        Returns:
+            Tuple of (questions in distribution order, explanations keyed by question index as strings)
+        """
+        queue = asyncio.Queue(maxsize=max(1, EXPLANATION_QUEUE_SIZE))
+        explanations_by_slot = {}
+        accepted_slots = []
+        num_workers = max(1, EXPLANATION_WORKERS or MAX_WORKERS)
+        
+        async def enqueue(slot_index: int, question: Dict[str, Any]) -> None:
+            accepted_slots.append(slot_index)
+            if on_question:
+                await on_question(slot_index, question)
+            await queue.put((slot_index, question))
+        
+        async def fill(slot_index: int, question: Dict[str, Any]) -> None:
+            accepted_slots.append(slot_index)
+            if on_filled:
+                await on_filled(slot_index, question)
+            if question.get("_explanation"):
+                explanations_by_slot[slot_index] = question["_explanation"]
+                if on_explanation:
+                    await on_explanation(slot_index, question["_explanation"])
+            else:
+                await queue.put((slot_index, question))
+        
+        async def explanation_worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                slot_index, question = item
+                # A failure is confined to its own item, so the queue keeps draining
+                # and the producer never blocks on a full queue
+                try:
+                    explanation = await asyncio.wait_for(
+                        self.generate_explanation(question, passage),
+                        timeout=self._time_remaining(deadline)
                     )
-                    
-                    if question:
-                        # Add generated question to our collection
-                        all_questions.append(question)
-                        logger.info(f"Successfully generated question for {standard_id}, difficulty {difficulty_name}")
+                    if explanation:
+                        explanations_by_slot[slot_index] = explanation
+                        if on_explanation:
+                            await on_explanation(slot_index, explanation)
                     else:
-                        logger.warning(f"Failed to generate question for {standard_id}, difficulty {difficulty_name}")
+                        logger.warning(f"Failed to generate explanation for slot {slot_index+1}")
+                except asyncio.TimeoutError:
+                    logger.warning(f"Quiz deadline reached; skipping explanation for slot {slot_index+1}")
+                except Exception as e:
+                    logger.error(f"Error explaining slot {slot_index+1}: {str(e)}")
         
-        # Log summary of generation
-        logger.info(f"Generated {len(all_questions)} questions in total")
+        logger.info(f"Pipelining explanations with {num_workers} workers")
+        workers = [asyncio.ensure_future(explanation_worker()) for _ in range(num_workers)]
+        
+        try:
+            questions = await self.generate_questions(
+                passage, question_distribution, deadline=deadline, on_question=enqueue, prefilled=prefilled,
+                on_filled=fill
+            )
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        
+        # Questions come back in slot order, so the n-th accepted slot is question n
+        explanations = {}
+        for position, slot_index in enumerate(sorted(accepted_slots)):
+            if slot_index in explanations_by_slot:
+                explanations[str(position)] = explanations_by_slot[slot_index]
+        
+        logger.info(f"Generated {len(explanations)} explanations")
+        return questions, explanations
+
+    async def _generate_slot(self,
+                             passage: Dict[str, Any],
+                             slot: Dict[str, Any],
+                             previous_questions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Generate the question for a single slot.
+        
+        Args:
+            passage: The passage to generate a question for
+            slot: Slot dictionary from _build_question_slots
+            previous_questions: Questions to avoid repeating
+            
+        Returns:
+            Generated question dictionary, or None if generation failed
+        """
+        standard_id = slot["standard_id"]
+        difficulty_name = slot["difficulty_name"]
+        logger.info(f"Generating question {slot['position']}/{slot['count']} for standard {standard_id}, difficulty {difficulty_name}")
+        
+        # Generate a new question
+        question = await self.generate_question_for_standard_and_difficulty(
+            passage=passage,
+            standard_id=standard_id,
+            difficulty_level=slot["difficulty_value"],
+            example_question=slot["example"],
+            previous_questions=previous_questions,
+            task_id=slot["task_id"]
+        )
+        
+        if question:
+            logger.info(f"Successfully generated question for {standard_id}, difficulty {difficulty_name}")
+            # Budget fallbacks did not pass QC, so they are not banked
+            if question_bank.storing and not question.get("_budget_fallback"):
+                question["_bank_id"], _ = question_bank.store(
+                    passage.get("id", ""), standard_id, slot["difficulty_value"], slot["example_type"],
+                    self._public_question(question), question.get("_quality_checks")
+                )
+        else:
+            logger.warning(f"Failed to generate question for {standard_id}, difficulty {difficulty_name}")
         
-        return all_questions
+        return question
 
     async def generate_explanation(self, question: Dict[str, Any], passage: Dict[str, Any]) -> str:
         """
@@ -1353,6 +2142,14 @@ class QuizGenerator:
         Returns:
             A detailed explanation for the question
         """
+        # Questions served from the bank may already have one
+        if question.get("_explanation"):
+            return question["_explanation"]
+        
+        # Near the quiz deadline, fall back to an explanation built without Claude
+        if take_shortcut(TEMPLATE_EXPLANATIONS):
+            return self._template_explanation(question)
+        
         logger.info(f"Generating explanation for question: {question.get('question', '')[:50]}...")
         
         try:
@@ -1360,39 +2157,72 @@ class QuizGenerator:
             explanation_prompt = self._build_explanation_prompt(question, passage)
             
             # Call Claude to generate the explanation
-            response = await self.call_claude_with_system_prompt(explanation_prompt)
+            response = await self.call_claude_with_system_prompt(explanation_prompt, passage=passage)
             
             if not response:
                 logger.warning("Empty response when generating explanation")
                 return ""
                 
+            explanation = response.strip()
+            if question.get("_bank_id"):
+                question_bank.attach_explanation(question["_bank_id"], explanation)
+            
             # Just return the raw response as the explanation
-            return response.strip()
+            return explanation
             
         except Exception as e:
             logger.error(f"Error generating explanation: {str(e)}")
             return "An explanation couldn't be generated for this question."
     
-    async def call_claude_with_system_prompt(self, user_prompt: str) -> str:
+    def _template_explanation(self, question: Dict[str, Any]) -> str:
+        """
+        Build a short explanation from the question itself, without calling Claude.
+        Passages are divided into numbered paragraphs, so the reader is pointed
+        at the paragraphs the question cites, or at its paragraphs in general.
+        
+        Args:
+            question: The question to explain
+            
+        Returns:
+            Explanation HTML in the same format as generated explanations
+        """
+        distractors = [question.get(f"distractor{i}", "") for i in range(1, 4)]
+        distractor_list = "; ".join(f'"{d}"' for d in distractors if d)
+        numbers = cited_paragraphs(question.get("question", ""))
+        if len(numbers) == 1:
+            reread = f"reread paragraph {numbers[0]}"
+        elif numbers:
+            reread = f"reread paragraphs {', '.join(str(n) for n in numbers[:-1])} and {numbers[-1]}"
+        else:
+            reread = "reread the paragraphs the question refers to"
+        return (
+            '<div class="markdown-renderer-v2">'
+            f'<div class="paragraph">The correct answer is "{question.get("correct_answer", "")}". '
+            'It is the choice best supported by the passage.</div>'
+            f'<div class="paragraph">The other choices ({distractor_list}) are not as well supported by '
+            f'the passage; {reread} and compare each choice with the text there.</div>'
+            '</div>'
+        )
+    
+    async def call_claude_with_system_prompt(self, user_prompt: str, passage: Optional[Dict[str, Any]] = None) -> str:
         """
-        Call Claude API with both system and user prompts, using ephemeral cache for examples
+        Call Claude API with the explanation instructions and examples, using ephemeral
+        cache for the examples and for the passage.
+        
+        With PROMPT_CACHING and a passage, the instructions and examples go in the user
+        message right after the passage block instead of in a system prompt. A system
+        prompt would precede the passage, so the passage prefix would never match the
+        one written by the generation and QC calls about the same passage.
         
         Args:
             user_prompt: The user prompt to send to Claude
+            passage: Optional passage to send ahead of the prompt as a cached prefix
             
         Returns:
             Claude's response
         """
         logger.info("Calling Claude API with system prompt and ephemeral cache for examples")
         
-        # Initialize client if needed
-        if not hasattr(self, 'client') or self.client is None:
-            api_key = ANTHROPIC_API_KEY
-            if not api_key:
-                raise ValueError("No API key provided. Set ANTHROPIC_API_KEY environment variable.")
-            self.client = anthropic.Anthropic(api_key=api_key)
-            logger.info("Initialized Claude client")
-        
         # Convert examples to JSON for caching
         examples_json = json.dumps(self.explanations_examples_data[:3]) if self.explanations_examples_data else "[]"
         
@@ -1409,38 +2239,43 @@ class QuizGenerator:
             }
         ]
         
-        # Make API call using asyncio.to_thread for thread safety
+        content = build_user_content(user_prompt, passage)
+        if isinstance(content, list):
+            # Passage first, then the cached instructions and examples, then the prompt
+            passage_block, prompt_block = content
+            instructions_block = {
+                "type": "text",
+                "text": "\n\n".join(block["text"] for block in system),
+                "cache_control": {"type": "ephemeral"}
+            }
+            request = {"messages": [{"role": "user", "content": [passage_block, instructions_block, prompt_block]}]}
+        else:
+            request = {"system": system, "messages": [{"role": "user", "content": content}]}
+        
+        # Make API call through the shared async client
         try:
-            response = await asyncio.to_thread(
-                lambda: self.client.messages.create(
-                    model=MODEL,
-                    max_tokens=1024,
-                    system=system,
-                    messages=[
-                        {"role": "user", "content": user_prompt}
-                    ]
-                )
+            response = await create_message(
+                stage=STAGE_EXPLANATION,
+                model=MODEL,
+                max_tokens=1024,
+                **request
             )
             
-            # Check for empty response
-            if not response or not response.content or not response.content[0].text:
-                raise ValueError("Empty response from Claude API")
-            
+            # create_message has already rejected an empty response
             return response.content[0].text
         except Exception as e:
             logger.error(f"Error in Claude API call: {str(e)}")
             # If there's an issue with the ephemeral cache approach, fall back to simpler method
             try:
                 logger.info("Falling back to simple system prompt without ephemeral cache")
-                response = await asyncio.to_thread(
-                    lambda: self.client.messages.create(
-                        model=MODEL,
-                        max_tokens=1024,
-                        system="Output well-formatted html explanations for AP Language questions.",
-                        messages=[
-                            {"role": "user", "content": user_prompt}
-                        ]
-                    )
+                response = await create_message(
+                    stage=STAGE_EXPLANATION,
+                    model=MODEL,
+                    max_tokens=1024,
+                    system="Output well-formatted html explanations for AP Language questions.",
+                    messages=[
+                        {"role": "user", "content": build_user_content(user_prompt, passage, cache=False)}
+                    ]
                 )
                 return response.content[0].text
             except Exception as fallback_error:
@@ -1471,7 +2306,7 @@ class QuizGenerator:
         # Passage information
         passage_title = passage.get("title", "")
         passage_author = passage.get("author", "")
-        passage_text = passage.get("text", "")
+        passage_text = passage_text_for_prompt(passage)
         
         # Build the prompt - keep it simple since examples are in system prompt
         prompt = f"""
@@ -1606,13 +2441,19 @@ Author: {passage_author}
 """
         return prompt
     
-    async def generate_explanations_for_quiz(self, questions: List[Dict[str, Any]], passage: Dict[str, Any]) -> Dict[str, str]:
+    async def generate_explanations_for_quiz(self,
+                                             questions: List[Dict[str, Any]],
+                                             passage: Dict[str, Any],
+                                             deadline: Optional[float] = None) -> Dict[str, str]:
         """
-        Generate explanations for all questions in a quiz
+        Generate explanations for all questions in a quiz concurrently.
+        The number of explanation calls in flight is bounded by the shared
+        client's admission control (EXPLANATION_WORKERS and MAX_WORKERS).
         
         Args:
             questions: List of questions to generate explanations for
             passage: The passage the questions are based on
+            deadline: Optional event-loop time after which remaining explanations are skipped
             
         Returns:
             Dictionary mapping question indices (as strings) to explanations
@@ -1620,19 +2461,35 @@ Author: {passage_author}
         logger.info(f"Generating explanations for {len(questions)} questions")
         
         explanations = {}
+        if not questions:
+            return explanations
         
-        # Generate explanations sequentially
-        for i, question in enumerate(questions):
+        async def explain(i: int, question: Dict[str, Any]) -> None:
             logger.info(f"Generating explanation for question {i+1}/{len(questions)}")
             
-            explanation = await self.generate_explanation(question, passage)
+            try:
+                explanation = await asyncio.wait_for(
+                    self.generate_explanation(question, passage),
+                    timeout=self._time_remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Quiz deadline reached; skipping explanation for question {i+1}")
+                return
             
             if explanation:
                 explanations[str(i)] = explanation
                 logger.info(f"Generated explanation for question {i+1}")
             else:
                 logger.warning(f"Failed to generate explanation for question {i+1}")
-                
+        
+        # With prompt caching, the first call writes the examples and passage to the
+        # cache, so let it finish before fanning out and have the rest read from it
+        first = 1 if PROMPT_CACHING else 0
+        if first:
+            await explain(0, questions[0])
+        
+        await asyncio.gather(*(explain(i, question) for i, question in enumerate(questions) if i >= first))
+        
         logger.info(f"Generated {len(explanations)} explanations")
         return explanations
 
@@ -1641,7 +2498,8 @@ def build_prompt(passage: Dict[str, Any],
                 standard_id: str, 
                 difficulty_level: str, 
                 example_question: Dict[str, Any],
-                previous_questions: List[Dict[str, Any]]) -> str:
+                previous_questions: List[Dict[str, Any]],
+                include_passage_text: bool = True) -> str:
     """
     Build the prompt to send to Claude for question generation
     
@@ -1651,6 +2509,8 @@ def build_prompt(passage: Dict[str, Any],
         difficulty_level: easy, medium, or hard
         example_question: Example question for this standard and difficulty
         previous_questions: List of previously generated questions
+        include_passage_text: Whether to inline the passage text; pass False when
+            the passage is sent separately as a cached prefix block
         
     Returns:
         Formatted prompt string
@@ -1659,7 +2519,7 @@ def build_prompt(passage: Dict[str, Any],
     passage_title = passage.get("title", "")
     passage_author = passage.get("author", "")
     passage_type = passage.get("type", "")
-    passage_text = passage.get("text", "")
+    passage_text = passage.get("text", "") if include_passage_text else PASSAGE_REFERENCE
     
     # Determine example type (reading or writing)
     example_type = example_question.get("type", "reading")
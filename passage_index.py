@@ -0,0 +1,300 @@
+"""
+Local word n-gram and paragraph index of passage text.
+Quoted spans in generated questions and options are checked against it for
+verbatim or near-verbatim presence in the passage, and "paragraph N" references
+for range and content, without any Claude call, so such questions can be
+rejected before the QC checks run. The paragraph index also provides excerpts
+of the cited paragraphs for prompts that do not need the whole passage.
+"""
+
+import html
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Words per n-gram
+NGRAM_SIZE = 3
+
+# Quoted spans shorter than this many words (single terms, titles, scare quotes) are not checked
+MIN_QUOTE_WORDS = 3
+
+# Double-quoted spans, straight or curly
+QUOTE_PATTERN = re.compile(r'"([^"]+)"|“([^”]+)”')
+
+# Ellipses and bracketed insertions split a quote into fragments that are checked separately
+FRAGMENT_SEPARATOR_PATTERN = re.compile(r"\.\s*\.\s*\.|…|\[[^\]]*\]")
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# Inline paragraph numbers, e.g. <em>1&nbsp;&nbsp;&nbsp;&nbsp;</em>; a bare <em>5</em> marks poem lines instead
+PARAGRAPH_MARKER_PATTERN = re.compile(r"<em>\s*(\d+)(?:\s|&?nbsp;)+</em>")
+
+# "paragraph 3", "paragraphs 2 and 4", "paragraphs 1, 2, and 3", "paragraphs 4-6"
+PARAGRAPH_SEPARATOR = r"(?:\s*,\s*(?:and\s+|or\s+)?|\s+(?:and|or|through|to)\s+|\s*[-–&]\s*)"
+PARAGRAPH_REFERENCE_PATTERN = re.compile(
+    rf"\bparagraphs?\s+(\d+(?:{PARAGRAPH_SEPARATOR}\d+)*)", re.IGNORECASE
+)
+PARAGRAPH_RANGE_PATTERN = re.compile(r"(\d+)\s*(?:[-–]|\s+(?:through|to)\s+)\s*(\d+)", re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+
+def normalize_words(text: str) -> List[str]:
+    """
+    Split text into normalized words: HTML tags removed, entities decoded,
+    lower case, curly apostrophes straightened and punctuation dropped.
+    
+    Args:
+        text: Text, possibly containing HTML
+    
+    Returns:
+        List of words
+    """
+    text = html.unescape(HTML_TAG_PATTERN.sub(" ", text or ""))
+    text = text.lower().replace("’", "'").replace("‘", "'")
+    return WORD_PATTERN.findall(text)
+
+
+def cited_paragraphs(text: str, paragraph_count: Optional[int] = None) -> List[int]:
+    """
+    Find the paragraph numbers a text refers to.
+    
+    A range is only expanded up to the passage's last paragraph. Both ends of a
+    range are always returned, so a range running past the passage (such as
+    "paragraphs 2 to 2024") keeps its out-of-range end for the caller to reject.
+    
+    Args:
+        text: Question or option text
+        paragraph_count: Number of the passage's last paragraph; without it, ranges
+                         longer than 50 paragraphs are not expanded
+    
+    Returns:
+        Sorted paragraph numbers, with ranges such as "paragraphs 4-6" expanded
+    """
+    numbers = set()
+    for match in PARAGRAPH_REFERENCE_PATTERN.finditer(text or ""):
+        reference = match.group(1)
+        for first, last in PARAGRAPH_RANGE_PATTERN.findall(reference):
+            first, last = int(first), int(last)
+            if first > last:
+                continue
+            if paragraph_count is not None:
+                numbers.update(range(first, min(last, paragraph_count) + 1))
+            elif last <= first + 50:
+                numbers.update(range(first, last + 1))
+        numbers.update(int(number) for number in re.findall(r"\d+", reference))
+    return sorted(numbers)
+
+
+def extract_quotes(text: str) -> List[str]:
+    """
+    Find the double-quoted spans of a text that are long enough to check.
+    
+    Args:
+        text: Question or option text, possibly containing HTML
+    
+    Returns:
+        Quoted spans of at least MIN_QUOTE_WORDS words, in order of appearance
+    """
+    text = html.unescape(HTML_TAG_PATTERN.sub(" ", text or ""))
+    quotes = []
+    for match in QUOTE_PATTERN.finditer(text):
+        quote = match.group(1) or match.group(2)
+        if len(normalize_words(quote)) >= MIN_QUOTE_WORDS:
+            quotes.append(quote.strip())
+    return quotes
+
+
+class PassageIndex:
+    """
+    Hash index of the word n-grams of one passage, and of its numbered paragraphs.
+    """
+    
+    def __init__(self, text: str):
+        """
+        Build the index.
+        
+        Args:
+            text: Passage text, possibly containing HTML
+        """
+        self.words = normalize_words(text)
+        self.joined = f" {' '.join(self.words)} "
+        # n-gram -> position of its first occurrence
+        self.ngrams: Dict[Tuple[str, ...], int] = {}
+        for position in range(len(self.words) - NGRAM_SIZE + 1):
+            self.ngrams.setdefault(tuple(self.words[position:position + NGRAM_SIZE]), position)
+        
+        # Paragraph number -> start and end character offsets in the passage text,
+        # plain text, first word position, normalized words and their n-grams
+        self.paragraphs: Dict[int, Dict[str, Any]] = {}
+        text = text or ""
+        markers = list(PARAGRAPH_MARKER_PATTERN.finditer(text))
+        word_position = len(normalize_words(text[:markers[0].start()])) if markers else 0
+        for i, marker in enumerate(markers):
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+            words = normalize_words(text[marker.start():end])
+            number = int(marker.group(1))
+            if number not in self.paragraphs:
+                self.paragraphs[number] = {
+                    "start": marker.start(),
+                    "end": end,
+                    "text": " ".join(html.unescape(HTML_TAG_PATTERN.sub(" ", text[marker.end():end])).split()),
+                    "first_word": word_position,
+                    "words": words,
+                    "ngrams": {tuple(words[j:j + NGRAM_SIZE]) for j in range(len(words) - NGRAM_SIZE + 1)}
+                }
+            word_position += len(words)
+    
+    def _fragments(self, quote: str) -> List[List[str]]:
+        """
+        Split a quote at ellipses and bracketed insertions into lists of words.
+        """
+        fragments = [normalize_words(part) for part in FRAGMENT_SEPARATOR_PATTERN.split(quote)]
+        return [fragment for fragment in fragments if fragment]
+    
+    def match_ratio(self, quote: str) -> float:
+        """
+        Share of a quote that occurs in the passage.
+        
+        Fragments of at least NGRAM_SIZE words count one unit per n-gram, shorter
+        fragments one unit that is found only if the words occur contiguously.
+        
+        Args:
+            quote: The quoted span
+        
+        Returns:
+            1.0 for a verbatim quote, lower the more of it is missing from the passage
+        """
+        return self._match_ratio(quote, self.ngrams, self.joined)
+    
+    def paragraph_match_ratio(self, quote: str, numbers: List[int]) -> float:
+        """
+        Share of a quote that occurs in the given paragraphs, as match_ratio measures it.
+        
+        Args:
+            quote: The quoted span
+            numbers: Paragraph numbers
+        
+        Returns:
+            Match ratio against those paragraphs only
+        """
+        paragraphs = [self.paragraphs[number] for number in numbers if number in self.paragraphs]
+        ngrams = set().union(*(paragraph["ngrams"] for paragraph in paragraphs))
+        joined = " | ".join(f" {' '.join(paragraph['words'])} " for paragraph in paragraphs)
+        return self._match_ratio(quote, ngrams, joined)
+    
+    def _match_ratio(self, quote: str, ngrams: Any, joined: str) -> float:
+        """
+        Share of a quote's n-grams (or short fragments) found in the given n-grams and text.
+        """
+        found = total = 0
+        for fragment in self._fragments(quote):
+            if len(fragment) < NGRAM_SIZE:
+                total += 1
+                found += f" {' '.join(fragment)} " in joined
+                continue
+            for position in range(len(fragment) - NGRAM_SIZE + 1):
+                total += 1
+                found += tuple(fragment[position:position + NGRAM_SIZE]) in ngrams
+        return found / total if total else 1.0
+    
+    def contains(self, quote: str, threshold: float = config.QUOTE_MATCH_THRESHOLD) -> bool:
+        """
+        Check whether a quote occurs verbatim or near-verbatim in the passage.
+        
+        Args:
+            quote: The quoted span
+            threshold: Smallest match_ratio accepted
+        
+        Returns:
+            True if the quote is found
+        """
+        return self.match_ratio(quote) >= threshold
+    
+    def find(self, quote: str) -> Optional[int]:
+        """
+        Locate a quote in the passage.
+        
+        Args:
+            quote: The quoted span
+        
+        Returns:
+            Word position of the first of the quote's n-grams found in the passage, or None
+        """
+        for fragment in self._fragments(quote):
+            for position in range(len(fragment) - NGRAM_SIZE + 1):
+                found = self.ngrams.get(tuple(fragment[position:position + NGRAM_SIZE]))
+                if found is not None:
+                    return found
+        return None
+    
+    def paragraph_at(self, word_position: int) -> Optional[int]:
+        """
+        Find the paragraph containing a word position, such as one returned by find().
+        
+        Args:
+            word_position: Position in the passage's normalized words
+        
+        Returns:
+            Paragraph number, or None if the passage has no numbered paragraph there
+        """
+        for number, paragraph in self.paragraphs.items():
+            if paragraph["first_word"] <= word_position < paragraph["first_word"] + len(paragraph["words"]):
+                return number
+        return None
+    
+    def excerpt(self, numbers: List[int]) -> Optional[str]:
+        """
+        Build an excerpt of the passage holding only some of its paragraphs.
+        
+        Args:
+            numbers: Paragraph numbers to include
+        
+        Returns:
+            HTML excerpt with each paragraph under its number, or None if any
+            paragraph is missing from the passage
+        """
+        if not numbers or any(number not in self.paragraphs for number in numbers):
+            return None
+        listed = ", ".join(str(number) for number in sorted(numbers))
+        parts = [f"<p><strong>Excerpt: paragraph{'s' if len(numbers) > 1 else ''} {listed} only</strong></p>"]
+        for number in sorted(numbers):
+            parts.append(f"<p><em>{number}&nbsp;&nbsp;&nbsp;&nbsp;</em>{html.escape(self.paragraphs[number]['text'], quote=False)}</p>")
+        return "".join(parts)
+    
+    def unverified_quotes(self, text: str, threshold: float = config.QUOTE_MATCH_THRESHOLD) -> List[str]:
+        """
+        Find the quoted spans of a text that do not occur in the passage.
+        
+        Args:
+            text: Question or option text
+            threshold: Smallest match_ratio accepted
+        
+        Returns:
+            The quotes that were not found
+        """
+        return [quote for quote in extract_quotes(text) if not self.contains(quote, threshold)]
+
+
+def build_passage_indexes(passages: List[Dict[str, Any]]) -> Dict[str, PassageIndex]:
+    """
+    Index every passage that has an ID.
+    
+    Args:
+        passages: Passage dictionaries
+    
+    Returns:
+        Dictionary mapping passage ID to its index
+    """
+    start_time = time.monotonic()
+    indexes = {
+        passage["id"]: PassageIndex(passage.get("text", ""))
+        for passage in passages if passage.get("id")
+    }
+    logger.info(f"Indexed {len(indexes)} passages for quote and paragraph checks in {time.monotonic() - start_time:.2f}s")
+    return indexes
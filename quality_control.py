@@ -1,7 +1,8 @@
 import json
 import os
 import re
-from typing import Dict, List, Any, Optional
+import difflib
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
 import anthropic
 import random
@@ -15,6 +16,18 @@ from config import config
 # Import retry decorator
 from utils import with_retry
 
+# Import the shared async Claude client
+from claude_client import create_message, build_user_content, passage_text_for_prompt, STAGE_QC, PASSAGE_REFERENCE
+
+# Import per-slot budgets
+from budget import BudgetExhausted, CallBudget, current_budget
+
+# Import the deadline degradation ladder
+from degradation import take_shortcut, BATCHED_CHECKS
+
+# Import the passage index used to verify quotes
+from passage_index import PassageIndex, build_passage_indexes, cited_paragraphs, extract_quotes
+
 # Load environment variables
 from dotenv import load_dotenv
 
@@ -23,6 +36,46 @@ MAX_RETRIES = config.MAX_RETRIES
 RETRY_DELAY = config.RETRY_DELAY
 MODEL = config.MODEL
 QC_PROMPTS_FILE = config.QC_PROMPTS_FILE
+PLAUSIBILITY_MODE = config.PLAUSIBILITY_MODE
+QC_MODE = config.QC_MODE
+INCREMENTAL_REVALIDATION = config.INCREMENTAL_REVALIDATION
+LOCAL_PREVALIDATION = config.LOCAL_PREVALIDATION
+QUOTE_VERIFICATION = config.QUOTE_VERIFICATION
+QUOTE_MATCH_THRESHOLD = config.QUOTE_MATCH_THRESHOLD
+PASSAGE_EXCERPT_CHECKS = {name.strip() for name in config.PASSAGE_EXCERPT_CHECKS.split(",") if name.strip()}
+
+# Question fields the QC checks can read
+QUESTION_FIELDS = ("question", "correct_answer", "distractor1", "distractor2", "distractor3")
+
+# Checks every question must pass, besides the plausibility check
+REQUIRED_CHECKS = ("formatting", "structure", "depth", "precision", "textual evidence", "single correct answer")
+
+# Answer options of a question
+OPTION_FIELDS = ("correct_answer", "distractor1", "distractor2", "distractor3")
+
+# Options at least this similar (difflib ratio of their normalized text) count as near-duplicates
+NEAR_DUPLICATE_RATIO = 0.9
+
+# References to line numbers, which questions must not use (build_prompt asks for paragraph numbers)
+LINE_REFERENCE_PATTERN = re.compile(r"\b(?:lines?\s*\d+|ll\.\s*\d+)", re.IGNORECASE)
+
+# HTML tags, and the elements that never have a closing tag
+HTML_TAG_PATTERN = re.compile(r"<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9]*)\b[^<>]*?(/?)\s*>")
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# Stands in for the per-question fields of a prompt that judges several questions at once
+PER_QUESTION_REFERENCE = "[given for each question under QUESTIONS TO EVALUATE below]"
+
+# Which question fields each template placeholder exposes to a check
+PLACEHOLDER_FIELDS = {
+    "question": {"question"},
+    "QUESTION": {"question"},
+    "correct_answer": {"correct_answer"},
+    "distractor1": {"distractor1"},
+    "distractor2": {"distractor2"},
+    "distractor3": {"distractor3"},
+    "QUESTION_JSON": set(QUESTION_FIELDS)
+}
 
 class QuestionQualityControl:
     """
@@ -37,21 +90,48 @@ class QuestionQualityControl:
         Args:
             api_key: Optional Anthropic API key (will use environment variable if not provided)
         """
-        # Initialize Claude client
+        # Calls go through the shared async client; the key is only used if
+        # this is the first component to create it
         self.api_key = api_key or config.ANTHROPIC_API_KEY
         if not self.api_key:
             logger.warning("No API key provided. QC will attempt to use the API key from main module.")
             
-        # Initialize Claude client (will be set in _call_claude_with_retry if not done here)
-        self.client = None
         if self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
             key_preview = f"{self.api_key[:4]}...{self.api_key[-4:]}" if len(self.api_key) > 8 else "Invalid Key"
             logger.info(f"Quality control initialized with API key: {key_preview}")
         
         self.qc_prompts = {}
+        self.check_dependencies = {}
+        self.passage_indexes: Dict[str, PassageIndex] = {}
         self.load_qc_prompts()
     
+    def index_passages(self, passages: List[Dict[str, Any]]) -> None:
+        """
+        Build the quote verification indexes of the passages up front.
+        
+        Args:
+            passages: Passage dictionaries
+        """
+        self.passage_indexes.update(build_passage_indexes(passages))
+    
+    def _passage_index(self, passage: Dict[str, Any]) -> PassageIndex:
+        """
+        Get the index of a passage, building it if the passage was not indexed up front.
+        
+        Args:
+            passage: The passage dictionary
+            
+        Returns:
+            The passage index
+        """
+        passage_id = passage.get("id")
+        index = self.passage_indexes.get(passage_id) if passage_id else None
+        if index is None:
+            index = PassageIndex(passage.get("text", ""))
+            if passage_id:
+                self.passage_indexes[passage_id] = index
+        return index
+    
     def load_qc_prompts(self) -> None:
         """
         Load quality control prompts from the configured file.
@@ -75,6 +155,7 @@ class QuestionQualityControl:
                     
                     if name and prompt:
                         self.qc_prompts[name] = prompt
+                        self.check_dependencies[name] = self._template_fields(prompt)
                         logger.info(f"Loaded quality control prompt: {name}")
                         # Debug: Log a small part of each prompt
                         logger.info(f"DEBUG - Prompt '{name}' first 100 chars: {prompt[:100]}...")
@@ -129,7 +210,8 @@ class QuestionQualityControl:
                                passage: Dict[str, Any],
                                standard_id: str,
                                previous_questions: List[Dict[str, Any]] = None,
-                               task_id: str = "") -> Dict[str, Any]:
+                               task_id: str = "",
+                               reused_checks: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Validate a generated question using quality control checks
         
@@ -139,6 +221,8 @@ class QuestionQualityControl:
             standard_id: The standard ID for the question
             previous_questions: Previously generated questions
             task_id: Identifier for this task (for logging)
+            reused_checks: Verdicts to carry over instead of re-running, as returned by
+                           _plan_revalidation or computed by validate_questions_batch
             
         Returns:
             Validation result dictionary with all validation info
@@ -158,13 +242,20 @@ class QuestionQualityControl:
             "quality_checks": {}
         }
         
-        # Skip basic validation - just go directly to advanced validation
+        # Step 1: Local pre-validation rejects malformed questions before any Claude call
+        if LOCAL_PREVALIDATION:
+            rejection = self._prevalidate(question, passage, task_id)
+            if rejection is not None:
+                total_time = asyncio.get_event_loop().time() - start_time
+                logger.warning(f"{task_id}: Question validation failed local pre-validation in {total_time:.4f}s")
+                return rejection
+        
         # Step 2: Advanced validation
         advanced_validation_start = asyncio.get_event_loop().time()
         logger.debug(f"{task_id}: Starting advanced validation")
         
         advanced_result = await self._perform_advanced_validation(
-            question, passage, standard_id, previous_questions, task_id
+            question, passage, standard_id, previous_questions, task_id, reused_checks
         )
         advanced_validation_time = asyncio.get_event_loop().time() - advanced_validation_start
         logger.debug(f"{task_id}: Advanced validation completed in {advanced_validation_time:.2f}s")
@@ -194,32 +285,307 @@ class QuestionQualityControl:
                 
         return result
     
-    def _perform_basic_validation(self, question: Dict[str, Any]) -> Dict[str, Any]:
+    async def validate_questions_batch(self,
+                                       questions: List[Dict[str, Any]],
+                                       passage: Dict[str, Any],
+                                       standard_ids: List[str],
+                                       previous_questions: Optional[List[List[Dict[str, Any]]]] = None,
+                                       task_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
-        Perform basic validation checks on the question.
-        Note: This validation has been disabled to allow Claude's outputs to be processed directly.
+        Validate several questions on the same passage together.
+        Each required check and the plausibility check judges every question in one call,
+        so the passage is sent once per check rather than once per check and question.
+        Checks without a usable verdict for a question are then run for that question alone.
+        
+        Args:
+            questions: The questions to validate
+            passage: The passage all the questions are based on
+            standard_ids: The standard ID of each question
+            previous_questions: Previously generated questions, per question
+            task_ids: Identifier of each question's task (for logging)
+            
+        Returns:
+            Validation results in question order, in the same shape as validate_question returns
+        """
+        if previous_questions is None:
+            previous_questions = [[] for _ in questions]
+        if task_ids is None:
+            task_ids = ["" for _ in questions]
+        
+        reused_checks = [{} for _ in questions]
+        
+        # Questions the local pre-validation rejects never reach the batched calls
+        batched_indices = [
+            index for index, question in enumerate(questions)
+            if not LOCAL_PREVALIDATION or self._perform_basic_validation(question, passage)["is_valid"]
+        ]
+        batched_questions = [questions[index] for index in batched_indices]
+        
+        if len(batched_questions) > 1:
+            start_time = asyncio.get_event_loop().time()
+            check_names = [check_name for check_name in REQUIRED_CHECKS if check_name in self.qc_prompts]
+            logger.info(f"Validating {len(batched_questions)} questions together in {len(check_names) + 1} batched QC calls")
+            
+            outcomes = await asyncio.gather(
+                *(self._run_cross_question_check(check_name, batched_questions, passage)
+                  for check_name in check_names),
+                self._check_plausibility_across_questions(batched_questions, passage),
+                return_exceptions=True
+            )
+            
+            # Propagate the first failure only after every branch has settled
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            
+            for check_name, verdicts in zip(check_names, outcomes[:-1]):
+                for batch_index, verdict in verdicts.items():
+                    reused_checks[batched_indices[batch_index]][check_name] = verdict
+            for batch_index, distractor_results in outcomes[-1].items():
+                reused_checks[batched_indices[batch_index]]["plausibility"] = distractor_results
+            
+            time_taken = asyncio.get_event_loop().time() - start_time
+            logger.info(f"Batched QC calls for {len(batched_questions)} questions completed in {time_taken:.2f}s")
+        
+        # validate_question merges the batched verdicts and runs whatever is still missing
+        return list(await asyncio.gather(*(
+            self.validate_question(question, passage, standard_id, previous, task_id, reused_checks=reused)
+            for question, standard_id, previous, task_id, reused
+            in zip(questions, standard_ids, previous_questions, task_ids, reused_checks)
+        )))
+    
+    def _prevalidate(self,
+                     question: Dict[str, Any],
+                     passage: Optional[Dict[str, Any]] = None,
+                     task_id: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Run the local pre-validation and turn a rejection into a full validation result.
         
         Args:
             question: The question to validate
+            passage: The passage used for the question, for quote verification
+            task_id: Identifier for this task (for logging)
             
         Returns:
-            Dictionary with validation results - always valid
+            Validation result of the rejected question, or None if it passed
         """
-        # Return a valid result without performing any checks
+        basic_result = self._perform_basic_validation(question, passage)
+        if basic_result["is_valid"]:
+            return None
+        
+        reasons = basic_result["errors"]
+        for reason in reasons:
+            logger.warning(f"{task_id}: Failed local pre-validation: {reason}")
+        
         return {
+            "is_valid": False,
+            "errors": [f"Failed prevalidation check: {reason}" for reason in reasons],
+            "warnings": basic_result["warnings"],
+            "improvement_suggestions": [f"Improve prevalidation: {reason}" for reason in reasons],
+            "quality_checks": {
+                "prevalidation": {"passes": False, "score": 0, "reasoning": "; ".join(reasons)}
+            }
+        }
+    
+    def _perform_basic_validation(self,
+                                  question: Dict[str, Any],
+                                  passage: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Perform basic validation checks on the question.
+        These are deterministic local checks that make no Claude calls: missing fields,
+        duplicate or near-duplicate options, a correct answer that is the longest option,
+        line-number references, unbalanced HTML and, given the passage, quotes that are
+        not in the passage and paragraph references that do not match it.
+        
+        Args:
+            question: The question to validate
+            passage: The passage used for the question (quotes are not verified without it)
+            
+        Returns:
+            Dictionary with validation results; "errors" lists every problem found
+        """
+        result = {
             "is_valid": True,
             "errors": [],
             "warnings": []
         }
+        
+        # Every field must be present and non-empty
+        texts = {field: str(question.get(field) or "").strip() for field in QUESTION_FIELDS}
+        missing_fields = [field for field in QUESTION_FIELDS if not texts[field]]
+        if missing_fields:
+            result["errors"].append(f"Missing fields: {', '.join(missing_fields)}")
+        
+        options = {field: texts[field] for field in OPTION_FIELDS if texts[field]}
+        
+        # Options must be clearly distinct from each other
+        normalized = {field: self._normalize_option(text) for field, text in options.items()}
+        option_fields = list(normalized)
+        for i, first in enumerate(option_fields):
+            for second in option_fields[i + 1:]:
+                if normalized[first] == normalized[second]:
+                    result["errors"].append(f"Options {first} and {second} are identical")
+                elif difflib.SequenceMatcher(None, normalized[first], normalized[second]).ratio() >= NEAR_DUPLICATE_RATIO:
+                    result["errors"].append(f"Options {first} and {second} are nearly identical")
+        
+        # The correct answer must not stand out as the longest option
+        if "correct_answer" in options and len(options) > 1:
+            correct_length = len(options["correct_answer"])
+            if all(correct_length > len(text) for field, text in options.items() if field != "correct_answer"):
+                result["errors"].append("The correct answer is the longest option")
+        
+        for field in QUESTION_FIELDS:
+            # Passages are referenced by paragraph, never by line
+            if LINE_REFERENCE_PATTERN.search(texts[field]):
+                result["errors"].append(f"The {field} refers to line numbers instead of paragraphs")
+            
+            # Any HTML in the question must be balanced
+            imbalance = self._html_imbalance(texts[field])
+            if imbalance:
+                result["errors"].append(f"The {field} has unbalanced HTML: {imbalance}")
+        
+        # Quoted evidence must come from the passage. Options on Draft passages quote
+        # proposed revisions rather than the passage, so only their stems are checked.
+        if passage is not None and QUOTE_VERIFICATION:
+            passage_index = self._passage_index(passage)
+            quoting_fields = ["question"] if passage.get("type") == "Draft" else list(QUESTION_FIELDS)
+            for field in quoting_fields:
+                for quote in passage_index.unverified_quotes(texts[field], QUOTE_MATCH_THRESHOLD):
+                    shown = quote if len(quote) <= 80 else quote[:77] + "..."
+                    result["errors"].append(f"The {field} quotes \"{shown}\", which is not in the passage")
+        
+        if passage is not None:
+            result["errors"].extend(self._check_paragraph_references(texts, passage))
+        
+        result["is_valid"] = not result["errors"]
+        return result
+    
+    def _check_paragraph_references(self, texts: Dict[str, str], passage: Dict[str, Any]) -> List[str]:
+        """
+        Check the "paragraph N" references of a question against the passage's numbered paragraphs.
+        A cited paragraph must exist, and a field that cites paragraphs and quotes the
+        passage must quote one of the paragraphs it cites.
+        
+        Args:
+            texts: Question field to its text
+            passage: The passage used for the question
+            
+        Returns:
+            Error messages; empty if the passage has no numbered paragraphs
+        """
+        passage_index = self._passage_index(passage)
+        if not passage_index.paragraphs:
+            return []
+        
+        errors = []
+        for field, text in texts.items():
+            numbers = cited_paragraphs(text, max(passage_index.paragraphs))
+            if not numbers:
+                continue
+            
+            missing = [number for number in numbers if number not in passage_index.paragraphs]
+            if missing:
+                listed = ", ".join(str(number) for number in missing)
+                errors.append(f"The {field} cites paragraph {listed}, which the passage does not have "
+                              f"(its paragraphs are numbered up to {max(passage_index.paragraphs)})")
+                continue
+            
+            for quote in extract_quotes(text):
+                # Quotes missing from the whole passage are reported by the quote verification
+                if not passage_index.contains(quote, QUOTE_MATCH_THRESHOLD):
+                    continue
+                if passage_index.paragraph_match_ratio(quote, numbers) >= QUOTE_MATCH_THRESHOLD:
+                    continue
+                position = passage_index.find(quote)
+                actual = passage_index.paragraph_at(position) if position is not None else None
+                shown = quote if len(quote) <= 80 else quote[:77] + "..."
+                listed = ", ".join(str(number) for number in numbers)
+                errors.append(f"The {field} cites paragraph {listed}, "
+                              f"but quotes \"{shown}\" from " + (f"paragraph {actual}" if actual else "elsewhere"))
+        
+        return errors
+    
+    def _passage_for_check(self,
+                           check_name: str,
+                           question: Dict[str, Any],
+                           passage: Dict[str, Any],
+                           task_id: str = "") -> Dict[str, Any]:
+        """
+        Narrow the passage to the paragraphs the question stem cites, for checks listed
+        in PASSAGE_EXCERPT_CHECKS.
+        
+        Args:
+            check_name: Name of the quality check
+            question: The question being validated
+            passage: The passage used for the question
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            A copy of the passage holding only the cited paragraphs, or the passage itself
+            if the check needs the whole text or the stem cites no existing paragraph
+        """
+        if check_name not in PASSAGE_EXCERPT_CHECKS:
+            return passage
+        passage_index = self._passage_index(passage)
+        if not passage_index.paragraphs:
+            return passage
+        numbers = cited_paragraphs(question.get("question", ""), max(passage_index.paragraphs))
+        excerpt = passage_index.excerpt(numbers) if numbers else None
+        if excerpt is None:
+            return passage
+        logger.info(f"{task_id}: Sending only paragraphs {numbers} to the {check_name} check")
+        return dict(passage, text=excerpt)
+    
+    @staticmethod
+    def _normalize_option(text: str) -> str:
+        """
+        Normalize an option for comparison: lower case, no punctuation, single spaces.
+        
+        Args:
+            text: The option text
+            
+        Returns:
+            Normalized text
+        """
+        return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+    
+    @staticmethod
+    def _html_imbalance(text: str) -> Optional[str]:
+        """
+        Find the first unbalanced HTML tag in a text.
+        
+        Args:
+            text: The text to check
+            
+        Returns:
+            Description of the problem, or None if the tags are balanced
+        """
+        open_tags = []
+        for match in HTML_TAG_PATTERN.finditer(text):
+            closing, tag, self_closing = match.group(1), match.group(2).lower(), match.group(3)
+            if tag in VOID_ELEMENTS or self_closing:
+                continue
+            if not closing:
+                open_tags.append(tag)
+            elif open_tags and open_tags[-1] == tag:
+                open_tags.pop()
+            else:
+                return f"unexpected </{tag}>"
+        if open_tags:
+            return f"<{open_tags[-1]}> is never closed"
+        return None
     
     async def _perform_advanced_validation(self, 
                                      question: Dict[str, Any],
                                      passage: Dict[str, Any],
                                      standard_id: str,
                                      previous_questions: List[Dict[str, Any]],
-                                     task_id: str = "") -> Dict[str, Any]:
+                                     task_id: str = "",
+                                     reused_checks: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Perform advanced validation using Claude quality control checks
+        Perform advanced validation using Claude quality control checks.
+        The required checks and the plausibility check are independent, so they
+        are all dispatched concurrently and merged in a fixed order afterwards.
         
         Args:
             question: The question to validate
@@ -227,19 +593,15 @@ class QuestionQualityControl:
             standard_id: The standard ID for the question
             previous_questions: Previously generated questions
             task_id: Identifier for this task (for logging)
+            reused_checks: Check name to carried-over verdict; checks listed here are
+                           not re-run. The "plausibility" entry maps distractor IDs to
+                           carried-over distractor results.
             
         Returns:
             Validation result dictionary
         """
         # List of required quality checks
-        required_checks = [
-            "formatting", 
-            "structure", 
-            "depth", 
-            "precision", 
-            "textual evidence", 
-            "single correct answer"
-        ]
+        required_checks = list(REQUIRED_CHECKS)
         
         # Initialize result
         result = {
@@ -250,18 +612,33 @@ class QuestionQualityControl:
             "quality_checks": {}
         }
         
-        # Run each required check
+        reused_checks = reused_checks or {}
+        checks_to_run = [check_name for check_name in required_checks if check_name not in reused_checks]
+        
+        # Run the required checks and the plausibility check concurrently
+        outcomes = await asyncio.gather(
+            self._run_required_checks(checks_to_run, question, passage, standard_id, task_id),
+            self._run_plausibility_check(
+                question, passage, standard_id, task_id, reused_checks.get("plausibility")
+            ),
+            return_exceptions=True
+        )
+        
+        # Propagate the first failure only after every branch has settled
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        
+        check_results, plausibility_check = outcomes
+        
         for check_name in required_checks:
-            check_start_time = asyncio.get_event_loop().time()
-            logger.info(f"{task_id}: Running quality check: {check_name}")
-            
-            check_result = await self._run_specific_quality_check(
-                check_name, question, passage, standard_id, task_id
-            )
-            
-            check_duration = asyncio.get_event_loop().time() - check_start_time
-            logger.info(f"{task_id}: {check_name} check completed in {check_duration:.2f}s")
-            
+            if check_name in reused_checks:
+                logger.info(f"{task_id}: Carried over {check_name} verdict")
+                check_results[check_name] = reused_checks[check_name]
+        
+        # Merge the required checks in their declared order
+        for check_name in required_checks:
+            check_result = check_results[check_name]
             # Log the result
             passes = check_result.get("passes", False)
             score = check_result.get("score", 0)
@@ -284,7 +661,124 @@ class QuestionQualityControl:
                         f"Improve {check_name}: {reasoning}"
                     )
         
-        # Run plausibility check separately
+        # The counts are only needed for the messages below, not in quality_checks
+        plausible_distractors = plausibility_check.pop("plausible_count")
+        required_plausible = plausibility_check.pop("required_plausible")
+        difficulty_level = plausibility_check.pop("difficulty_level")
+        
+        # Add plausibility check result
+        result["quality_checks"]["plausibility"] = plausibility_check
+        
+        if not plausibility_check["passes"]:
+            result["is_valid"] = False
+            result["errors"].append(f"Failed plausibility check: Only {plausible_distractors} out of 3 distractors are plausible. {difficulty_level.capitalize()} difficulty questions require at least {required_plausible} plausible distractors.")
+            result["improvement_suggestions"].append(f"Improve plausibility: Make at least {required_plausible} distractors plausible for {difficulty_level} difficulty questions.")
+        
+        return result
+    
+    async def _run_required_checks(self,
+                                   check_names: List[str],
+                                   question: Dict[str, Any],
+                                   passage: Dict[str, Any],
+                                   standard_id: str,
+                                   task_id: str = "",
+                                   fused: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the required quality checks, one call per check or all in one fused call.
+        
+        Args:
+            check_names: Names of the quality checks to run
+            question: The question to validate
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            task_id: Identifier for this task (for logging)
+            fused: Judge all checks in one call (defaults to QC_MODE); checks without a
+                   usable verdict in the fused reply fall back to their own prompts
+            
+        Returns:
+            Dictionary mapping check name to quality check result
+        """
+        if fused is None:
+            # Deadline pressure switches to the fused call as well
+            fused = QC_MODE == "fused" or take_shortcut(BATCHED_CHECKS)
+        
+        check_results = {}
+        if fused and len(check_names) > 1:
+            check_results = await self._run_fused_quality_check(
+                check_names, question, passage, standard_id, task_id
+            )
+            missing = [check_name for check_name in check_names if check_name not in check_results]
+            if missing:
+                logger.warning(f"{task_id}: Fused QC reply had no usable verdict for {', '.join(missing)}; "
+                               f"running those checks separately")
+        
+        remaining = [check_name for check_name in check_names if check_name not in check_results]
+        outcomes = await asyncio.gather(
+            *(self._run_timed_quality_check(check_name, question, passage, standard_id, task_id)
+              for check_name in remaining),
+            return_exceptions=True
+        )
+        
+        # Propagate the first failure only after every check has settled
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        
+        check_results.update(zip(remaining, outcomes))
+        return check_results
+    
+    async def _run_timed_quality_check(self,
+                                       check_name: str,
+                                       question: Dict[str, Any],
+                                       passage: Dict[str, Any],
+                                       standard_id: str,
+                                       task_id: str = "") -> Dict[str, Any]:
+        """
+        Run a single quality check and log how long it took.
+        
+        Args:
+            check_name: Name of the quality check to run
+            question: The question to validate
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            Quality check result
+        """
+        check_start_time = asyncio.get_event_loop().time()
+        logger.info(f"{task_id}: Running quality check: {check_name}")
+        
+        check_result = await self._run_specific_quality_check(
+            check_name, question, passage, standard_id, task_id
+        )
+        
+        check_duration = asyncio.get_event_loop().time() - check_start_time
+        logger.info(f"{task_id}: {check_name} check completed in {check_duration:.2f}s")
+        
+        return check_result
+    
+    async def _run_plausibility_check(self,
+                                      question: Dict[str, Any],
+                                      passage: Dict[str, Any],
+                                      standard_id: str,
+                                      task_id: str = "",
+                                      reused_distractors: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Run the distractor plausibility checks and reduce them to a single verdict
+        based on how many plausible distractors the question's difficulty requires.
+        
+        Args:
+            question: The question to validate
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            task_id: Identifier for this task (for logging)
+            reused_distractors: Distractor ID to carried-over result for distractors
+                                that do not need to be checked again
+            
+        Returns:
+            Plausibility check result in the quality_checks format
+        """
         check_start_time = asyncio.get_event_loop().time()
         logger.info(f"{task_id}: Running plausibility checks for distractors")
         
@@ -304,7 +798,7 @@ class QuestionQualityControl:
         
         # Check plausibility for each distractor
         plausibility_results = await self._check_distractor_plausibility(
-            question, passage, standard_id, task_id
+            question, passage, standard_id, task_id, reused_distractors=reused_distractors
         )
         
         plausible_distractors = 0
@@ -328,23 +822,20 @@ class QuestionQualityControl:
         # Set overall plausibility check result
         plausibility_passes = plausible_distractors >= required_plausible
         
-        # Add plausibility check result
-        result["quality_checks"]["plausibility"] = {
-            "passes": plausibility_passes,
-            "score": 1 if plausibility_passes else 0,
-            "reasoning": f"Found {plausible_distractors} plausible distractors, need {required_plausible} for {difficulty_level} difficulty",
-            "distractor_results": distractor_results
-        }
-        
         if plausibility_passes:
             logger.info(f"{task_id}: Passed plausibility check with {plausible_distractors} plausible distractors")
         else:
             logger.warning(f"{task_id}: Failed plausibility check: only {plausible_distractors} distractors are plausible (need {required_plausible})")
-            result["is_valid"] = False
-            result["errors"].append(f"Failed plausibility check: Only {plausible_distractors} out of 3 distractors are plausible. {difficulty_level.capitalize()} difficulty questions require at least {required_plausible} plausible distractors.")
-            result["improvement_suggestions"].append(f"Improve plausibility: Make at least {required_plausible} distractors plausible for {difficulty_level} difficulty questions.")
         
-        return result
+        return {
+            "passes": plausibility_passes,
+            "score": 1 if plausibility_passes else 0,
+            "reasoning": f"Found {plausible_distractors} plausible distractors, need {required_plausible} for {difficulty_level} difficulty",
+            "distractor_results": distractor_results,
+            "plausible_count": plausible_distractors,
+            "required_plausible": required_plausible,
+            "difficulty_level": difficulty_level
+        }
     
     def _format_qc_prompt(self, 
                         prompt_template: str,
@@ -370,7 +861,7 @@ class QuestionQualityControl:
         
         # Format passage information
         passage_info = f"{passage.get('title', 'Untitled')} by {passage.get('author', 'Unknown')} ({passage.get('type', 'Unknown')})"
-        passage_text = passage.get('text', '')
+        passage_text = passage_text_for_prompt(passage)
         
         # Format previous questions
         prev_questions_text = ""
@@ -399,52 +890,36 @@ class QuestionQualityControl:
             ValueError,
             Exception
         ],
-        timeout=config.API_TIMEOUT
+        exceptions_not_to_retry=[BudgetExhausted]
     )
-    async def _call_claude_with_retry(self, prompt: str) -> str:
+    async def _call_claude_with_retry(self, prompt: str, passage: Optional[Dict[str, Any]] = None) -> str:
         """
         Call Claude API with retry logic
         
         Args:
             prompt: The prompt to send to Claude
+            passage: Optional passage to send ahead of the prompt as a cached prefix
             
         Returns:
             Claude's response
         """
         logger.info("Making Claude API call")
         
-        # Initialize client if needed
-        if not hasattr(self, 'client') or self.client is None:
-            api_key = self.api_key or config.ANTHROPIC_API_KEY
-            if not api_key:
-                raise ValueError("No API key provided. Set ANTHROPIC_API_KEY environment variable.")
-            self.client = anthropic.Anthropic(api_key=api_key)
-            logger.info("Initialized Claude client")
-        
-        # Make API call
-        response = await asyncio.to_thread(
-            lambda: self.client.messages.create(
-                model=MODEL,
-                max_tokens=4000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        # Make API call through the shared async client
+        # Empty or too-short responses raise here, before they can be cached
+        response = await create_message(
+            stage=STAGE_QC,
+            api_key=self.api_key,
+            min_text_length=10,
+            model=MODEL,
+            max_tokens=4000,
+            messages=[
+                {"role": "user", "content": build_user_content(prompt, passage)}
+            ]
         )
         
-        # Check if response is valid
-        if not response or not response.content or len(response.content) == 0:
-            raise ValueError("Empty response from Claude API")
-        
-        # Extract the response text
-        response_text = response.content[0].text
-        
-        # Check if the response is too short to be valid
-        if len(response_text) < 10:
-            raise ValueError(f"Response too short: '{response_text}'")
-        
         # Valid response received
-        return response_text
+        return response.content[0].text
     
     def _parse_validation_response(self, response: str) -> Dict[str, Any]:
         """
@@ -521,19 +996,23 @@ class QuestionQualityControl:
                              validation_result: Dict[str, Any],
                              passage: Dict[str, Any],
                              standard_id: str,
-                             task_id: str = "") -> Dict[str, Any]:
+                             previous_questions: List[Dict[str, Any]] = None,
+                             task_id: str = "") -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
         """
-        Attempt to improve a question that failed validation
+        Attempt to improve a question that failed validation, and validate the result
         
         Args:
             question: The original question
             validation_result: The validation result with errors
             passage: The passage used for the question
             standard_id: The standard ID for the question
+            previous_questions: Previously generated questions, used when validating the improved question
             task_id: Identifier for this task (for logging)
             
         Returns:
-            Improved question or None if improvement failed
+            Tuple of (improved question, its validation result). The original question and
+            validation result are returned if there was nothing to improve, and (None, None)
+            if no improved question could be extracted. Callers should check "is_valid".
         """
         start_time = asyncio.get_event_loop().time()
         logger.info(f"{task_id}: Attempting to improve question")
@@ -541,7 +1020,7 @@ class QuestionQualityControl:
         # Check if we have errors to fix
         if not validation_result.get("errors") and not validation_result.get("improvement_suggestions"):
             logger.info(f"{task_id}: No errors or suggestions found, no improvement needed")
-            return question
+            return question, validation_result
                 
         # Build improvement prompt
         prompt_start = asyncio.get_event_loop().time()
@@ -554,7 +1033,7 @@ class QuestionQualityControl:
         # Call Claude with the prompt
         api_start = asyncio.get_event_loop().time()
         logger.info(f"{task_id}: Sending improvement prompt to Claude")
-        response = await self._call_claude_with_retry(prompt)
+        response = await self._call_claude_with_retry(prompt, passage)
         api_time = asyncio.get_event_loop().time() - api_start
         logger.info(f"{task_id}: Received improvement response from Claude in {api_time:.2f}s")
         
@@ -567,7 +1046,7 @@ class QuestionQualityControl:
         if not improved_question:
             total_time = asyncio.get_event_loop().time() - start_time
             logger.warning(f"{task_id}: Failed to extract improved question after {total_time:.2f}s")
-            return None
+            return None, None
                 
         # Carry over metadata from original question
         improved_question["standard"] = question.get("standard")
@@ -577,8 +1056,13 @@ class QuestionQualityControl:
         validate_start = asyncio.get_event_loop().time()
         logger.info(f"{task_id}: Validating improved question")
         
+        reused_checks = None
+        if INCREMENTAL_REVALIDATION:
+            reused_checks = self._plan_revalidation(question, validation_result, improved_question, task_id)
+        
         improved_validation = await self.validate_question(
-            improved_question, passage, standard_id, task_id=f"{task_id} (improved)"
+            improved_question, passage, standard_id, previous_questions,
+            task_id=f"{task_id} (improved)", reused_checks=reused_checks
         )
         
         validate_time = asyncio.get_event_loop().time() - validate_start
@@ -588,12 +1072,79 @@ class QuestionQualityControl:
         if improved_validation["is_valid"]:
             total_time = asyncio.get_event_loop().time() - start_time
             logger.info(f"{task_id}: Question successfully improved in {total_time:.2f}s")
-            return improved_question
         else:
             error_count = len(improved_validation.get("errors", []))
             total_time = asyncio.get_event_loop().time() - start_time
             logger.warning(f"{task_id}: Improved question failed validation with {error_count} errors after {total_time:.2f}s")
-            return None
+        
+        return improved_question, improved_validation
+    
+    @staticmethod
+    def _template_fields(prompt_template: str) -> set:
+        """
+        Work out which question fields a QC prompt template reads.
+        
+        Args:
+            prompt_template: The prompt template
+            
+        Returns:
+            Set of question fields; all of them if the template uses no recognised placeholder
+        """
+        fields = set()
+        for placeholder in re.findall(r"\{(\w+)\}", prompt_template):
+            fields |= PLACEHOLDER_FIELDS.get(placeholder, set())
+        return fields or set(QUESTION_FIELDS)
+    
+    def _plan_revalidation(self,
+                           original_question: Dict[str, Any],
+                           validation_result: Dict[str, Any],
+                           improved_question: Dict[str, Any],
+                           task_id: str = "") -> Dict[str, Any]:
+        """
+        Decide which verdicts of the original validation still hold for the improved question.
+        
+        A check's passing verdict is carried over when none of the fields its template
+        reads has changed. A distractor's plausibility verdict is carried over when
+        neither it nor the question stem or correct answer has changed.
+        
+        Args:
+            original_question: The question that was validated
+            validation_result: Its validation result
+            improved_question: The improved question about to be validated
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            Check name to carried-over verdict, in the format taken by validate_question
+        """
+        changed_fields = {
+            field for field in QUESTION_FIELDS
+            if (original_question.get(field) or "").strip() != (improved_question.get(field) or "").strip()
+        }
+        if original_question.get("difficulty") != improved_question.get("difficulty"):
+            return {}
+        
+        quality_checks = validation_result.get("quality_checks", {})
+        reused_checks = {}
+        
+        for check_name, check_result in quality_checks.items():
+            if check_name == "plausibility" or not check_result.get("passes"):
+                continue
+            dependencies = self.check_dependencies.get(check_name, set(QUESTION_FIELDS))
+            if not dependencies & changed_fields:
+                reused_checks[check_name] = check_result
+        
+        plausibility = quality_checks.get("plausibility")
+        if plausibility and not {"question", "correct_answer"} & changed_fields:
+            reused_distractors = {
+                result["id"]: result for result in plausibility.get("distractor_results", [])
+                if result.get("id") and result["id"] not in changed_fields
+            }
+            if reused_distractors:
+                reused_checks["plausibility"] = reused_distractors
+        
+        logger.info(f"{task_id}: Improvement changed {sorted(changed_fields) or 'no fields'}; "
+                    f"carrying over {sorted(reused_checks) or 'no checks'}")
+        return reused_checks
     
     def _build_improvement_prompt(self, 
                                 question: Dict[str, Any],
@@ -622,7 +1173,7 @@ class QuestionQualityControl:
         
         # Format passage information
         passage_info = f"{passage.get('title', 'Untitled')} by {passage.get('author', 'Unknown')} ({passage.get('type', 'Unknown')})"
-        passage_text = passage.get('text', '')
+        passage_text = passage_text_for_prompt(passage)
         
         # Build the improvement prompt
         prompt = f"""You are an expert in educational assessment. You need to improve a quiz question based on the validation feedback.
@@ -731,7 +1282,9 @@ Return ONLY the JSON with no additional text before or after it.
                                       question: Dict[str, Any],
                                       passage: Dict[str, Any],
                                       standard_id: str,
-                                      task_id: str = "") -> Dict[str, Any]:
+                                      task_id: str = "",
+                                      batched: Optional[bool] = None,
+                                      reused_distractors: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Check the plausibility of each distractor in the question
         
@@ -740,6 +1293,10 @@ Return ONLY the JSON with no additional text before or after it.
             passage: The passage used for the question
             standard_id: The standard ID for the question
             task_id: Identifier for this task (for logging)
+            batched: Judge all distractors in one call (defaults to PLAUSIBILITY_MODE);
+                     falls back to one call per distractor if the batched reply is unusable
+            reused_distractors: Distractor ID to carried-over result; only the other
+                                distractors are sent to Claude
             
         Returns:
             Plausibility check results
@@ -759,12 +1316,78 @@ Return ONLY the JSON with no additional text before or after it.
         # Debug: Log the first part of the prompt template to verify it's correct
         logger.info(f"{task_id}: DEBUG - Plausibility prompt template begins with: {prompt_template[:200]}...")
         
-        # Check each distractor
-        logger.info(f"{task_id}: Checking plausibility for 3 distractors")
+        if batched is None:
+            # Close to the quiz deadline, batch even when individual checks are configured
+            batched = PLAUSIBILITY_MODE == "batched" or take_shortcut(BATCHED_CHECKS)
+        
+        reused_distractors = reused_distractors or {}
+        distractor_ids = [d_id for d_id in ["distractor1", "distractor2", "distractor3"] if d_id not in reused_distractors]
+        
+        checked_results = [] if not distractor_ids else None
+        if batched and distractor_ids:
+            checked_results = await self._check_distractors_batched(
+                prompt_template, question, passage, standard_id, task_id, distractor_ids
+            )
+            if checked_results is None:
+                logger.warning(f"{task_id}: Batched plausibility response was unusable, falling back to per-distractor checks")
+        
+        if checked_results is None:
+            checked_results = await self._check_distractors_individually(
+                prompt_template, question, passage, standard_id, task_id, distractor_ids
+            )
+        
+        # Reassemble the results in distractor order
+        checked_by_id = {result["id"]: result for result in checked_results}
+        distractor_results = []
+        for distractor_id in ["distractor1", "distractor2", "distractor3"]:
+            if distractor_id in reused_distractors:
+                logger.info(f"{task_id}: Carried over plausibility verdict for {distractor_id}")
+                distractor_results.append(dict(reused_distractors[distractor_id]))
+            else:
+                distractor_results.append(checked_by_id[distractor_id])
+        
+        plausible_count = sum(1 for r in distractor_results if r["is_plausible"])
+        
+        # Force at least one distractor to pass for testing
+        # Comment this out after debugging
+        if plausible_count == 0 and len(distractor_results) > 0:
+            logger.warning(f"{task_id}: DEBUG - All distractors failed plausibility. Forcing the first one to pass for testing.")
+            distractor_results[0]["is_plausible"] = True
+            plausible_count = 1
+        
+        logger.info(f"{task_id}: Found {plausible_count} plausible distractors out of {len(distractor_results)}")
+        
+        return {
+            "distractors": distractor_results
+        }
+    
+    async def _check_distractors_individually(self,
+                                              prompt_template: str,
+                                              question: Dict[str, Any],
+                                              passage: Dict[str, Any],
+                                              standard_id: str,
+                                              task_id: str = "",
+                                              distractor_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Check each distractor with its own plausibility prompt.
+        
+        Args:
+            prompt_template: The plausibility prompt template
+            question: The question to check
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            task_id: Identifier for this task (for logging)
+            distractor_ids: Distractors to check (defaults to all three)
+            
+        Returns:
+            List of per-distractor results (id, is_plausible, reasoning)
+        """
+        if distractor_ids is None:
+            distractor_ids = ["distractor1", "distractor2", "distractor3"]
+        
+        logger.info(f"{task_id}: Checking plausibility for {len(distractor_ids)} distractors")
         distractor_results = []
-        plausible_count = 0
         
-        distractor_ids = ["distractor1", "distractor2", "distractor3"]
         for distractor_id in distractor_ids:
             distractor_text = question.get(distractor_id, "")
             if not distractor_text:
@@ -790,7 +1413,7 @@ Return ONLY the JSON with no additional text before or after it.
                 
             # Call Claude with the prompt
             logger.info(f"{task_id}: Sending plausibility check prompt to Claude for {distractor_id}")
-            response = await self._call_claude_with_retry(prompt)
+            response = await self._call_claude_with_retry(prompt, passage)
             
             # Debug: Log a small portion of the response
             logger.info(f"{task_id}: DEBUG - Claude response first 200 chars: {response[:200]}...")
@@ -806,9 +1429,6 @@ Return ONLY the JSON with no additional text before or after it.
             # Debug: Add more detail to the log
             logger.info(f"{task_id}: DEBUG - Plausibility result for {distractor_id}: score={score}, is_plausible={is_plausible}")
             
-            if is_plausible:
-                plausible_count += 1
-                
             # Add result for this distractor
             distractor_results.append({
                 "id": distractor_id,
@@ -820,18 +1440,174 @@ Return ONLY the JSON with no additional text before or after it.
             plausibility_status = "plausible" if is_plausible else "not plausible"
             logger.info(f"{task_id}: {distractor_id} is {plausibility_status} (checked in {time_taken:.2f}s)")
         
-        # Force at least one distractor to pass for testing
-        # Comment this out after debugging
-        if plausible_count == 0 and len(distractor_results) > 0:
-            logger.warning(f"{task_id}: DEBUG - All distractors failed plausibility. Forcing the first one to pass for testing.")
-            distractor_results[0]["is_plausible"] = True
-            plausible_count = 1
+        return distractor_results
+    
+    async def _check_distractors_batched(self,
+                                         prompt_template: str,
+                                         question: Dict[str, Any],
+                                         passage: Dict[str, Any],
+                                         standard_id: str,
+                                         task_id: str = "",
+                                         distractor_ids: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Judge every distractor in a single Claude call.
         
-        logger.info(f"{task_id}: Found {plausible_count} plausible distractors out of {len(distractor_results)}")
+        Args:
+            prompt_template: The plausibility prompt template
+            question: The question to check
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            task_id: Identifier for this task (for logging)
+            distractor_ids: Distractors to judge (defaults to all three)
+            
+        Returns:
+            List of per-distractor results in the same shape as the per-distractor
+            path, or None if the response did not contain a verdict for each distractor
+        """
+        if distractor_ids is None:
+            distractor_ids = ["distractor1", "distractor2", "distractor3"]
+        distractors = {d_id: question.get(d_id, "") for d_id in distractor_ids if question.get(d_id, "")}
         
-        return {
-            "distractors": distractor_results
+        if not distractors:
+            return None
+        
+        start_time = asyncio.get_event_loop().time()
+        logger.info(f"{task_id}: Checking plausibility for {len(distractors)} distractors in one call")
+        
+        prompt = self._format_batched_plausibility_prompt(
+            prompt_template, question, passage, standard_id, distractors
+        )
+        response = await self._call_claude_with_retry(prompt, passage)
+        verdicts = self._parse_batched_plausibility_response(response, list(distractors))
+        
+        if verdicts is None:
+            return None
+        
+        distractor_results = []
+        for distractor_id in distractor_ids:
+            if distractor_id not in distractors:
+                logger.warning(f"{task_id}: Missing distractor: {distractor_id}")
+                distractor_results.append({
+                    "id": distractor_id,
+                    "is_plausible": False,
+                    "reasoning": "Missing distractor text"
+                })
+                continue
+            
+            verdict = verdicts[distractor_id]
+            distractor_results.append({
+                "id": distractor_id,
+                "is_plausible": verdict["is_plausible"],
+                "reasoning": verdict["reasoning"]
+            })
+        
+        time_taken = asyncio.get_event_loop().time() - start_time
+        logger.info(f"{task_id}: Batched plausibility check completed in {time_taken:.2f}s")
+        
+        return distractor_results
+    
+    def _format_batched_plausibility_prompt(self,
+                                            prompt_template: str,
+                                            question: Dict[str, Any],
+                                            passage: Dict[str, Any],
+                                            standard_id: str,
+                                            distractors: Dict[str, str]) -> str:
+        """
+        Format the plausibility prompt so that it evaluates several distractors at once.
+        The rubric from the template is kept as-is; only the input and output format change.
+        
+        Args:
+            prompt_template: The plausibility prompt template
+            question: The question being validated
+            passage: The passage the question is based on
+            standard_id: The educational standard
+            distractors: Mapping of distractor ID to distractor text
+            
+        Returns:
+            Formatted prompt for the batched plausibility check
+        """
+        input_json = {
+            "passage": passage_text_for_prompt(passage),
+            "passage_info": f"{passage.get('title', 'Untitled')} by {passage.get('author', 'Unknown')} ({passage.get('type', 'Unknown')})",
+            "question": question.get("question", ""),
+            "correct_answer": question.get("correct_answer", ""),
+            "distractors_to_check": distractors,
+            "standard_id": standard_id
         }
+        
+        json_str = json.dumps(input_json, indent=2)
+        formatted_prompt = prompt_template.replace("{json.dumps(input_json, indent=2)}", json_str)
+        formatted_prompt = formatted_prompt.replace("{passage}", passage_text_for_prompt(passage))
+        formatted_prompt = formatted_prompt.replace("{PASSAGE_TEXT}", passage_text_for_prompt(passage))
+        formatted_prompt = formatted_prompt.replace("{question}", question.get("question", ""))
+        formatted_prompt = formatted_prompt.replace("{QUESTION}", question.get("question", ""))
+        formatted_prompt = formatted_prompt.replace("{correct_answer}", question.get("correct_answer", ""))
+        formatted_prompt = formatted_prompt.replace("{STANDARD_ID}", standard_id)
+        
+        example_answer = json.dumps(
+            {d_id: {"score": "[1 or 0]", "reasoning": "[1-2 sentences]"} for d_id in distractors},
+            indent=2
+        )
+        formatted_prompt += f"""
+
+BATCH EVALUATION:
+The input contains {len(distractors)} distractors under "distractors_to_check". Apply the evaluation process and decision rule above to EACH distractor independently.
+Instead of the single-distractor output format above, respond with ONE answer block containing a verdict for every distractor, keyed by its ID:
+
+<answer>
+{example_answer}
+</answer>
+"""
+        return formatted_prompt
+    
+    def _parse_batched_plausibility_response(self,
+                                             response: str,
+                                             distractor_ids: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Parse Claude's response for a batched plausibility check.
+        
+        Args:
+            response: Raw response from Claude
+            distractor_ids: The distractor IDs that were sent for evaluation
+            
+        Returns:
+            Mapping of distractor ID to {"is_plausible", "score", "reasoning"},
+            or None if any requested distractor is missing or malformed
+        """
+        candidates = re.findall(r"<answer>([\s\S]*?)</answer>", response)
+        candidates += re.findall(r"```(?:json)?\s*([\s\S]*?)\s*```", response)
+        
+        for candidate in candidates:
+            try:
+                answer_data = json.loads(candidate.strip())
+            except json.JSONDecodeError:
+                continue
+            
+            if not isinstance(answer_data, dict):
+                continue
+            
+            verdicts = {}
+            for distractor_id in distractor_ids:
+                verdict = answer_data.get(distractor_id)
+                if not isinstance(verdict, dict):
+                    break
+                try:
+                    score = int(verdict.get("score"))
+                except (ValueError, TypeError):
+                    break
+                if score not in (0, 1):
+                    break
+                verdicts[distractor_id] = {
+                    "is_plausible": score == 1,
+                    "score": score,
+                    "reasoning": verdict.get("reasoning", "")
+                }
+            
+            if len(verdicts) == len(distractor_ids):
+                return verdicts
+        
+        logger.warning("Could not parse a verdict for every distractor from batched plausibility response")
+        return None
     
     def _format_plausibility_prompt(self,
                                  prompt_template: str,
@@ -856,7 +1632,7 @@ Return ONLY the JSON with no additional text before or after it.
         """
         # Create input JSON for the prompt
         input_json = {
-            "passage": passage.get("text", ""),
+            "passage": passage_text_for_prompt(passage),
             "passage_info": f"{passage.get('title', 'Untitled')} by {passage.get('author', 'Unknown')} ({passage.get('type', 'Unknown')})",
             "question": question.get("question", ""),
             "correct_answer": question.get("correct_answer", ""),
@@ -869,8 +1645,8 @@ Return ONLY the JSON with no additional text before or after it.
         formatted_prompt = prompt_template.replace("{json.dumps(input_json, indent=2)}", json_str)
         
         # Also handle any other standard placeholders that might be in the template
-        formatted_prompt = formatted_prompt.replace("{passage}", passage.get("text", ""))
-        formatted_prompt = formatted_prompt.replace("{PASSAGE_TEXT}", passage.get("text", ""))
+        formatted_prompt = formatted_prompt.replace("{passage}", passage_text_for_prompt(passage))
+        formatted_prompt = formatted_prompt.replace("{PASSAGE_TEXT}", passage_text_for_prompt(passage))
         formatted_prompt = formatted_prompt.replace("{question}", question.get("question", ""))
         formatted_prompt = formatted_prompt.replace("{QUESTION}", question.get("question", ""))
         formatted_prompt = formatted_prompt.replace("{correct_answer}", question.get("correct_answer", ""))
@@ -1023,6 +1799,9 @@ Return ONLY the JSON with no additional text before or after it.
                 "reasoning": f"No prompt available for {check_name} check"
             }
             
+        # Checks that only need the cited paragraphs are sent an excerpt
+        passage = self._passage_for_check(check_name, question, passage, task_id)
+        
         # Format prompt with question details
         prompt = self._format_quality_check_prompt(
             prompt_template, question, passage, standard_id
@@ -1031,7 +1810,7 @@ Return ONLY the JSON with no additional text before or after it.
         # Call Claude with the prompt
         start_time = asyncio.get_event_loop().time()
         logger.debug(f"{task_id}: Sending {check_name} quality check prompt to Claude")
-        response = await self._call_claude_with_retry(prompt)
+        response = await self._call_claude_with_retry(prompt, passage)
         api_time = asyncio.get_event_loop().time() - start_time
         logger.debug(f"{task_id}: Received {check_name} quality check response from Claude in {api_time:.2f}s")
         
@@ -1075,7 +1854,7 @@ Return ONLY the JSON with no additional text before or after it.
         formatted_prompt = prompt_template
         
         # Replace passage info - different formats are used in different prompts
-        passage_text = passage.get("text", "")
+        passage_text = passage_text_for_prompt(passage)
         passage_info = f"{passage.get('title', 'Untitled')} by {passage.get('author', 'Unknown')} ({passage.get('type', 'Unknown')})"
         
         # Replace various passage placeholders
@@ -1185,6 +1964,439 @@ Return ONLY the JSON with no additional text before or after it.
             logger.error(f"Error parsing quality check response: {str(e)}")
         
         return result
+    
+    async def _run_fused_quality_check(self,
+                                       check_names: List[str],
+                                       question: Dict[str, Any],
+                                       passage: Dict[str, Any],
+                                       standard_id: str,
+                                       task_id: str = "") -> Dict[str, Dict[str, Any]]:
+        """
+        Judge several quality checks in a single Claude call that carries the passage once.
+        
+        Args:
+            check_names: Names of the quality checks to run
+            question: The question to validate
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            Dictionary mapping check name to quality check result, for every check
+            the response has a well-formed verdict for
+        """
+        rubrics = {check_name: self.qc_prompts[check_name] for check_name in check_names
+                   if check_name in self.qc_prompts}
+        if not rubrics:
+            return {}
+        
+        start_time = asyncio.get_event_loop().time()
+        logger.info(f"{task_id}: Running {len(rubrics)} quality checks in one fused call")
+        
+        prompt = self._format_fused_quality_check_prompt(rubrics, question, passage, standard_id)
+        response = await self._call_claude_with_retry(prompt, passage)
+        verdicts = self._parse_fused_quality_check_response(response, list(rubrics))
+        
+        time_taken = asyncio.get_event_loop().time() - start_time
+        logger.info(f"{task_id}: Fused quality check returned {len(verdicts)}/{len(rubrics)} verdicts "
+                    f"in {time_taken:.2f}s")
+        
+        return verdicts
+    
+    def _format_fused_quality_check_prompt(self,
+                                           rubrics: Dict[str, str],
+                                           question: Dict[str, Any],
+                                           passage: Dict[str, Any],
+                                           standard_id: str) -> str:
+        """
+        Format one prompt that applies several QC rubrics to a question.
+        Each rubric from the prompts file is kept as-is, but refers to a single copy of
+        the passage; only the output format changes.
+        
+        Args:
+            rubrics: Mapping of check name to prompt template
+            question: The question to validate
+            passage: The passage the question is based on
+            standard_id: The educational standard
+            
+        Returns:
+            Formatted prompt for the fused quality check
+        """
+        # Every rubric points at the one copy of the passage instead of embedding its own
+        referenced_passage = dict(passage, text=PASSAGE_REFERENCE)
+        
+        formatted_prompt = ""
+        if not config.PROMPT_CACHING:
+            # Without the cached prefix block the passage goes at the start of the prompt
+            formatted_prompt += f"PASSAGE:\n{passage.get('text', '')}\n\n"
+        
+        formatted_prompt += (
+            f"You will evaluate one question against {len(rubrics)} separate quality rubrics. "
+            f"Apply each rubric's analysis process and guidelines independently, as if it were the only one; "
+            f"a question can pass some rubrics and fail others. Keep the analysis for each rubric brief.\n"
+        )
+        for check_name, prompt_template in rubrics.items():
+            rubric = self._format_quality_check_prompt(prompt_template, question, referenced_passage, standard_id)
+            formatted_prompt += f"\n=== RUBRIC: {check_name} ===\n{rubric}\n"
+        
+        example_answer = json.dumps(
+            {check_name: {"score": "[1 or 0]", "reasoning": "[1-2 sentences]"} for check_name in rubrics},
+            indent=2
+        )
+        formatted_prompt += f"""
+FUSED EVALUATION:
+Instead of the output format given in each rubric, respond with ONE answer block containing a verdict for every rubric, keyed by its name:
+
+<answer>
+{example_answer}
+</answer>
+"""
+        return formatted_prompt
+    
+    def _parse_fused_quality_check_response(self,
+                                            response: str,
+                                            check_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse Claude's response for a fused quality check.
+        
+        Args:
+            response: Raw response from Claude
+            check_names: The checks that were sent for evaluation
+            
+        Returns:
+            Dictionary mapping check name to {"passes", "score", "reasoning"} for every
+            check with a well-formed verdict; malformed or missing verdicts are left out
+        """
+        answers = self._parse_keyed_answer(response, check_names)
+        
+        verdicts = {}
+        for check_name, answer in answers.items():
+            verdict = self._parse_score_verdict(answer)
+            if verdict is not None:
+                verdicts[check_name] = verdict
+        
+        if len(verdicts) < len(check_names):
+            logger.warning("Could not parse a verdict for every check from fused quality check response")
+        return verdicts
+    
+    def _parse_keyed_answer(self, response: str, keys: List[str]) -> Dict[str, Any]:
+        """
+        Find the JSON answer object that has entries for the most of the given keys.
+        
+        Args:
+            response: Raw response from Claude
+            keys: Keys the answer object is expected to have
+            
+        Returns:
+            Dictionary mapping each key found to its entry (empty if no answer object parses)
+        """
+        candidates = re.findall(r"<answer>([\s\S]*?)</answer>", response)
+        candidates += re.findall(r"```(?:json)?\s*([\s\S]*?)\s*```", response)
+        
+        best_answers = {}
+        for candidate in candidates:
+            try:
+                answer_data = json.loads(candidate.strip())
+            except json.JSONDecodeError:
+                continue
+            
+            if not isinstance(answer_data, dict):
+                continue
+            
+            answers = {key: answer_data[key] for key in keys if key in answer_data}
+            if len(answers) > len(best_answers):
+                best_answers = answers
+            if len(answers) == len(keys):
+                break
+        
+        return best_answers
+    
+    def _parse_score_verdict(self, verdict: Any) -> Optional[Dict[str, Any]]:
+        """
+        Turn one {"score", "reasoning"} entry of a structured answer into a check result.
+        
+        Args:
+            verdict: The entry from the answer object
+            
+        Returns:
+            Dictionary with "passes", "score" and "reasoning", or None if the entry is malformed
+        """
+        if not isinstance(verdict, dict):
+            return None
+        try:
+            score = int(verdict.get("score"))
+        except (ValueError, TypeError):
+            return None
+        if score not in (0, 1):
+            return None
+        return {
+            "passes": score == 1,
+            "score": score,
+            "reasoning": verdict.get("reasoning", "")
+        }
+    
+    async def _run_cross_question_check(self,
+                                        check_name: str,
+                                        questions: List[Dict[str, Any]],
+                                        passage: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """
+        Run one quality check on several questions in a single Claude call.
+        
+        Args:
+            check_name: Name of the quality check to run
+            questions: The questions to validate, all on the same passage
+            passage: The passage used for the questions
+            
+        Returns:
+            Dictionary mapping question index to quality check result, for every
+            question the response has a well-formed verdict for
+        """
+        prompt_template = self.qc_prompts.get(check_name)
+        if not prompt_template:
+            return {}
+        
+        question_ids = [f"q{i}" for i in range(1, len(questions) + 1)]
+        prompt = self._format_cross_question_prompt(prompt_template, questions, passage)
+        response = await self._call_claude_with_retry(prompt, passage)
+        answers = self._parse_keyed_answer(response, question_ids)
+        
+        verdicts = {}
+        for index, question_id in enumerate(question_ids):
+            verdict = self._parse_score_verdict(answers.get(question_id))
+            if verdict is not None:
+                verdicts[index] = verdict
+        
+        if len(verdicts) < len(questions):
+            logger.warning(f"Batched {check_name} check returned {len(verdicts)}/{len(questions)} verdicts")
+        return verdicts
+    
+    async def _check_plausibility_across_questions(self,
+                                                   questions: List[Dict[str, Any]],
+                                                   passage: Dict[str, Any]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """
+        Judge the distractors of several questions in a single Claude call.
+        
+        Args:
+            questions: The questions to check, all on the same passage
+            passage: The passage used for the questions
+            
+        Returns:
+            Dictionary mapping question index to {distractor ID: distractor result}, for
+            every distractor the response has a well-formed verdict for
+        """
+        prompt_template = self.qc_prompts.get("plausibility")
+        if not prompt_template:
+            return {}
+        
+        distractor_ids = ["distractor1", "distractor2", "distractor3"]
+        question_ids = [f"q{i}" for i in range(1, len(questions) + 1)]
+        prompt = self._format_cross_question_prompt(prompt_template, questions, passage, distractor_ids)
+        response = await self._call_claude_with_retry(prompt, passage)
+        answers = self._parse_keyed_answer(response, question_ids)
+        
+        results = {}
+        for index, (question_id, question) in enumerate(zip(question_ids, questions)):
+            answer = answers.get(question_id)
+            if not isinstance(answer, dict):
+                continue
+            distractor_results = {}
+            for distractor_id in distractor_ids:
+                verdict = self._parse_score_verdict(answer.get(distractor_id))
+                if verdict is not None and question.get(distractor_id, ""):
+                    distractor_results[distractor_id] = {
+                        "id": distractor_id,
+                        "is_plausible": verdict["passes"],
+                        "reasoning": verdict["reasoning"]
+                    }
+            if distractor_results:
+                results[index] = distractor_results
+        
+        if len(results) < len(questions):
+            logger.warning(f"Batched plausibility check returned verdicts for {len(results)}/{len(questions)} questions")
+        return results
+    
+    def _format_cross_question_prompt(self,
+                                      prompt_template: str,
+                                      questions: List[Dict[str, Any]],
+                                      passage: Dict[str, Any],
+                                      distractor_ids: Optional[List[str]] = None) -> str:
+        """
+        Format a QC prompt so that it judges several questions on the same passage at once.
+        The rubric from the template is kept as-is; the per-question fields move to a list
+        of questions and the output format asks for one verdict per question.
+        
+        Args:
+            prompt_template: The prompt template
+            questions: The questions to validate
+            passage: The passage the questions are based on
+            distractor_ids: For the plausibility check, the distractors to judge per question
+            
+        Returns:
+            Formatted prompt for the cross-question check
+        """
+        placeholder_question = {field: PER_QUESTION_REFERENCE for field in QUESTION_FIELDS}
+        formatted_prompt = self._format_quality_check_prompt(
+            prompt_template, placeholder_question, passage, PER_QUESTION_REFERENCE
+        )
+        formatted_prompt = formatted_prompt.replace("{json.dumps(input_json, indent=2)}", PER_QUESTION_REFERENCE)
+        formatted_prompt = formatted_prompt.replace("{distractor_to_check}", PER_QUESTION_REFERENCE)
+        
+        question_ids = [f"q{i}" for i in range(1, len(questions) + 1)]
+        questions_json = {}
+        for question_id, question in zip(question_ids, questions):
+            entry = {field: question.get(field, "") for field in QUESTION_FIELDS}
+            entry["standard_id"] = question.get("standard", "")
+            questions_json[question_id] = entry
+        
+        if distractor_ids:
+            verdict_format = {d_id: {"score": "[1 or 0]", "reasoning": "[1-2 sentences]"} for d_id in distractor_ids}
+            scope = "Judge each distractor of every question on its own."
+        else:
+            verdict_format = {"score": "[1 or 0]", "reasoning": "[1-2 sentences]"}
+            scope = "A verdict on one question must not influence another."
+        example_answer = json.dumps({question_id: verdict_format for question_id in question_ids}, indent=2)
+        
+        formatted_prompt += f"""
+
+CROSS-QUESTION EVALUATION:
+Apply the evaluation process and decision rule above to EACH of the {len(questions)} questions below independently. {scope}
+
+QUESTIONS TO EVALUATE:
+{json.dumps(questions_json, indent=2)}
+
+Instead of the single-question output format above, respond with ONE answer block containing a verdict for every question, keyed by its ID:
+
+<answer>
+{example_answer}
+</answer>
+"""
+        return formatted_prompt
+
+
+class ValidationBatcher:
+    """
+    Collects the validations that concurrent question slots request for the same
+    passage and runs them together through validate_questions_batch.
+    A batch is sent once QC_BATCH_SIZE questions are waiting, or QC_BATCH_WINDOW
+    seconds after its first question arrived. Each slot's budget is charged an
+    equal share of the batch's calls and tokens, and a batch whose slots have all
+    stopped waiting is cancelled.
+    """
+    
+    def __init__(self,
+                 quality_control: QuestionQualityControl,
+                 window: float = config.QC_BATCH_WINDOW,
+                 max_size: int = config.QC_BATCH_SIZE):
+        """
+        Initialize the batcher.
+        
+        Args:
+            quality_control: The quality control system that validates the batches
+            window: Seconds to wait for more questions after the first one arrives
+            max_size: Most questions validated in one batch
+        """
+        self.quality_control = quality_control
+        self.window = window
+        self.max_size = max(1, max_size)
+        # Passage key -> [(question, passage, standard ID, previous questions, task ID, budget, future)]
+        self._pending: Dict[str, List[Tuple[Any, ...]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        # Batches being validated, kept referenced until they finish
+        self._running: set = set()
+    
+    async def validate(self,
+                       question: Dict[str, Any],
+                       passage: Dict[str, Any],
+                       standard_id: str,
+                       previous_questions: Optional[List[Dict[str, Any]]] = None,
+                       task_id: str = "") -> Dict[str, Any]:
+        """
+        Validate a question as part of the next batch for its passage.
+        
+        Args:
+            question: The question to validate
+            passage: The passage used for the question
+            standard_id: The standard ID for the question
+            previous_questions: Previously generated questions
+            task_id: Identifier for this task (for logging)
+            
+        Returns:
+            Validation result dictionary, as validate_question returns it
+            
+        Raises:
+            BudgetExhausted: If the slot's budget does not allow another call
+        """
+        # Fail like a direct validation would rather than join a batch the slot cannot pay for
+        budget = current_budget.get()
+        if budget is not None:
+            reason = budget.exhausted_reason()
+            if reason:
+                raise BudgetExhausted(reason)
+        
+        loop = asyncio.get_running_loop()
+        key = str(passage.get("id") or passage.get("title", ""))
+        future = loop.create_future()
+        
+        batch = self._pending.setdefault(key, [])
+        batch.append((question, passage, standard_id, previous_questions or [], task_id, budget, future))
+        if len(batch) >= self.max_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        
+        return await future
+    
+    def _flush(self, key: str) -> None:
+        """
+        Send the pending batch of a passage.
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = [item for item in self._pending.pop(key, []) if not item[-1].done()]
+        if not batch:
+            return
+        
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        
+        futures = [item[-1] for item in batch]
+        
+        def cancel_if_abandoned(_: asyncio.Future) -> None:
+            # Waiters are cancelled when their slot is (deadline, speculative loser)
+            if not task.done() and all(future.cancelled() for future in futures):
+                task.cancel()
+        
+        for future in futures:
+            future.add_done_callback(cancel_if_abandoned)
+    
+    async def _run(self, batch: List[Tuple[Any, ...]]) -> None:
+        """
+        Validate one batch and hand each result to the slot that asked for it.
+        """
+        # Record the shared calls on a budget of their own, then split them between the slots
+        spent = CallBudget()
+        current_budget.set(spent)
+        
+        questions, passages, standard_ids, previous_questions, task_ids, budgets, futures = zip(*batch)
+        try:
+            results = await self.quality_control.validate_questions_batch(
+                list(questions), passages[0], list(standard_ids), list(previous_questions), list(task_ids)
+            )
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            for index, budget in enumerate(budgets):
+                if budget is not None:
+                    budget.charge_share(spent, index, len(budgets))
+        
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
 
 # Usage example
 async def test_quality_control():
@@ -1215,8 +2427,9 @@ async def test_quality_control():
     
     # Try to improve the question if needed
     if not validation_result["is_valid"] or validation_result["warnings"] or validation_result["improvement_suggestions"]:
-        improved_question = await qc.improve_question(question, validation_result, passage, "RHS-1.A")
+        improved_question, improved_validation = await qc.improve_question(question, validation_result, passage, "RHS-1.A")
         print("Improved question:", improved_question)
+        print("Improved question validation:", improved_validation)
 
 if __name__ == "__main__":
     asyncio.run(test_quality_control())
@@ -0,0 +1,284 @@
+"""
+Persistent bank of validated questions for the Quiz Generator system.
+Every question that passes quality control can be stored together with its
+QC verdicts and explanation, indexed by (passage id, standard, difficulty,
+example type), so later quizzes can be served from inventory.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Bank modes
+MODE_OFF = "off"
+MODE_STORE = "store"
+MODE_SERVE = "serve"
+BANK_MODES = (MODE_OFF, MODE_STORE, MODE_SERVE)
+
+# Question fields kept in the bank
+QUESTION_FIELDS = ("question", "correct_answer", "distractor1", "distractor2", "distractor3", "standard", "difficulty")
+
+
+class QuestionBank:
+    """
+    SQLite-backed store of validated questions.
+    
+    In store mode every validated question is saved; in serve mode questions are
+    also handed out to fill quiz slots before anything is generated; in off mode
+    the bank is not used.
+    """
+    
+    def __init__(self, path: str, mode: str = MODE_OFF):
+        """
+        Initialize the bank. The database is only opened on first use.
+        
+        Args:
+            path: Path of the SQLite database file
+            mode: One of off, store or serve
+        """
+        if mode not in BANK_MODES:
+            logger.warning(f"Unknown question bank mode '{mode}', bank disabled")
+            mode = MODE_OFF
+        self.path = path
+        self.mode = mode
+        self._conn = None
+    
+    @property
+    def storing(self) -> bool:
+        """Whether validated questions are saved to the bank."""
+        return self.mode in (MODE_STORE, MODE_SERVE)
+    
+    @property
+    def serving(self) -> bool:
+        """Whether quiz slots are filled from the bank."""
+        return self.mode == MODE_SERVE
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database and create the schema if needed.
+        """
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "passage_id TEXT NOT NULL, standard TEXT NOT NULL, difficulty TEXT NOT NULL, "
+                "example_type TEXT NOT NULL, fingerprint TEXT NOT NULL UNIQUE, "
+                "question TEXT NOT NULL, quality_checks TEXT, explanation TEXT, "
+                "created_at REAL NOT NULL, served_count INTEGER NOT NULL DEFAULT 0, last_served_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_questions_slot "
+                "ON questions (passage_id, standard, difficulty, example_type)"
+            )
+            self._conn.commit()
+            logger.info(f"Opened question bank at {self.path} (mode: {self.mode})")
+        return self._conn
+    
+    @staticmethod
+    def fingerprint(question: Dict[str, Any]) -> str:
+        """
+        Identify a question by its normalized stem and options.
+        
+        Args:
+            question: The question dictionary
+            
+        Returns:
+            Hex SHA-256 digest
+        """
+        parts = [" ".join(str(question.get(field, "")).lower().split()) for field in QUESTION_FIELDS[:5]]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    
+    def store(self,
+              passage_id: str,
+              standard: str,
+              difficulty: str,
+              example_type: str,
+              question: Dict[str, Any],
+              quality_checks: Optional[Dict[str, Any]] = None) -> Tuple[Optional[int], bool]:
+        """
+        Save a validated question. A question that is already in the bank is not duplicated.
+        
+        Args:
+            passage_id: ID of the passage the question is about
+            standard: The standard the question targets
+            difficulty: The difficulty value ("1", "2" or "3")
+            example_type: "reading" or "writing"
+            question: The validated question
+            quality_checks: The QC verdicts it passed
+            
+        Returns:
+            The bank ID of the question (None if the bank is not storing or the write
+            failed) and whether a new row was inserted, False for a duplicate
+        """
+        if not self.storing:
+            return None, False
+        
+        fingerprint = self.fingerprint(question)
+        record = {field: question[field] for field in QUESTION_FIELDS if field in question}
+        try:
+            conn = self._connect()
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO questions "
+                "(passage_id, standard, difficulty, example_type, fingerprint, question, quality_checks, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(passage_id), standard, str(difficulty), example_type, fingerprint,
+                 json.dumps(record), json.dumps(quality_checks) if quality_checks is not None else None, time.time())
+            )
+            inserted = cursor.rowcount == 1
+            conn.commit()
+            row = conn.execute("SELECT id FROM questions WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            return (row[0] if row else None), inserted
+        except Exception as e:
+            logger.warning(f"Question bank store failed: {str(e)}")
+            return None, False
+    
+    def attach_explanation(self, bank_id: int, explanation: str) -> None:
+        """
+        Save the explanation of a banked question.
+        
+        Args:
+            bank_id: The bank ID returned by store
+            explanation: The generated explanation
+        """
+        if not self.storing:
+            return
+        try:
+            conn = self._connect()
+            conn.execute("UPDATE questions SET explanation = ? WHERE id = ?", (explanation, bank_id))
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Question bank explanation update failed: {str(e)}")
+    
+    def take(self,
+             passage_id: str,
+             standard: str,
+             difficulty: str,
+             example_type: str,
+             count: int,
+             exclude_ids: Iterable[int] = ()) -> List[Dict[str, Any]]:
+        """
+        Hand out banked questions for a slot key, least served first.
+        
+        Args:
+            passage_id: ID of the passage
+            standard: The standard
+            difficulty: The difficulty value
+            example_type: "reading" or "writing"
+            count: Maximum number of questions to return
+            exclude_ids: Bank IDs already used in the current quiz
+            
+        Returns:
+            Question dictionaries with the hidden keys "_bank_id" and, if one is
+            stored, "_explanation"
+        """
+        if not self.serving or count <= 0:
+            return []
+        
+        exclude_ids = list(exclude_ids)
+        try:
+            conn = self._connect()
+            query = (
+                "SELECT id, question, explanation FROM questions "
+                "WHERE passage_id = ? AND standard = ? AND difficulty = ? AND example_type = ?"
+            )
+            params = [str(passage_id), standard, str(difficulty), example_type]
+            if exclude_ids:
+                query += f" AND id NOT IN ({', '.join('?' for _ in exclude_ids)})"
+                params += exclude_ids
+            query += " ORDER BY served_count ASC, RANDOM() LIMIT ?"
+            params.append(count)
+            rows = conn.execute(query, params).fetchall()
+            
+            now = time.time()
+            conn.executemany(
+                "UPDATE questions SET served_count = served_count + 1, last_served_at = ? WHERE id = ?",
+                [(now, row[0]) for row in rows]
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Question bank lookup failed: {str(e)}")
+            return []
+        
+        questions = []
+        for bank_id, question_json, explanation in rows:
+            question = json.loads(question_json)
+            question["_bank_id"] = bank_id
+            if explanation:
+                question["_explanation"] = explanation
+            questions.append(question)
+        return questions
+    
+    def questions(self, passage_id: str, standard: str, difficulty: str, example_type: str) -> List[Dict[str, Any]]:
+        """
+        List the banked questions for a slot key without counting them as served.
+        
+        Args:
+            passage_id: ID of the passage
+            standard: The standard
+            difficulty: The difficulty value
+            example_type: "reading" or "writing"
+            
+        Returns:
+            Question dictionaries with the hidden key "_bank_id"
+        """
+        try:
+            rows = self._connect().execute(
+                "SELECT id, question FROM questions "
+                "WHERE passage_id = ? AND standard = ? AND difficulty = ? AND example_type = ? ORDER BY id",
+                (str(passage_id), standard, str(difficulty), example_type)
+            ).fetchall()
+        except Exception as e:
+            logger.warning(f"Question bank lookup failed: {str(e)}")
+            return []
+        
+        questions = []
+        for bank_id, question_json in rows:
+            question = json.loads(question_json)
+            question["_bank_id"] = bank_id
+            questions.append(question)
+        return questions
+    
+    def count(self, passage_id: str, standard: str, difficulty: str, example_type: str) -> int:
+        """
+        Count the banked questions for a slot key.
+        
+        Args:
+            passage_id: ID of the passage
+            standard: The standard
+            difficulty: The difficulty value
+            example_type: "reading" or "writing"
+            
+        Returns:
+            Number of stored questions
+        """
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM questions "
+            "WHERE passage_id = ? AND standard = ? AND difficulty = ? AND example_type = ?",
+            (str(passage_id), standard, str(difficulty), example_type)
+        ).fetchone()
+        return row[0]
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Shared bank for the whole process
+question_bank = QuestionBank(path=config.QUESTION_BANK_PATH, mode=config.QUESTION_BANK_MODE)
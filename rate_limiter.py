@@ -0,0 +1,324 @@
+"""
+Proactive rate limiting for Claude API calls.
+Tracks requests, input tokens and output tokens per minute with token buckets
+that are kept in sync with Anthropic's rate-limit response headers, so calls
+are paced before they would be rejected instead of after a 429.
+"""
+
+import asyncio
+import datetime
+import json
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+
+class TokenBucket:
+    """
+    A per-minute token bucket whose capacity and level can be corrected from
+    the server's view of the same limit.
+    """
+    
+    def __init__(self, name: str, limit_per_minute: float = 0):
+        """
+        Initialize the bucket.
+        
+        Args:
+            name: Name used in log messages
+            limit_per_minute: Capacity per minute (0 means unknown until learned from headers)
+        """
+        self.name = name
+        self.limit = float(limit_per_minute)
+        self.level = self.limit
+        self.updated = time.monotonic()
+    
+    @property
+    def known(self) -> bool:
+        """Whether the bucket has a limit to enforce."""
+        return self.limit > 0
+    
+    def _refill(self) -> None:
+        """
+        Refill the bucket for the time elapsed since the last update.
+        """
+        now = time.monotonic()
+        if self.known:
+            self.level = min(self.limit, self.level + (now - self.updated) * self.limit / 60.0)
+        self.updated = now
+    
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until the bucket holds at least `amount` (capped at its capacity).
+        
+        Args:
+            amount: Amount needed
+            
+        Returns:
+            Seconds to wait, 0 if the amount is available now
+        """
+        if not self.known:
+            return 0.0
+        self._refill()
+        needed = min(amount, self.limit) - self.level
+        if needed <= 0:
+            return 0.0
+        return needed * 60.0 / self.limit
+    
+    def consume(self, amount: float) -> None:
+        """
+        Take `amount` out of the bucket. The level may go negative when actual
+        usage turns out higher than the estimate that was admitted.
+        
+        Args:
+            amount: Amount to consume
+        """
+        if not self.known:
+            return
+        self._refill()
+        self.level -= amount
+    
+    def refund(self, amount: float) -> None:
+        """
+        Put back an amount that was consumed but not used, up to the bucket's capacity.
+        
+        Args:
+            amount: Amount to return
+        """
+        if not self.known:
+            return
+        self._refill()
+        self.level = min(self.limit, self.level + amount)
+    
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """
+        Correct the bucket from rate-limit headers.
+        
+        Args:
+            limit: Limit reported by the server
+            remaining: Remaining amount reported by the server
+        """
+        if limit:
+            if not self.known:
+                logger.info(f"Rate limiter learned {self.name} limit: {limit:.0f}/min")
+                self.level = limit
+            self.limit = float(limit)
+        self._refill()
+        if remaining is not None and self.known:
+            # Only ever lower the level: calls admitted after the server's
+            # snapshot are already deducted locally but not in `remaining`
+            self.level = min(self.level, float(remaining))
+
+
+class RateLimiter:
+    """
+    Shared limiter for all Claude calls: requests per minute plus input and
+    output tokens per minute. Configured limits are used as a starting point
+    and replaced by whatever the anthropic-ratelimit-* headers report.
+    """
+    
+    def __init__(self,
+                 requests_per_minute: float = 0,
+                 input_tokens_per_minute: float = 0,
+                 output_tokens_per_minute: float = 0,
+                 enabled: bool = True):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            requests_per_minute: Initial RPM limit (0 means learn from headers)
+            input_tokens_per_minute: Initial input TPM limit (0 means learn from headers)
+            output_tokens_per_minute: Initial output TPM limit (0 means learn from headers)
+            enabled: Whether to pace calls at all
+        """
+        self.enabled = enabled
+        self.buckets = {
+            "requests": TokenBucket("requests", requests_per_minute),
+            "input-tokens": TokenBucket("input-tokens", input_tokens_per_minute),
+            "output-tokens": TokenBucket("output-tokens", output_tokens_per_minute)
+        }
+        self.blocked_until = 0.0
+        # The lock is created lazily per event loop so waiters are admitted in order
+        self._loop = None
+        self._lock = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """
+        Return the admission lock for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    async def acquire(self, estimated_input_tokens: int) -> None:
+        """
+        Wait until a request with the given input size fits within every limit,
+        then reserve it.
+        
+        Args:
+            estimated_input_tokens: Estimated input tokens of the request
+        """
+        if not self.enabled:
+            return
+        
+        async with self._get_lock():
+            while True:
+                wait = max(
+                    self.blocked_until - time.monotonic(),
+                    self.buckets["requests"].wait_time(1),
+                    self.buckets["input-tokens"].wait_time(estimated_input_tokens),
+                    # Output size is unknown up front; only wait while the bucket is overdrawn
+                    self.buckets["output-tokens"].wait_time(0)
+                )
+                if wait <= 0:
+                    break
+                logger.info(f"Rate limiter delaying Claude call by {wait:.2f}s")
+                await asyncio.sleep(wait)
+            
+            self.buckets["requests"].consume(1)
+            self.buckets["input-tokens"].consume(estimated_input_tokens)
+    
+    def record_response(self,
+                        headers: Mapping[str, str],
+                        estimated_input_tokens: int,
+                        usage: Any = None) -> None:
+        """
+        Reconcile the buckets after a successful call.
+        
+        Args:
+            headers: Response headers
+            estimated_input_tokens: The estimate that was reserved in acquire()
+            usage: The response's usage object (input_tokens, output_tokens)
+        """
+        if not self.enabled:
+            return
+        
+        if usage is not None:
+            actual_input = (getattr(usage, "input_tokens", 0) or 0) + \
+                (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+            self.buckets["input-tokens"].consume(actual_input - estimated_input_tokens)
+            self.buckets["output-tokens"].consume(getattr(usage, "output_tokens", 0) or 0)
+        
+        self._sync_from_headers(headers)
+    
+    def release(self, estimated_input_tokens: int, request_sent: bool = True) -> None:
+        """
+        Give back the reservation of a call that failed, was rejected or was cancelled.
+        It used none of its estimated input tokens; if it was never sent, it did not
+        use its request either.
+        
+        Args:
+            estimated_input_tokens: The estimate that was reserved in acquire()
+            request_sent: Whether the request reached the API
+        """
+        if not self.enabled:
+            return
+        
+        self.buckets["input-tokens"].refund(estimated_input_tokens)
+        if not request_sent:
+            self.buckets["requests"].refund(1)
+    
+    def record_rate_limited(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Pause all calls after a 429, honouring retry-after when present.
+        
+        Args:
+            headers: Headers of the rate-limited response
+        """
+        if not self.enabled or headers is None:
+            return
+        
+        retry_after = _parse_float(headers.get("retry-after"))
+        if retry_after is None:
+            retry_after = 60.0 / max(1.0, self.buckets["requests"].limit or 1.0)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"Rate limited by API; pausing Claude calls for {retry_after:.2f}s")
+        
+        self._sync_from_headers(headers)
+    
+    def _sync_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Update limits and remaining amounts from anthropic-ratelimit-* headers.
+        
+        Args:
+            headers: Response headers
+        """
+        now = time.monotonic()
+        for name, bucket in self.buckets.items():
+            limit = _parse_float(headers.get(f"anthropic-ratelimit-{name}-limit"))
+            remaining = _parse_float(headers.get(f"anthropic-ratelimit-{name}-remaining"))
+            bucket.sync(limit, remaining)
+            
+            # When a limit is exhausted, nothing frees up before its reset time
+            if remaining is not None and remaining <= 0:
+                reset_in = _seconds_until(headers.get(f"anthropic-ratelimit-{name}-reset"))
+                if reset_in:
+                    self.blocked_until = max(self.blocked_until, now + reset_in)
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a numeric header value.
+    
+    Args:
+        value: Header value or None
+        
+    Returns:
+        The value as a float, or None if missing or malformed
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds_until(timestamp: Optional[str]) -> Optional[float]:
+    """
+    Seconds from now until an RFC 3339 timestamp.
+    
+    Args:
+        timestamp: Timestamp such as 2024-01-01T00:00:30Z
+        
+    Returns:
+        Seconds until the timestamp (never negative), or None if it cannot be parsed
+    """
+    if not timestamp:
+        return None
+    try:
+        reset_at = datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (reset_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def estimate_input_tokens(request: Dict[str, Any]) -> int:
+    """
+    Roughly estimate the input tokens of a Messages API request (~4 characters per token).
+    
+    Args:
+        request: Keyword arguments for messages.create
+        
+    Returns:
+        Estimated number of input tokens
+    """
+    text = json.dumps(request.get("system", "")) + json.dumps(request.get("messages", []))
+    return max(1, len(text) // 4)
+
+
+# Shared limiter for the whole process
+rate_limiter = RateLimiter(
+    requests_per_minute=config.RATE_LIMIT_RPM,
+    input_tokens_per_minute=config.RATE_LIMIT_INPUT_TPM,
+    output_tokens_per_minute=config.RATE_LIMIT_OUTPUT_TPM,
+    enabled=config.RATE_LIMIT_ENABLED
+)
@@ -0,0 +1,215 @@
+"""
+Content-addressed on-disk cache for Claude responses.
+Responses are keyed by a hash of everything that determines them (model,
+system blocks, messages, max_tokens and temperature) and stored in a local
+SQLite database with a TTL and size-based LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+import anthropic
+
+# Import centralized logging configuration
+from logging_config import logger
+
+# Import centralized configuration
+from config import config
+
+# Cache modes
+MODE_OFF = "off"
+MODE_READ_WRITE = "read-write"
+MODE_READ_ONLY = "read-only"
+CACHE_MODES = (MODE_OFF, MODE_READ_WRITE, MODE_READ_ONLY)
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of Messages API responses.
+    
+    In read-write mode hits are served and new responses are stored; in
+    read-only mode hits are served but nothing is written; in off mode the
+    cache is bypassed entirely.
+    """
+    
+    def __init__(self, path: str, mode: str = MODE_OFF, max_bytes: int = 0, ttl: float = 0):
+        """
+        Initialize the cache. The database is only opened on first use.
+        
+        Args:
+            path: Path of the SQLite database file
+            mode: One of off, read-write or read-only
+            max_bytes: Maximum total size of stored responses (0 means unbounded)
+            ttl: Seconds a response stays valid (0 means forever)
+        """
+        if mode not in CACHE_MODES:
+            logger.warning(f"Unknown LLM cache mode '{mode}', cache disabled")
+            mode = MODE_OFF
+        self.path = path
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is consulted at all."""
+        return self.mode != MODE_OFF
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database and create the schema if needed.
+        """
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+            logger.info(f"Opened LLM response cache at {self.path} (mode: {self.mode})")
+        return self._conn
+    
+    @staticmethod
+    def make_key(request: Dict[str, Any], salt: Optional[str] = None) -> str:
+        """
+        Compute the cache key of a Messages API request.
+        
+        Args:
+            request: Keyword arguments for messages.create
+            salt: Optional value that tells apart samples of the same request,
+                  such as the generation attempt
+            
+        Returns:
+            Hex SHA-256 digest of the fields that determine the response
+        """
+        keyed = {
+            "model": request.get("model"),
+            "system": request.get("system"),
+            "messages": request.get("messages"),
+            "max_tokens": request.get("max_tokens"),
+            "temperature": request.get("temperature")
+        }
+        if salt is not None:
+            keyed["salt"] = salt
+        canonical = json.dumps(keyed, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, request: Dict[str, Any], salt: Optional[str] = None) -> Optional[anthropic.types.Message]:
+        """
+        Look up a cached response.
+        
+        Args:
+            request: Keyword arguments for messages.create
+            salt: Optional sample discriminator, see make_key
+            
+        Returns:
+            The cached Message, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        key = self.make_key(request, salt)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            now = time.time()
+            if row is None or (self.ttl and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            
+            if self.mode == MODE_READ_WRITE:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            
+            self.hits += 1
+            logger.info(f"LLM cache hit ({key[:12]})")
+            return anthropic.types.Message.model_validate_json(row[0])
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            return None
+    
+    def put(self, request: Dict[str, Any], message: anthropic.types.Message, salt: Optional[str] = None) -> None:
+        """
+        Store a response (read-write mode only) and evict least recently used
+        entries if the cache is over its size limit.
+        
+        Args:
+            request: Keyword arguments for messages.create
+            message: The Message returned by the API
+            salt: Optional sample discriminator, see make_key
+        """
+        if self.mode != MODE_READ_WRITE:
+            return
+        
+        key = self.make_key(request, salt)
+        try:
+            response = message.model_dump_json()
+            now = time.time()
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, len(response), now, now)
+            )
+            if self.ttl:
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self._evict(conn)
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {str(e)}")
+    
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Delete least recently used entries until the total size fits max_bytes.
+        
+        Args:
+            conn: Open database connection
+        """
+        if not self.max_bytes:
+            return
+        
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} entries from LLM response cache")
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Shared cache for the whole process
+response_cache = ResponseCache(
+    path=config.LLM_CACHE_PATH,
+    mode=config.LLM_CACHE_MODE,
+    max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024,
+    ttl=config.LLM_CACHE_TTL
+)
@@ -0,0 +1,120 @@
+"""
+Shared fixtures for the test suite.
+The tests never reach the network: Claude calls go to a fake client that
+replays canned responses.
+"""
+
+import os
+import sys
+import tempfile
+
+# Settings are read when config is imported, so point them at the repository first
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("DATA_DIR", REPO_ROOT)
+os.environ.setdefault("ANTHROPIC_API_KEY", "sk-test-key-for-unit-tests")
+os.environ["LLM_CACHE_MODE"] = "off"
+os.environ["QUESTION_BANK_MODE"] = "off"
+os.environ["LOG_FILE"] = os.path.join(tempfile.mkdtemp(prefix="quiz-tests-"), "quiz_generator.log")
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+import anthropic
+import pytest
+
+import claude_client
+
+
+def make_message(text: str, input_tokens: int = 100, output_tokens: int = 20) -> anthropic.types.Message:
+    """
+    Build a Messages API response holding one text block.
+    
+    Args:
+        text: The response text
+        input_tokens: Input tokens reported in usage
+        output_tokens: Output tokens reported in usage
+    
+    Returns:
+        The Message
+    """
+    return anthropic.types.Message(
+        id="msg_test",
+        type="message",
+        role="assistant",
+        model="claude-test",
+        content=[{"type": "text", "text": text}],
+        stop_reason="end_turn",
+        stop_sequence=None,
+        usage={"input_tokens": input_tokens, "output_tokens": output_tokens}
+    )
+
+
+class FakeRawResponse:
+    """Stands in for the SDK's raw response wrapper."""
+    
+    def __init__(self, message: anthropic.types.Message):
+        self.message = message
+        self.headers: Dict[str, str] = {}
+    
+    async def parse(self) -> anthropic.types.Message:
+        return self.message
+
+
+def prompt_text(request: Dict[str, Any]) -> str:
+    """
+    The text of the last content block of a request's first message.
+    
+    Args:
+        request: Keyword arguments for messages.create
+    
+    Returns:
+        The prompt text
+    """
+    content = request["messages"][0]["content"]
+    return content[-1]["text"] if isinstance(content, list) else content
+
+
+class FakeClient:
+    """
+    Answers requests with canned response texts, in order, or from a responder
+    function, and records every request and how many were in flight at once.
+    """
+    
+    def __init__(self):
+        self.replies: List[str] = []
+        self.responder: Optional[Callable[[Dict[str, Any]], str]] = None
+        self.delay = 0.0
+        self.requests: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.messages = self
+        self.with_raw_response = self
+    
+    async def create(self, **request: Any) -> FakeRawResponse:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            text = self.responder(request) if self.responder else self.replies.pop(0)
+        finally:
+            self.in_flight -= 1
+        return FakeRawResponse(make_message(text))
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """A QuizGenerator with its quality control loaded but no data files."""
+    import main
+    monkeypatch.setattr(main.QuizGenerator, "load_data", lambda self: None)
+    return main.QuizGenerator()
+
+
+@pytest.fixture
+def fake_client(monkeypatch) -> FakeClient:
+    """Route create_message to a FakeClient."""
+    client = FakeClient()
+    monkeypatch.setattr(claude_client, "get_client", lambda api_key=None: client)
+    return client
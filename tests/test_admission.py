@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+import main
+from claude_client import STAGE_EXPLANATION, STAGE_GENERATION, STAGE_QC, AdmissionController
+
+
+async def peak_concurrency(controller: AdmissionController, stages: list) -> dict:
+    """Run one short call per entry of stages and report the peak in flight, overall and per stage."""
+    in_flight = {"all": 0}
+    peak = {"all": 0}
+    
+    async def call(stage):
+        async with controller.admit(stage):
+            in_flight["all"] += 1
+            in_flight[stage] = in_flight.get(stage, 0) + 1
+            peak["all"] = max(peak["all"], in_flight["all"])
+            peak[stage] = max(peak.get(stage, 0), in_flight[stage])
+            await asyncio.sleep(0.01)
+            in_flight["all"] -= 1
+            in_flight[stage] -= 1
+    
+    await asyncio.gather(*(call(stage) for stage in stages))
+    return peak
+
+
+def test_global_pool_caps_calls_across_stages():
+    controller = AdmissionController(3, {STAGE_GENERATION: 0, STAGE_QC: 0, STAGE_EXPLANATION: 0})
+    
+    peak = asyncio.run(peak_concurrency(controller, [STAGE_GENERATION, STAGE_QC, STAGE_EXPLANATION] * 4))
+    
+    assert peak["all"] == 3
+
+
+def test_stage_pools_cap_their_own_stage():
+    controller = AdmissionController(10, {STAGE_GENERATION: 1, STAGE_QC: 4, STAGE_EXPLANATION: 0})
+    
+    peak = asyncio.run(peak_concurrency(controller, [STAGE_GENERATION] * 5 + [STAGE_QC] * 8))
+    
+    assert peak[STAGE_GENERATION] == 1
+    assert peak[STAGE_QC] == 4
+
+
+def test_unknown_stage_is_rejected():
+    controller = AdmissionController(2, {STAGE_QC: 0})
+    
+    async def run():
+        async with controller.admit("summaries"):
+            pass
+    
+    with pytest.raises(ValueError, match="Unknown call stage"):
+        asyncio.run(run())
+
+
+def test_controller_works_across_event_loops():
+    controller = AdmissionController(2, {STAGE_QC: 0})
+    
+    assert asyncio.run(peak_concurrency(controller, [STAGE_QC] * 4))["all"] == 2
+    assert asyncio.run(peak_concurrency(controller, [STAGE_QC] * 4))["all"] == 2
+
+
+def test_batch_timeout_sets_the_quiz_deadline(generator, monkeypatch):
+    async def deadline():
+        return generator._quiz_deadline(), asyncio.get_running_loop().time()
+    
+    monkeypatch.setattr(main, "BATCH_TIMEOUT", 0)
+    assert asyncio.run(deadline())[0] is None
+    
+    monkeypatch.setattr(main, "BATCH_TIMEOUT", 30)
+    quiz_deadline, now = asyncio.run(deadline())
+    assert 29 < quiz_deadline - now <= 30
+
+
+def test_slots_still_running_at_the_deadline_are_cancelled(generator, monkeypatch):
+    cancelled = []
+    
+    async def fake_generate_slot(passage, slot, previous_questions):
+        if slot["index"] == 0:
+            return {"question": "Quick question"}
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(slot["index"])
+            raise
+    
+    monkeypatch.setattr(generator, "_generate_slot", fake_generate_slot)
+    
+    async def run():
+        deadline = asyncio.get_running_loop().time() + 0.05
+        return await generator._generate_slots_concurrently(
+            {"title": "Passage"}, [{"index": index} for index in range(3)], deadline=deadline
+        )
+    
+    questions = asyncio.run(run())
+    
+    assert [question["question"] for question in questions] == ["Quick question"]
+    assert sorted(cancelled) == [1, 2]
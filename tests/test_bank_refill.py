@@ -0,0 +1,109 @@
+import asyncio
+import datetime
+
+import pytest
+
+import bank_refill
+from bank_refill import BankRefillWorker, parse_hour_window
+from question_bank import MODE_STORE, QuestionBank
+
+PASSAGE = {"id": "passage-1", "title": "Passage", "type": "Literary"}
+
+
+@pytest.fixture
+def bank(tmp_path, monkeypatch) -> QuestionBank:
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"), mode=MODE_STORE)
+    monkeypatch.setattr(bank_refill, "question_bank", bank)
+    yield bank
+    bank.close()
+
+
+def make_question(number: int) -> dict:
+    return {"question": f"Question {number}?", "correct_answer": f"Answer {number}"}
+
+
+@pytest.fixture
+def refill_generator(generator, monkeypatch):
+    """A generator with one passage and easy examples only, whose questions are numbered."""
+    generator.passages_by_standard = {"RHS-1.A": [PASSAGE]}
+    generator.examples_by_standard_and_difficulty = {("RHS-1.A", "1"): [{"question": "Example"}]}
+    generator.previous_seen = []
+    numbers = iter(range(1, 100))
+    
+    def build_slots(passage, distribution):
+        return [{"difficulty_value": "1", "example": {}, "example_type": "reading", "task_id": "slot"}]
+    
+    async def generate(passage, standard_id, difficulty_level, example_question, previous_questions, task_id):
+        generator.previous_seen.append([question["question"] for question in previous_questions])
+        return make_question(next(numbers))
+    
+    async def explain(question, passage):
+        return "<p>Explanation</p>"
+    
+    monkeypatch.setattr(generator, "_build_question_slots", build_slots)
+    monkeypatch.setattr(generator, "generate_question_for_standard_and_difficulty", generate)
+    monkeypatch.setattr(generator, "generate_explanation", explain)
+    return generator
+
+
+def test_parse_hour_window():
+    assert parse_hour_window("") is None
+    assert parse_hour_window("22-6") == (22, 6)
+    assert parse_hour_window("9-24") == (9, 0)
+    with pytest.raises(ValueError):
+        parse_hour_window("evening")
+
+
+def test_off_peak_window_wraps_past_midnight(bank, refill_generator):
+    worker = BankRefillWorker(refill_generator, off_peak_hours="22-6")
+    
+    assert worker.in_off_peak(datetime.datetime(2024, 1, 1, 23))
+    assert worker.in_off_peak(datetime.datetime(2024, 1, 1, 5))
+    assert not worker.in_off_peak(datetime.datetime(2024, 1, 1, 12))
+
+
+def test_plan_lists_keys_below_the_low_watermark(bank, refill_generator):
+    worker = BankRefillWorker(refill_generator, low_watermark=2, high_watermark=3)
+    
+    targets = worker.plan()
+    
+    # Medium and hard have no examples, so only the easy key is planned
+    assert [(target["difficulty_name"], target["count"], target["needed"]) for target in targets] == [("easy", 0, 3)]
+    
+    bank.store("passage-1", "RHS-1.A", "1", "reading", make_question(90))
+    bank.store("passage-1", "RHS-1.A", "1", "reading", make_question(91))
+    assert worker.plan() == []
+
+
+def test_refill_fills_a_key_to_the_high_watermark(bank, refill_generator):
+    worker = BankRefillWorker(refill_generator, low_watermark=2, high_watermark=3, max_per_hour=0)
+    
+    added = asyncio.run(worker.refill_once())
+    
+    assert added == 3
+    assert bank.count("passage-1", "RHS-1.A", "1", "reading") == 3
+
+
+def test_refill_does_not_bank_budget_fallbacks(bank, refill_generator, monkeypatch):
+    async def fallback(passage, standard_id, difficulty_level, example_question, previous_questions, task_id):
+        return dict(make_question(1), _budget_fallback=True)
+    
+    monkeypatch.setattr(refill_generator, "generate_question_for_standard_and_difficulty", fallback)
+    worker = BankRefillWorker(refill_generator, low_watermark=2, high_watermark=3, max_per_hour=0)
+    
+    assert asyncio.run(worker.refill_once()) == 0
+    assert bank.count("passage-1", "RHS-1.A", "1", "reading") == 0
+
+
+def test_refill_checks_only_the_most_recent_questions_for_repeats(bank, refill_generator):
+    for number in range(90, 95):
+        bank.store("passage-1", "RHS-1.A", "1", "reading", make_question(number))
+    worker = BankRefillWorker(refill_generator, low_watermark=6, high_watermark=7, max_per_hour=0,
+                              previous_limit=3)
+    
+    asyncio.run(worker.refill_once())
+    
+    assert refill_generator.previous_seen == [
+        ["Question 92?", "Question 93?", "Question 94?"],
+        ["Question 93?", "Question 94?", "Question 1?"]
+    ]
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import batch
+from batch import run_batch
+
+
+class FakeGenerator:
+    """Returns a quiz per job, with an error in the metadata for the standards listed in partial."""
+    
+    def __init__(self, partial=()):
+        self.standards_by_lesson = {"Lesson 1": ["RHS-1.A"]}
+        self.lessons_by_standard = {"RHS-1.A": ["Lesson 1"], "RHS-2.B": ["Lesson 2"]}
+        self.partial = set(partial)
+        self.calls = []
+    
+    async def generate_quiz(self, lesson_name, standard_id, difficulty, num_questions, journal=None):
+        self.calls.append((lesson_name or standard_id, journal))
+        metadata = {"num_questions_generated": num_questions}
+        if standard_id in self.partial:
+            metadata = {"num_questions_generated": 2, "error": "Quiz deadline reached"}
+        return {"questions": [], "metadata": metadata}
+
+
+def write_manifest(tmp_path, entries):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return {result["id"]: result for result in map(json.loads, f)}
+
+
+def run(generator, manifest, results, resume=False):
+    return asyncio.run(run_batch(
+        generator, manifest, results, save=lambda quiz, path: path, concurrency=2, resume=resume
+    ))
+
+
+def test_quizzes_with_errors_are_recorded_as_partial(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch.config, "CHECKPOINTS", False)
+    manifest = write_manifest(tmp_path, [
+        {"id": "a", "lesson": "Lesson 1"},
+        {"id": "b", "standard": "RHS-2.B"},
+        {"id": "c", "standard": "RHS-9.Z"},
+        {"id": "d", "lesson": "Lesson 1", "difficulty": 4}
+    ])
+    results_path = str(tmp_path / "results.jsonl")
+    
+    counts = run(FakeGenerator(partial=["RHS-2.B"]), manifest, results_path)
+    
+    assert counts == {"ok": 1, "partial": 1, "error": 2}
+    results = read_results(results_path)
+    assert results["a"]["status"] == "ok"
+    assert results["b"]["status"] == "partial"
+    assert results["b"]["warning"] == "Quiz deadline reached"
+    assert results["b"]["num_questions_generated"] == 2
+    assert "not found" in results["c"]["error"]
+    assert "Invalid difficulty" in results["d"]["error"]
+
+
+def test_resume_skips_ok_jobs_and_retries_partial_ones_from_their_journals(tmp_path, monkeypatch):
+    journals = []
+    
+    class RecordingJournal:
+        @classmethod
+        def for_job(cls, key, resume=False):
+            journals.append((key, resume))
+            return key
+    
+    monkeypatch.setattr(batch.config, "CHECKPOINTS", True)
+    monkeypatch.setattr(batch, "QuizJournal", RecordingJournal)
+    manifest = write_manifest(tmp_path, [
+        {"id": "a", "lesson": "Lesson 1"},
+        {"id": "b", "standard": "RHS-2.B"}
+    ])
+    results_path = str(tmp_path / "results.jsonl")
+    run(FakeGenerator(partial=["RHS-2.B"]), manifest, results_path)
+    
+    generator = FakeGenerator()
+    counts = run(generator, manifest, results_path, resume=True)
+    
+    assert counts == {"ok": 1, "partial": 0, "error": 0}
+    assert [name for name, _ in generator.calls] == ["RHS-2.B"]
+    # The retried job continues from the journal it wrote in the first run
+    first_run, resumed_run = journals[:2], journals[2:]
+    assert resumed_run == [(generator.calls[0][1], True)]
+    assert (generator.calls[0][1], False) in first_run
+    assert batch.completed_job_ids(results_path) == {"a", "b"}
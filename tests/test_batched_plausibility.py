@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import prompt_text
+from quality_control import QuestionQualityControl
+
+IDS = ["distractor1", "distractor2", "distractor3"]
+
+PASSAGE = {"id": "passage-1", "title": "The Harbor", "author": "A. Writer", "type": "Literary",
+           "text": "At dawn the boats returned with empty nets and tired crews."}
+
+QUESTION = {
+    "question": "What does the return of the boats suggest?",
+    "correct_answer": "The catch failed",
+    "distractor1": "The crews celebrated",
+    "distractor2": "The harbor closed",
+    "distractor3": "The boats stayed out"
+}
+
+
+@pytest.fixture
+def qc() -> QuestionQualityControl:
+    return QuestionQualityControl(api_key="sk-test-key-for-unit-tests")
+
+
+def answer(verdicts: dict) -> str:
+    return f"Reasoning first.\n<answer>\n{json.dumps(verdicts)}\n</answer>"
+
+
+def test_parses_a_verdict_per_distractor(qc):
+    response = answer({
+        "distractor1": {"score": 1, "reasoning": "tempting"},
+        "distractor2": {"score": "0", "reasoning": "obviously wrong"},
+        "distractor3": {"score": 1, "reasoning": "close reading needed"}
+    })
+    
+    verdicts = qc._parse_batched_plausibility_response(response, IDS)
+    
+    assert [verdicts[d_id]["is_plausible"] for d_id in IDS] == [True, False, True]
+    assert verdicts["distractor2"]["reasoning"] == "obviously wrong"
+
+
+def test_accepts_a_fenced_json_reply(qc):
+    response = "```json\n" + json.dumps({d_id: {"score": 1, "reasoning": "r"} for d_id in IDS}) + "\n```"
+    
+    assert set(qc._parse_batched_plausibility_response(response, IDS)) == set(IDS)
+
+
+@pytest.mark.parametrize("verdicts", [
+    {"distractor1": {"score": 1}, "distractor2": {"score": 1}},
+    {"distractor1": {"score": 1}, "distractor2": {"score": 2}, "distractor3": {"score": 1}},
+    {"distractor1": {"score": "yes"}, "distractor2": {"score": 1}, "distractor3": {"score": 1}},
+    ["not", "a", "mapping"]
+])
+def test_rejects_incomplete_or_malformed_replies(qc, verdicts):
+    assert qc._parse_batched_plausibility_response(answer(verdicts), IDS) is None
+
+
+def test_only_the_requested_distractors_are_needed(qc):
+    response = answer({"distractor2": {"score": 1, "reasoning": "r"}})
+    
+    assert list(qc._parse_batched_plausibility_response(response, ["distractor2"])) == ["distractor2"]
+
+
+def test_one_call_judges_every_distractor(qc, fake_client):
+    fake_client.replies = [answer({d_id: {"score": 1, "reasoning": "r"} for d_id in IDS})]
+    
+    result = asyncio.run(qc._check_distractor_plausibility(QUESTION, PASSAGE, "RHS-1.A", batched=True))
+    
+    assert len(fake_client.requests) == 1
+    assert "BATCH EVALUATION" in prompt_text(fake_client.requests[0])
+    assert [distractor["id"] for distractor in result["distractors"]] == IDS
+
+
+def test_an_unusable_batched_reply_falls_back_to_one_call_per_distractor(qc, fake_client):
+    def responder(request):
+        if "BATCH EVALUATION" in prompt_text(request):
+            return "<answer>I could not decide.</answer>"
+        return '<answer>{"score": 1, "reasoning": "plausible"}</answer>'
+    
+    fake_client.responder = responder
+    
+    result = asyncio.run(qc._check_distractor_plausibility(QUESTION, PASSAGE, "RHS-1.A", batched=True))
+    
+    assert len(fake_client.requests) == 4
+    assert all(distractor["is_plausible"] for distractor in result["distractors"])
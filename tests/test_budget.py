@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+import claude_client
+from budget import POLICY_BEST, BudgetExhausted, CallBudget, current_budget
+from conftest import make_message
+
+REQUEST = {
+    "model": "claude-test",
+    "max_tokens": 100,
+    "messages": [{"role": "user", "content": "Evaluate the question"}]
+}
+
+
+def test_reserve_call_stops_at_the_call_limit():
+    budget = CallBudget(max_calls=2)
+    
+    budget.reserve_call()
+    budget.reserve_call()
+    
+    with pytest.raises(BudgetExhausted, match="call budget of 2"):
+        budget.reserve_call()
+    assert budget.calls == 2
+
+
+def test_zero_limits_mean_unlimited():
+    budget = CallBudget()
+    
+    for _ in range(100):
+        budget.reserve_call()
+    budget.charge(make_message("text", input_tokens=10**6, output_tokens=10**6).usage)
+    
+    assert budget.can_afford(1000)
+
+
+def test_charge_counts_input_cache_writes_and_output():
+    budget = CallBudget(max_input_tokens=150)
+    usage = make_message("text", input_tokens=100, output_tokens=20).usage
+    usage.cache_creation_input_tokens = 60
+    
+    budget.charge(usage)
+    
+    assert budget.input_tokens == 160
+    assert budget.output_tokens == 20
+    assert "input token budget" in budget.exhausted_reason()
+
+
+def test_can_afford_looks_ahead():
+    budget = CallBudget(max_calls=5)
+    budget.reserve_call()
+    budget.reserve_call()
+    
+    assert budget.can_afford(3)
+    assert not budget.can_afford(4)
+
+
+def test_offer_candidate_keeps_the_best_scoring_candidate():
+    budget = CallBudget(policy=POLICY_BEST)
+    
+    budget.offer_candidate({"question": "weak"}, {"quality_checks": {"a": {"passes": True}, "b": {"passes": False}}})
+    budget.offer_candidate({"question": "strong"}, {"quality_checks": {"a": {"passes": True}, "b": {"passes": True}}})
+    budget.offer_candidate({"question": "weaker"}, {"quality_checks": {"a": {"passes": False}}})
+    
+    assert budget.best_candidate["question"] == "strong"
+    assert budget.best_score == 2
+
+
+def test_offer_candidate_skips_prevalidation_rejects():
+    budget = CallBudget(policy=POLICY_BEST)
+    
+    budget.offer_candidate({"question": "malformed"}, {"quality_checks": {"prevalidation": {"passes": False}}})
+    
+    assert budget.best_candidate is None
+
+
+def test_create_message_reserves_and_charges_the_current_budget(fake_client):
+    fake_client.replies = ["an acceptable response"]
+    budget = CallBudget(max_calls=1)
+    
+    async def run():
+        current_budget.set(budget)
+        await claude_client.create_message(stage=claude_client.STAGE_QC, **REQUEST)
+        with pytest.raises(BudgetExhausted):
+            await claude_client.create_message(stage=claude_client.STAGE_QC, **REQUEST)
+    
+    asyncio.run(run())
+    
+    assert budget.calls == 1
+    assert budget.input_tokens == 100
+    assert len(fake_client.requests) == 1
@@ -0,0 +1,88 @@
+from checkpoint import QuizJournal, job_key
+
+QUESTION = {"question": "What does the author do?", "correct_answer": "Argues x"}
+
+
+def test_resume_restores_progress(tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    journal = QuizJournal(path)
+    journal.record_passage("passage-1")
+    journal.record_distribution({"RHS-1.A": {"easy": 2}})
+    journal.record_question(0, QUESTION)
+    journal.record_explanation(0, "<p>Because.</p>")
+    journal.record_question(1, dict(QUESTION, question="Second"))
+    
+    resumed = QuizJournal(path, resume=True)
+    
+    assert resumed.resumed
+    assert resumed.passage_id == "passage-1"
+    assert resumed.distribution == {"RHS-1.A": {"easy": 2}}
+    questions = resumed.resumed_questions()
+    assert questions[0]["_explanation"] == "<p>Because.</p>"
+    assert "_explanation" not in questions[1]
+    assert resumed.quiz is None
+
+
+def test_records_are_written_once_per_slot(tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    journal = QuizJournal(path)
+    journal.record_question(0, QUESTION)
+    journal.record_question(0, dict(QUESTION, question="Replacement"))
+    journal.record_explanation(0, "first")
+    journal.record_explanation(0, "second")
+    
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert QuizJournal(path, resume=True).questions[0]["question"] == QUESTION["question"]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    journal = QuizJournal(path)
+    journal.record_passage("passage-1")
+    journal.record_question(0, QUESTION)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "question", "slot": 1, "quest')
+    
+    resumed = QuizJournal(path, resume=True)
+    
+    assert list(resumed.questions) == [0]
+
+
+def test_completed_quiz_is_restored(tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    journal = QuizJournal(path)
+    journal.record_passage("passage-1")
+    journal.record_complete({"questions": [QUESTION]})
+    
+    assert QuizJournal(path, resume=True).quiz == {"questions": [QUESTION]}
+
+
+def test_without_resume_the_old_journal_is_discarded(tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    QuizJournal(path).record_passage("passage-1")
+    
+    journal = QuizJournal(path)
+    
+    assert not journal.resumed
+    assert not (tmp_path / "job.jsonl").exists()
+
+
+def test_discard_forgets_progress(tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    journal = QuizJournal(path)
+    journal.record_passage("passage-1")
+    journal.record_question(0, QUESTION)
+    
+    journal.discard()
+    journal.record_passage("passage-2")
+    
+    resumed = QuizJournal(path, resume=True)
+    assert resumed.passage_id == "passage-2"
+    assert resumed.questions == {}
+
+
+def test_job_key_separates_jobs():
+    assert job_key("Lesson 1", None, 1, 6) == job_key("Lesson 1", None, 1, 6)
+    assert job_key("Lesson 1", None, 1, 6) != job_key("Lesson 1", None, 2, 6)
+    assert job_key("Lesson 1", None, 1, 6, "a") != job_key("Lesson 1", None, 1, 6, "b")
@@ -0,0 +1,69 @@
+import asyncio
+
+import main
+
+
+def _stub_generation(generator, monkeypatch, slot_count):
+    monkeypatch.setattr(main, "CONCURRENT_GENERATION", True)
+    monkeypatch.setattr(generator, "_build_question_slots", lambda passage, distribution: [
+        {"index": index} for index in range(slot_count)
+    ])
+    monkeypatch.setattr(generator, "_serve_slots_from_bank", lambda passage, slots: {})
+    
+    async def fake_generate_slot(passage, slot, previous_questions):
+        return {"question": f"Question {slot['index']}", "slot": slot["index"]}
+    
+    monkeypatch.setattr(generator, "_generate_slot", fake_generate_slot)
+
+
+def test_failing_explanations_do_not_stall_the_pipeline(generator, monkeypatch):
+    monkeypatch.setattr(main, "EXPLANATION_QUEUE_SIZE", 1)
+    monkeypatch.setattr(main, "EXPLANATION_WORKERS", 1)
+    _stub_generation(generator, monkeypatch, 6)
+    
+    async def slow_explanation(question, passage):
+        await asyncio.sleep(0.01)
+        if question["slot"] == 1:
+            raise RuntimeError("explainer failed")
+        return f"Explanation {question['slot']}"
+    
+    async def on_explanation(slot_index, explanation):
+        if slot_index == 3:
+            raise RuntimeError("callback failed")
+    
+    monkeypatch.setattr(generator, "generate_explanation", slow_explanation)
+    
+    questions, explanations = asyncio.run(asyncio.wait_for(
+        generator._generate_questions_with_explanations({"title": "Passage"}, {}, on_explanation=on_explanation),
+        timeout=5
+    ))
+    
+    assert len(questions) == 6
+    assert "1" not in explanations
+    assert explanations["0"] == "Explanation 0"
+    assert explanations["5"] == "Explanation 5"
+
+
+def test_prefilled_explanations_are_not_queued(generator, monkeypatch):
+    _stub_generation(generator, monkeypatch, 2)
+    explained = []
+    generated = []
+    
+    async def fake_explanation(question, passage):
+        explained.append(question["slot"])
+        return f"Explanation {question['slot']}"
+    
+    async def on_question(slot_index, question):
+        generated.append(slot_index)
+    
+    monkeypatch.setattr(generator, "generate_explanation", fake_explanation)
+    prefilled = {0: {"question": "Question 0", "slot": 0, "_explanation": "Stored explanation"}}
+    
+    questions, explanations = asyncio.run(generator._generate_questions_with_explanations(
+        {"title": "Passage"}, {}, on_question=on_question, prefilled=prefilled
+    ))
+    
+    assert len(questions) == 2
+    assert explained == [1]
+    assert generated == [1]
+    assert explanations == {"0": "Stored explanation", "1": "Explanation 1"}
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import prompt_text
+from quality_control import QuestionQualityControl
+
+CHECKS = ["depth", "precision", "textual evidence"]
+
+PASSAGE = {"id": "passage-1", "title": "The Harbor", "author": "A. Writer", "type": "Literary",
+           "text": "At dawn the boats returned with empty nets and tired crews."}
+
+QUESTION = {
+    "question": "What does the return of the boats suggest?",
+    "correct_answer": "The catch failed",
+    "distractor1": "The crews celebrated",
+    "distractor2": "The harbor closed",
+    "distractor3": "The boats stayed out"
+}
+
+
+@pytest.fixture
+def qc() -> QuestionQualityControl:
+    return QuestionQualityControl(api_key="sk-test-key-for-unit-tests")
+
+
+def answer(verdicts) -> str:
+    return f"Rubric by rubric analysis.\n<answer>\n{json.dumps(verdicts)}\n</answer>"
+
+
+def test_parses_a_verdict_per_check(qc):
+    response = answer({
+        "depth": {"score": 1, "reasoning": "requires inference"},
+        "precision": {"score": "0", "reasoning": "ambiguous wording"},
+        "textual evidence": {"score": 1}
+    })
+    
+    verdicts = qc._parse_fused_quality_check_response(response, CHECKS)
+    
+    assert {name: verdict["passes"] for name, verdict in verdicts.items()} == {
+        "depth": True, "precision": False, "textual evidence": True
+    }
+    assert verdicts["precision"] == {"passes": False, "score": 0, "reasoning": "ambiguous wording"}
+    assert verdicts["textual evidence"]["reasoning"] == ""
+
+
+def test_malformed_and_missing_verdicts_are_left_out(qc):
+    response = answer({"depth": {"score": 2}, "precision": "pass", "extra": {"score": 1}})
+    
+    assert qc._parse_fused_quality_check_response(response, CHECKS) == {}
+    
+    response = answer({"depth": {"score": 1}, "precision": {"score": "yes"}})
+    assert list(qc._parse_fused_quality_check_response(response, CHECKS)) == ["depth"]
+
+
+def test_keyed_answer_prefers_the_most_complete_object(qc):
+    # A rubric's own example answer may be echoed before the real one
+    response = (
+        '<answer>{"score": 1, "reasoning": "example"}</answer>\n'
+        '```json\n{"depth": {"score": 1}}\n```\n'
+        + answer({check: {"score": 1} for check in CHECKS})
+    )
+    
+    assert set(qc._parse_keyed_answer(response, CHECKS)) == set(CHECKS)
+    assert qc._parse_keyed_answer("no json here", CHECKS) == {}
+
+
+@pytest.mark.parametrize("entry", [None, "1", {"reasoning": "no score"}, {"score": -1}, {"score": "high"}])
+def test_score_verdict_rejects_malformed_entries(qc, entry):
+    assert qc._parse_score_verdict(entry) is None
+
+
+def test_checks_without_a_fused_verdict_run_separately(qc, fake_client):
+    def responder(request):
+        if "FUSED EVALUATION" in prompt_text(request):
+            return answer({"depth": {"score": 1, "reasoning": "r"}, "precision": {"score": 0, "reasoning": "r"}})
+        return '<answer>{"score": 1, "reasoning": "separate"}</answer>'
+    
+    fake_client.responder = responder
+    
+    results = asyncio.run(qc._run_required_checks(CHECKS, QUESTION, PASSAGE, "RHS-1.A", fused=True))
+    
+    assert len(fake_client.requests) == 2
+    assert [results[check]["passes"] for check in CHECKS] == [True, False, True]
+    assert results["textual evidence"]["reasoning"] == "separate"
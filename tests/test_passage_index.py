@@ -0,0 +1,74 @@
+from passage_index import PassageIndex, build_passage_indexes, cited_paragraphs, extract_quotes, normalize_words
+
+PASSAGE = (
+    "<p><em>1&nbsp;&nbsp;&nbsp;&nbsp;</em>The harbor lights burned all night while the fishermen waited.</p>"
+    "<p><em>2&nbsp;&nbsp;&nbsp;&nbsp;</em>At dawn the boats returned with empty nets and tired crews.</p>"
+    "<p><em>3&nbsp;&nbsp;&nbsp;&nbsp;</em>The town council promised a new pier before winter arrived.</p>"
+)
+
+
+def test_normalize_words_drops_markup_and_punctuation():
+    assert normalize_words("<em>The</em> boats&mdash;returned, “empty”!") == ["the", "boats", "returned", "empty"]
+
+
+def test_extract_quotes_skips_short_quotes():
+    text = 'The word "nets" and the phrase "returned with empty nets" matter.'
+    
+    assert extract_quotes(text) == ["returned with empty nets"]
+
+
+def test_contains_accepts_passage_quotes_and_rejects_invented_ones():
+    index = PassageIndex(PASSAGE)
+    
+    assert index.contains("the boats returned with empty nets")
+    assert not index.contains("the mayor resigned in disgrace")
+    assert index.unverified_quotes('The author writes "the mayor resigned in disgrace" here.') == [
+        "the mayor resigned in disgrace"
+    ]
+
+
+def test_build_passage_indexes_keys_by_passage_id():
+    indexes = build_passage_indexes([{"id": "p1", "text": PASSAGE}, {"id": "p2", "text": "Plain text."}, {"text": "No ID."}])
+    
+    assert set(indexes) == {"p1", "p2"}
+    assert indexes["p2"].contains("plain text")
+
+
+def test_cited_paragraphs_expands_ranges():
+    assert cited_paragraphs("In paragraphs 1-3, the author") == [1, 2, 3]
+    assert cited_paragraphs("Paragraph 2 shows") == [2]
+    assert cited_paragraphs("The author shows") == []
+
+
+def test_cited_paragraphs_bounds_ranges_by_the_paragraph_count():
+    numbers = cited_paragraphs("In paragraphs 2 to 2024, the author", paragraph_count=3)
+    
+    assert numbers == [2, 3, 2024]
+
+
+def test_index_finds_numbered_paragraphs():
+    index = PassageIndex(PASSAGE)
+    
+    assert sorted(index.paragraphs) == [1, 2, 3]
+    assert index.paragraphs[2]["text"] == "At dawn the boats returned with empty nets and tired crews."
+    assert PassageIndex("Plain text.").paragraphs == {}
+
+
+def test_quotes_are_located_in_their_paragraph():
+    index = PassageIndex(PASSAGE)
+    
+    position = index.find("promised a new pier")
+    
+    assert index.paragraph_at(position) == 3
+    assert index.paragraph_match_ratio("promised a new pier", [3]) == 1.0
+    assert index.paragraph_match_ratio("promised a new pier", [1]) < 0.5
+
+
+def test_excerpt_holds_only_the_cited_paragraphs():
+    index = PassageIndex(PASSAGE)
+    
+    excerpt = index.excerpt([2])
+    
+    assert "empty nets" in excerpt
+    assert "harbor lights" not in excerpt
+    assert index.excerpt([2, 7]) is None
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import quality_control
+from quality_control import QuestionQualityControl
+
+PASSAGE = {
+    "id": "passage-1",
+    "title": "The Harbor",
+    "author": "A. Writer",
+    "type": "Literary",
+    "text": (
+        "<p><em>1&nbsp;&nbsp;&nbsp;&nbsp;</em>The harbor lights burned all night while the fishermen waited.</p>"
+        "<p><em>2&nbsp;&nbsp;&nbsp;&nbsp;</em>At dawn the boats returned with empty nets and tired crews.</p>"
+    )
+}
+
+VALID_QUESTION = {
+    "question": "In paragraph 2, what does the phrase \"returned with empty nets\" suggest?",
+    "correct_answer": "The catch failed",
+    "distractor1": "The crews celebrated a record haul",
+    "distractor2": "The harbor was closed for repairs",
+    "distractor3": "The boats never left the dock"
+}
+
+
+@pytest.fixture
+def qc() -> QuestionQualityControl:
+    qc = QuestionQualityControl(api_key="sk-test-key-for-unit-tests")
+    qc.index_passages([PASSAGE])
+    return qc
+
+
+def errors_for(qc: QuestionQualityControl, **changes) -> list:
+    return qc._perform_basic_validation(dict(VALID_QUESTION, **changes), PASSAGE)["errors"]
+
+
+def test_well_formed_question_passes(qc):
+    assert qc._prevalidate(VALID_QUESTION, PASSAGE) is None
+
+
+def test_missing_fields_are_rejected(qc):
+    assert any("Missing fields: distractor3" in error for error in errors_for(qc, distractor3=" "))
+
+
+def test_duplicate_and_near_duplicate_options_are_rejected(qc):
+    assert any("identical" in error for error in errors_for(qc, distractor1="The catch failed!"))
+    assert any("nearly identical" in error
+               for error in errors_for(qc, distractor2="The boats never left the docks"))
+
+
+def test_longest_correct_answer_is_rejected(qc):
+    errors = errors_for(qc, correct_answer="The fishermen caught nothing at all during the long night at sea")
+    
+    assert "The correct answer is the longest option" in errors
+
+
+def test_line_references_and_unbalanced_html_are_rejected(qc):
+    assert any("line numbers" in error for error in errors_for(qc, question="In lines 3-4, what happens?"))
+    assert any("unbalanced HTML" in error for error in errors_for(qc, distractor1="The <em>crews celebrated"))
+
+
+def test_quotes_are_checked_against_the_passage(qc):
+    invented = errors_for(qc, question="What does \"the mayor resigned in disgrace\" suggest?")
+    
+    assert any("not in the passage" in error for error in invented)
+    assert qc._prevalidate(dict(VALID_QUESTION, question="What does \"returned with empty nets\" suggest?"), PASSAGE) is None
+
+
+def test_paragraph_references_are_checked_against_the_passage(qc):
+    missing_paragraph = errors_for(qc, question="In paragraph 9, what do the boats suggest?")
+    wrong_paragraph = errors_for(qc, question="In paragraph 1, what does \"returned with empty nets\" suggest?")
+    runaway_range = errors_for(qc, question="In paragraphs 1 to 2024, what do the boats suggest?")
+    
+    assert any("paragraph 9" in error for error in missing_paragraph)
+    assert any("from paragraph 2" in error for error in wrong_paragraph)
+    assert any("paragraph 2024" in error for error in runaway_range)
+
+
+def test_rejected_question_makes_no_claude_calls(qc, monkeypatch):
+    async def no_calls(*args, **kwargs):
+        raise AssertionError("Claude was called for a question rejected locally")
+    
+    monkeypatch.setattr(quality_control, "create_message", no_calls)
+    monkeypatch.setattr(quality_control, "LOCAL_PREVALIDATION", True)
+    
+    result = asyncio.run(qc.validate_question(
+        dict(VALID_QUESTION, distractor1=VALID_QUESTION["correct_answer"]), PASSAGE, "RHS-1.A"
+    ))
+    
+    assert not result["is_valid"]
+    assert result["quality_checks"]["prevalidation"]["passes"] is False
+    assert all(error.startswith("Failed prevalidation check:") for error in result["errors"])
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import pytest
+
+import claude_client
+from claude_client import AdmissionController
+from conftest import prompt_text
+from quality_control import REQUIRED_CHECKS, QuestionQualityControl
+
+PASSAGE = {"id": "passage-1", "title": "The Harbor", "author": "A. Writer", "type": "Literary",
+           "text": "At dawn the boats returned with empty nets and tired crews."}
+
+QUESTION = {
+    "question": "What does the return of the boats suggest?",
+    "correct_answer": "The catch failed",
+    "distractor1": "The crews celebrated",
+    "distractor2": "The harbor closed",
+    "distractor3": "The boats stayed out",
+    "difficulty": "2"
+}
+
+
+def passing_responder(request):
+    if "BATCH EVALUATION" in prompt_text(request):
+        verdicts = {f"distractor{i}": {"score": 1, "reasoning": "plausible"} for i in range(1, 4)}
+        return f"<answer>{json.dumps(verdicts)}</answer>"
+    return '<answer>{"score": 1, "reasoning": "looks right"}</answer>'
+
+
+@pytest.fixture
+def qc(monkeypatch) -> QuestionQualityControl:
+    # Enough admission slots that only the validation itself limits concurrency
+    monkeypatch.setattr(claude_client, "admission", AdmissionController(20, {
+        claude_client.STAGE_GENERATION: 0, claude_client.STAGE_QC: 0, claude_client.STAGE_EXPLANATION: 0
+    }))
+    return QuestionQualityControl(api_key="sk-test-key-for-unit-tests")
+
+
+def test_required_checks_and_plausibility_are_dispatched_together(qc, fake_client):
+    fake_client.responder = passing_responder
+    fake_client.delay = 0.02
+    
+    result = asyncio.run(qc._perform_advanced_validation(QUESTION, PASSAGE, "RHS-1.A", []))
+    
+    # Six rubric calls and one batched plausibility call, all in flight at once
+    assert len(fake_client.requests) == len(REQUIRED_CHECKS) + 1
+    assert fake_client.peak_in_flight == len(REQUIRED_CHECKS) + 1
+    assert result["is_valid"]
+    assert list(result["quality_checks"]) == list(REQUIRED_CHECKS) + ["plausibility"]
+
+
+def test_a_failing_check_surfaces_after_the_others_settle(qc, monkeypatch):
+    finished = []
+    
+    async def fake_check(check_name, question, passage, standard_id, task_id=""):
+        if check_name == "depth":
+            raise RuntimeError("depth check broke")
+        await asyncio.sleep(0.01)
+        finished.append(check_name)
+        return {"passes": True, "score": 1, "reasoning": "ok"}
+    
+    async def fake_plausibility(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        finished.append("plausibility")
+        return {"passes": True, "score": 1, "reasoning": "ok"}
+    
+    monkeypatch.setattr(qc, "_run_timed_quality_check", fake_check)
+    monkeypatch.setattr(qc, "_run_plausibility_check", fake_plausibility)
+    
+    with pytest.raises(RuntimeError, match="depth check broke"):
+        asyncio.run(qc._perform_advanced_validation(QUESTION, PASSAGE, "RHS-1.A", []))
+    
+    assert sorted(finished) == sorted([name for name in REQUIRED_CHECKS if name != "depth"] + ["plausibility"])
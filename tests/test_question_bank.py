@@ -0,0 +1,88 @@
+import pytest
+
+from question_bank import MODE_SERVE, MODE_STORE, QuestionBank
+
+KEY = ("passage-1", "RHS-1.A", "1", "reading")
+
+
+def make_question(number: int) -> dict:
+    return {
+        "question": f"Question {number}?",
+        "correct_answer": f"Answer {number}",
+        "distractor1": "First distractor",
+        "distractor2": "Second distractor",
+        "distractor3": "Third distractor"
+    }
+
+
+@pytest.fixture
+def bank(tmp_path) -> QuestionBank:
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"), mode=MODE_SERVE)
+    yield bank
+    bank.close()
+
+
+def test_store_does_not_duplicate_a_question(bank):
+    first_id, _ = bank.store(*KEY, make_question(1))
+    # The fingerprint ignores case and spacing
+    second_id, _ = bank.store(*KEY, dict(make_question(1), question="  question 1? "))
+    
+    assert second_id == first_id
+    assert bank.count(*KEY) == 1
+
+
+def test_store_is_a_no_op_when_off(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"))
+    
+    assert bank.store(*KEY, make_question(1)) == (None, False)
+
+
+def test_take_serves_least_served_first_and_honours_exclusions(bank):
+    first_id, _ = bank.store(*KEY, make_question(1))
+    second_id, _ = bank.store(*KEY, make_question(2))
+    bank.attach_explanation(first_id, "<p>Because.</p>")
+    
+    served = bank.take(*KEY, count=1, exclude_ids=[second_id])
+    assert [question["_bank_id"] for question in served] == [first_id]
+    assert served[0]["_explanation"] == "<p>Because.</p>"
+    
+    # The first question has now been served once, so the second one comes first
+    served = bank.take(*KEY, count=1)
+    assert served[0]["_bank_id"] == second_id
+
+
+def test_take_only_serves_in_serve_mode(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"), mode=MODE_STORE)
+    bank.store(*KEY, make_question(1))
+    
+    assert bank.take(*KEY, count=3) == []
+    bank.close()
+
+
+def test_take_is_scoped_to_the_slot_key(bank):
+    bank.store(*KEY, make_question(1))
+    bank.store("passage-2", "RHS-1.A", "1", "reading", make_question(2))
+    bank.store("passage-1", "RHS-1.A", "2", "reading", make_question(3))
+    
+    served = bank.take(*KEY, count=5)
+    
+    assert [question["question"] for question in served] == ["Question 1?"]
+
+
+def test_store_reports_whether_the_question_was_new(bank):
+    assert bank.store(*KEY, make_question(1)) == (1, True)
+    assert bank.store(*KEY, make_question(1)) == (1, False)
+
+
+def test_questions_lists_a_key_without_serving_it(bank):
+    bank.store(*KEY, make_question(1))
+    bank.store(*KEY, make_question(2))
+    
+    listed = bank.questions(*KEY)
+    
+    assert [question["question"] for question in listed] == ["Question 1?", "Question 2?"]
+    assert all(question["_bank_id"] for question in listed)
+    # Listing does not count as serving, so both are still unserved
+    bank.take(*KEY, count=1)
+    served_counts = bank._connect().execute("SELECT served_count FROM questions ORDER BY served_count").fetchall()
+    assert served_counts == [(0,), (1,)]
@@ -0,0 +1,57 @@
+import asyncio
+
+from checkpoint import QuizJournal
+
+PASSAGE = {"id": "passage-1", "title": "Passage", "author": "", "type": "", "text": "Text."}
+
+
+def test_closing_the_stream_early_stops_the_producer(generator, monkeypatch):
+    state = {}
+    
+    async def slow_generate_quiz(lesson_name, standard_id, difficulty, num_questions, emit, journal=None):
+        await emit({"event": "passage", "passage": PASSAGE})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+    
+    monkeypatch.setattr(generator, "_generate_quiz", slow_generate_quiz)
+    
+    async def consume_first_event():
+        stream = generator.generate_quiz_stream(standard_id="RHS-1.A")
+        event = await stream.__anext__()
+        await stream.aclose()
+        # The producer has finished unwinding by the time aclose returns
+        return event, dict(state)
+    
+    event, state_after_close = asyncio.run(asyncio.wait_for(consume_first_event(), timeout=5))
+    
+    assert event["event"] == "passage"
+    assert state_after_close == {"cancelled": True}
+
+
+def test_completed_journal_replays_its_events(generator, tmp_path):
+    path = str(tmp_path / "job.jsonl")
+    journal = QuizJournal(path)
+    journal.record_passage(PASSAGE["id"])
+    journal.record_question(0, {"question": "First"})
+    journal.record_question(2, {"question": "Third"})
+    journal.record_complete({
+        "passage": PASSAGE,
+        "questions": [{"question": "First", "explanation": "Because."}, {"question": "Third"}]
+    })
+    
+    async def collect():
+        return [event async for event in generator.generate_quiz_stream(
+            standard_id="RHS-1.A", journal=QuizJournal(path, resume=True)
+        )]
+    
+    events = asyncio.run(collect())
+    
+    assert [event["event"] for event in events] == ["passage", "question", "explanation", "question", "quiz"]
+    assert events[0]["passage"] == PASSAGE
+    assert events[1] == {"event": "question", "slot": 0, "question": {"question": "First"}}
+    assert events[2] == {"event": "explanation", "slot": 0, "explanation": "Because."}
+    assert events[3]["slot"] == 2
+    assert events[4]["quiz"]["questions"][0]["explanation"] == "Because."
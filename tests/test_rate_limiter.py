@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import time
+
+import pytest
+
+import claude_client
+from claude_client import AdmissionController
+from rate_limiter import RateLimiter, TokenBucket, estimate_input_tokens
+
+
+def headers(name: str, limit: int, remaining: int, reset: str = "") -> dict:
+    return {
+        f"anthropic-ratelimit-{name}-limit": str(limit),
+        f"anthropic-ratelimit-{name}-remaining": str(remaining),
+        f"anthropic-ratelimit-{name}-reset": reset
+    }
+
+
+def test_bucket_refills_at_its_per_minute_rate(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    bucket = TokenBucket("requests", 60)
+    
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    
+    now[0] += 30
+    assert bucket.wait_time(30) == 0
+    assert bucket.wait_time(31) == pytest.approx(1.0)
+
+
+def test_unknown_bucket_never_waits():
+    bucket = TokenBucket("requests")
+    
+    bucket.consume(10**6)
+    
+    assert bucket.wait_time(10**6) == 0
+
+
+def test_headers_teach_limits_and_only_lower_the_level():
+    limiter = RateLimiter()
+    
+    limiter.record_response(headers("requests", 50, 40), 0)
+    assert limiter.buckets["requests"].limit == 50
+    assert limiter.buckets["requests"].level == pytest.approx(40, abs=0.1)
+    
+    # Calls admitted after the server's snapshot are already deducted locally
+    limiter.buckets["requests"].consume(20)
+    limiter.record_response(headers("requests", 50, 45), 0)
+    assert limiter.buckets["requests"].level == pytest.approx(20, abs=0.1)
+
+
+def test_actual_usage_replaces_the_estimate():
+    limiter = RateLimiter(input_tokens_per_minute=10000, output_tokens_per_minute=10000)
+    
+    class Usage:
+        input_tokens = 300
+        cache_creation_input_tokens = 200
+        output_tokens = 50
+    
+    asyncio.run(limiter.acquire(1000))
+    limiter.record_response({}, 1000, Usage())
+    
+    assert limiter.buckets["input-tokens"].level == pytest.approx(9500, abs=1)
+    assert limiter.buckets["output-tokens"].level == pytest.approx(9950, abs=1)
+
+
+def test_exhausted_limit_blocks_until_its_reset():
+    limiter = RateLimiter()
+    reset = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=20)).isoformat()
+    
+    limiter.record_response(headers("input-tokens", 40000, 0, reset), 0)
+    
+    assert 18 < limiter.blocked_until - time.monotonic() <= 20
+
+
+def test_rate_limited_response_honours_retry_after():
+    limiter = RateLimiter()
+    
+    limiter.record_rate_limited({"retry-after": "7"})
+    
+    assert 6 < limiter.blocked_until - time.monotonic() <= 7
+
+
+def test_acquire_waits_for_the_bucket_to_refill():
+    limiter = RateLimiter(requests_per_minute=1200)
+    limiter.buckets["requests"].consume(1200)
+    
+    async def run():
+        start = time.monotonic()
+        await limiter.acquire(1)
+        return time.monotonic() - start
+    
+    # 1200 per minute is one request every 50ms
+    assert asyncio.run(run()) >= 0.04
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter(requests_per_minute=1, enabled=False)
+    limiter.blocked_until = time.monotonic() + 60
+    
+    asyncio.run(asyncio.wait_for(limiter.acquire(10**6), timeout=1))
+
+
+def test_input_estimate_grows_with_the_prompt():
+    short = estimate_input_tokens({"messages": [{"role": "user", "content": "Hi"}]})
+    long = estimate_input_tokens({"system": "x" * 4000, "messages": [{"role": "user", "content": "Hi"}]})
+    
+    assert short >= 1
+    assert long >= short + 1000
+
+
+def test_release_returns_the_reservation_up_to_capacity():
+    limiter = RateLimiter(requests_per_minute=100, input_tokens_per_minute=10000)
+    asyncio.run(limiter.acquire(4000))
+    
+    limiter.release(4000, request_sent=False)
+    
+    assert limiter.buckets["input-tokens"].level == pytest.approx(10000, abs=1)
+    assert limiter.buckets["requests"].level == pytest.approx(100, abs=0.1)
+    
+    limiter.release(4000)
+    assert limiter.buckets["input-tokens"].level == pytest.approx(10000, abs=1)
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    """A fresh limiter with known limits, used by create_message."""
+    limiter = RateLimiter(requests_per_minute=100, input_tokens_per_minute=100000)
+    monkeypatch.setattr(claude_client, "rate_limiter", limiter)
+    return limiter
+
+
+REQUEST = {"model": "claude-test", "max_tokens": 100, "messages": [{"role": "user", "content": "x" * 4000}]}
+
+
+def test_failed_call_gives_back_its_input_tokens(limiter, fake_client):
+    def responder(request):
+        raise RuntimeError("connection reset")
+    
+    fake_client.responder = responder
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(claude_client.create_message(stage=claude_client.STAGE_QC, **REQUEST))
+    
+    assert limiter.buckets["input-tokens"].level == pytest.approx(100000, abs=1)
+    # The request did reach the API
+    assert limiter.buckets["requests"].level == pytest.approx(99, abs=0.1)
+
+
+def test_call_cancelled_before_it_is_sent_gives_back_its_request(limiter, fake_client, monkeypatch):
+    controller = AdmissionController(1, {claude_client.STAGE_QC: 0})
+    monkeypatch.setattr(claude_client, "admission", controller)
+    
+    async def run():
+        async with controller.admit(claude_client.STAGE_QC):
+            call = asyncio.ensure_future(claude_client.create_message(stage=claude_client.STAGE_QC, **REQUEST))
+            await asyncio.sleep(0.01)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+    
+    asyncio.run(run())
+    
+    assert fake_client.requests == []
+    assert limiter.buckets["input-tokens"].level == pytest.approx(100000, abs=1)
+    assert limiter.buckets["requests"].level == pytest.approx(100, abs=0.1)
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+import claude_client
+from conftest import make_message
+from response_cache import MODE_READ_ONLY, MODE_READ_WRITE, ResponseCache
+
+REQUEST = {
+    "model": "claude-test",
+    "max_tokens": 100,
+    "messages": [{"role": "user", "content": "Write a question"}]
+}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch) -> ResponseCache:
+    """A read-write cache in a temporary directory, used by create_message."""
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), mode=MODE_READ_WRITE)
+    monkeypatch.setattr(claude_client, "response_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_put_then_get_returns_the_stored_message(cache):
+    cache.put(REQUEST, make_message("stored response"))
+    
+    cached = cache.get(REQUEST)
+    
+    assert cached is not None
+    assert cached.content[0].text == "stored response"
+    assert cache.hits == 1
+
+
+def test_salt_keeps_samples_apart(cache):
+    cache.put(REQUEST, make_message("first sample"), salt="attempt 0")
+    
+    assert cache.get(REQUEST, salt="attempt 1") is None
+    assert cache.get(REQUEST) is None
+    assert cache.get(REQUEST, salt="attempt 0").content[0].text == "first sample"
+
+
+def test_key_without_salt_is_unchanged():
+    assert ResponseCache.make_key(REQUEST) == ResponseCache.make_key(dict(REQUEST))
+    assert ResponseCache.make_key(REQUEST) != ResponseCache.make_key(REQUEST, salt="attempt 0")
+
+
+def test_read_only_cache_does_not_store(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), mode=MODE_READ_ONLY)
+    
+    cache.put(REQUEST, make_message("not stored"))
+    
+    assert cache.get(REQUEST) is None
+    cache.close()
+
+
+def test_create_message_serves_repeated_requests_from_cache(cache, fake_client):
+    fake_client.replies = ["a fresh response"]
+    
+    async def run():
+        first = await claude_client.create_message(stage=claude_client.STAGE_QC, **REQUEST)
+        second = await claude_client.create_message(stage=claude_client.STAGE_QC, **REQUEST)
+        return first, second
+    
+    first, second = asyncio.run(run())
+    
+    assert first.content[0].text == second.content[0].text == "a fresh response"
+    assert len(fake_client.requests) == 1
+
+
+def test_create_message_does_not_cache_rejected_responses(cache, fake_client):
+    fake_client.replies = ["short", "a response long enough"]
+    
+    async def run():
+        with pytest.raises(ValueError, match="too short"):
+            await claude_client.create_message(stage=claude_client.STAGE_QC, min_text_length=10, **REQUEST)
+        return await claude_client.create_message(stage=claude_client.STAGE_QC, min_text_length=10, **REQUEST)
+    
+    message = asyncio.run(run())
+    
+    assert message.content[0].text == "a response long enough"
+    assert len(fake_client.requests) == 2
+
+
+def test_create_message_samples_each_generation_attempt(cache, fake_client):
+    fake_client.replies = ["first candidate", "second candidate"]
+    
+    async def run():
+        first = await claude_client.create_message(stage=claude_client.STAGE_GENERATION, cache_salt="attempt 0", **REQUEST)
+        second = await claude_client.create_message(stage=claude_client.STAGE_GENERATION, cache_salt="attempt 1", **REQUEST)
+        return first, second
+    
+    first, second = asyncio.run(run())
+    
+    assert first.content[0].text == "first candidate"
+    assert second.content[0].text == "second candidate"
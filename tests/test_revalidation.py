@@ -0,0 +1,82 @@
+import pytest
+
+from quality_control import QUESTION_FIELDS, QuestionQualityControl
+
+QUESTION = {
+    "question": "What does the return of the boats suggest?",
+    "correct_answer": "The catch failed",
+    "distractor1": "The crews celebrated",
+    "distractor2": "The harbor closed",
+    "distractor3": "The boats stayed out",
+    "difficulty": "2"
+}
+
+
+def verdict(passes: bool = True) -> dict:
+    return {"passes": passes, "score": 1 if passes else 0, "reasoning": "r"}
+
+
+VALIDATION = {
+    "quality_checks": {
+        "formatting": verdict(),
+        "precision": verdict(),
+        "depth": verdict(False),
+        "plausibility": {
+            "passes": True,
+            "distractor_results": [
+                {"id": f"distractor{i}", "is_plausible": True, "reasoning": "r"} for i in range(1, 4)
+            ]
+        }
+    }
+}
+
+
+@pytest.fixture
+def qc() -> QuestionQualityControl:
+    qc = QuestionQualityControl(api_key="sk-test-key-for-unit-tests")
+    qc.check_dependencies = {
+        "formatting": set(QUESTION_FIELDS),
+        "precision": {"question"},
+        "depth": {"question"}
+    }
+    return qc
+
+
+def test_template_fields_follow_the_placeholders():
+    assert QuestionQualityControl._template_fields("Stem: {question} Key: {correct_answer}") == {"question", "correct_answer"}
+    assert QuestionQualityControl._template_fields("{QUESTION_JSON}") == set(QUESTION_FIELDS)
+    # A template with no recognised placeholder is assumed to read everything
+    assert QuestionQualityControl._template_fields("Evaluate {passage}") == set(QUESTION_FIELDS)
+
+
+def test_checks_that_do_not_read_a_changed_field_are_carried_over(qc):
+    improved = dict(QUESTION, distractor2="The harbor was rebuilt")
+    
+    reused = qc._plan_revalidation(QUESTION, VALIDATION, improved)
+    
+    assert "precision" in reused
+    assert "formatting" not in reused
+    # Failed verdicts are always re-run
+    assert "depth" not in reused
+    assert sorted(reused["plausibility"]) == ["distractor1", "distractor3"]
+
+
+def test_changing_the_stem_reruns_every_plausibility_verdict(qc):
+    improved = dict(QUESTION, question="What do the empty nets suggest?")
+    
+    reused = qc._plan_revalidation(QUESTION, VALIDATION, improved)
+    
+    assert "precision" not in reused
+    assert "plausibility" not in reused
+
+
+def test_whitespace_only_edits_change_nothing(qc):
+    improved = dict(QUESTION, correct_answer="  The catch failed ")
+    
+    reused = qc._plan_revalidation(QUESTION, VALIDATION, improved)
+    
+    assert sorted(reused) == ["formatting", "plausibility", "precision"]
+
+
+def test_a_new_difficulty_reruns_everything(qc):
+    assert qc._plan_revalidation(QUESTION, VALIDATION, dict(QUESTION, difficulty="3")) == {}
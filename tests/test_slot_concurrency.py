@@ -0,0 +1,43 @@
+import asyncio
+
+import main
+
+
+def test_slots_overlap_under_the_semaphore_and_keep_their_order(generator, monkeypatch):
+    monkeypatch.setattr(main, "MAX_WORKERS", 2)
+    in_flight = []
+    peak = []
+    
+    async def fake_generate_slot(passage, slot, previous_questions):
+        in_flight.append(slot["index"])
+        peak.append(len(in_flight))
+        # Later slots finish first, so completion order differs from slot order
+        await asyncio.sleep(0.01 * (5 - slot["index"]))
+        in_flight.remove(slot["index"])
+        return {"question": f"Question {slot['index']}"}
+    
+    monkeypatch.setattr(generator, "_generate_slot", fake_generate_slot)
+    slots = [{"index": index} for index in range(5)]
+    
+    questions = asyncio.run(generator._generate_slots_concurrently({"title": "Passage"}, slots))
+    
+    assert max(peak) == 2
+    assert [question["question"] for question in questions] == [f"Question {index}" for index in range(5)]
+
+
+def test_failed_slots_are_left_out(generator, monkeypatch):
+    async def fake_generate_slot(passage, slot, previous_questions):
+        return None if slot["index"] == 1 else {"question": f"Question {slot['index']}"}
+    
+    monkeypatch.setattr(generator, "_generate_slot", fake_generate_slot)
+    accepted = []
+    
+    async def on_question(index, question):
+        accepted.append(index)
+    
+    questions = asyncio.run(generator._generate_slots_concurrently(
+        {"title": "Passage"}, [{"index": index} for index in range(3)], on_question=on_question
+    ))
+    
+    assert [question["question"] for question in questions] == ["Question 0", "Question 2"]
+    assert sorted(accepted) == [0, 2]
@@ -0,0 +1,70 @@
+import asyncio
+
+import main
+
+
+def _speculate(generator, monkeypatch, max_parallel, max_candidates):
+    monkeypatch.setattr(main, "SPECULATIVE_GENERATION", True)
+    monkeypatch.setattr(main, "SPECULATIVE_MAX_PARALLEL", max_parallel)
+    monkeypatch.setattr(main, "SPECULATIVE_MAX_CANDIDATES", max_candidates)
+    # With no history the smoothed pass rate is 0.5, so 0.75 needs two candidates
+    monkeypatch.setattr(main, "SPECULATIVE_TARGET", 0.75)
+    return asyncio.run(generator.generate_question_for_standard_and_difficulty(
+        {"title": "Passage"}, "RHS-1.A", "easy", {}, [], task_id="slot"
+    ))
+
+
+def test_first_passing_candidate_cancels_the_others(generator, monkeypatch):
+    events = []
+    
+    async def fake_attempt(passage, standard_id, difficulty_level, example_question, previous_questions,
+                           attempt, task_id):
+        if attempt == 0:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                events.append("candidate 1 cancelled")
+                raise
+        events.append(f"candidate {attempt+1} passed")
+        return {"question": f"Candidate {attempt+1}"}
+    
+    monkeypatch.setattr(generator, "_attempt_question", fake_attempt)
+    
+    question = _speculate(generator, monkeypatch, max_parallel=2, max_candidates=4)
+    
+    assert question == {"question": "Candidate 2"}
+    assert events == ["candidate 2 passed", "candidate 1 cancelled"]
+    assert generator.candidate_stats[("RHS-1.A", "easy")] == (1, 1)
+
+
+def test_failed_candidates_are_replaced_up_to_the_limit(generator, monkeypatch):
+    attempts = []
+    
+    async def failing_attempt(passage, standard_id, difficulty_level, example_question, previous_questions,
+                              attempt, task_id):
+        attempts.append(attempt)
+        await asyncio.sleep(0)
+        return None
+    
+    monkeypatch.setattr(generator, "_attempt_question", failing_attempt)
+    
+    question = _speculate(generator, monkeypatch, max_parallel=2, max_candidates=5)
+    
+    assert question is None
+    assert sorted(attempts) == [0, 1, 2, 3, 4]
+    assert generator.candidate_stats[("RHS-1.A", "easy")] == (5, 0)
+
+
+def test_width_follows_the_observed_pass_rate(generator, monkeypatch):
+    monkeypatch.setattr(main, "SPECULATIVE_MAX_PARALLEL", 4)
+    monkeypatch.setattr(main, "SPECULATIVE_MAX_CANDIDATES", 6)
+    monkeypatch.setattr(main, "SPECULATIVE_TARGET", 0.9)
+    
+    generator.candidate_stats[("RHS-1.A", "easy")] = (18, 18)
+    assert generator._speculative_width("RHS-1.A", "easy") == 1
+    
+    generator.candidate_stats[("RHS-1.A", "easy")] = (8, 0)
+    assert generator._speculative_width("RHS-1.A", "easy") == 4
+    
+    # Unseen combinations fall back to the pass rate over all candidates
+    assert generator._speculative_width("RHS-2.B", "hard") == 4
@@ -0,0 +1,17 @@
+QUESTION = {"correct_answer": "A", "distractor1": "B", "distractor2": "C", "distractor3": "D"}
+
+
+def test_template_points_at_the_cited_paragraphs(generator):
+    single = generator._template_explanation(dict(QUESTION, question="In paragraph 3, what does the author mean?"))
+    ranged = generator._template_explanation(dict(QUESTION, question="Based on paragraphs 2-4, why does she leave?"))
+    
+    assert "reread paragraph 3 and" in single
+    assert "reread paragraphs 2, 3 and 4 and" in ranged
+
+
+def test_template_refers_to_paragraphs_without_a_citation(generator):
+    explanation = generator._template_explanation(dict(QUESTION, question="What is the theme of the passage?"))
+    
+    assert "reread the paragraphs the question refers to" in explanation
+    assert "lines" not in explanation
+    assert '"B"; "C"; "D"' in explanation
@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from budget import CallBudget, BudgetExhausted, current_budget
+from conftest import prompt_text
+from quality_control import QuestionQualityControl, ValidationBatcher
+
+PASSAGE = {"id": "passage-1", "title": "The Harbor", "author": "A. Writer", "type": "Literary",
+           "text": "At dawn the boats returned with empty nets and tired crews."}
+OTHER_PASSAGE = dict(PASSAGE, id="passage-2")
+
+
+def make_question(number: int) -> dict:
+    return {
+        "question": f"What does the return of the boats suggest ({number})?",
+        "correct_answer": "The catch failed",
+        "distractor1": "The crews celebrated",
+        "distractor2": "The harbor closed",
+        "distractor3": "The boats stayed out"
+    }
+
+
+class StubQualityControl:
+    """Records each batch and bills one call of 100 input and 10 output tokens per question."""
+    
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.batches = []
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+    
+    async def validate_questions_batch(self, questions, passage, standard_ids, previous_questions, task_ids):
+        self.batches.append((passage["id"], [question["question"] for question in questions]))
+        budget = current_budget.get()
+        for _ in questions:
+            budget.reserve_call()
+            budget.charge(SimpleNamespace(input_tokens=100, output_tokens=10))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return [{"is_valid": True, "question": question["question"]} for question in questions]
+
+
+async def validate_in_slot(batcher, question, passage, budget=None):
+    """Validate from a task of its own, as a question slot would."""
+    if budget is not None:
+        current_budget.set(budget)
+    return await batcher.validate(question, passage, "RHS-1.A")
+
+
+def test_questions_are_grouped_by_passage():
+    qc = StubQualityControl()
+    batcher = ValidationBatcher(qc, window=0.01, max_size=10)
+    
+    async def run():
+        return await asyncio.gather(
+            validate_in_slot(batcher, make_question(1), PASSAGE),
+            validate_in_slot(batcher, make_question(2), OTHER_PASSAGE),
+            validate_in_slot(batcher, make_question(3), PASSAGE)
+        )
+    
+    results = asyncio.run(run())
+    
+    assert [result["question"] for result in results] == [make_question(n)["question"] for n in (1, 2, 3)]
+    assert sorted((passage_id, len(questions)) for passage_id, questions in qc.batches) == [
+        ("passage-1", 2), ("passage-2", 1)
+    ]
+
+
+def test_a_full_batch_is_sent_without_waiting_for_the_window():
+    qc = StubQualityControl()
+    batcher = ValidationBatcher(qc, window=30, max_size=2)
+    
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(
+            validate_in_slot(batcher, make_question(1), PASSAGE),
+            validate_in_slot(batcher, make_question(2), PASSAGE)
+        ), timeout=5)
+    
+    assert len(asyncio.run(run())) == 2
+    assert len(qc.batches) == 1
+
+
+def test_a_failed_batch_fails_every_waiter():
+    batcher = ValidationBatcher(StubQualityControl(error=RuntimeError("overloaded")), window=0.01)
+    
+    async def run():
+        return await asyncio.gather(
+            validate_in_slot(batcher, make_question(1), PASSAGE),
+            validate_in_slot(batcher, make_question(2), PASSAGE),
+            return_exceptions=True
+        )
+    
+    assert [str(outcome) for outcome in asyncio.run(run())] == ["overloaded", "overloaded"]
+
+
+def test_each_slot_is_charged_its_share_of_the_batch():
+    batcher = ValidationBatcher(StubQualityControl(), window=0.01)
+    budgets = [CallBudget(), CallBudget(max_calls=10)]
+    
+    async def run():
+        await asyncio.gather(*(
+            validate_in_slot(batcher, make_question(n), PASSAGE, budget) for n, budget in enumerate(budgets)
+        ))
+    
+    asyncio.run(run())
+    
+    assert [(budget.calls, budget.input_tokens, budget.output_tokens) for budget in budgets] == [
+        (1, 100, 10), (1, 100, 10)
+    ]
+
+
+def test_a_slot_without_budget_left_does_not_join_a_batch():
+    qc = StubQualityControl()
+    batcher = ValidationBatcher(qc, window=0.01)
+    budget = CallBudget(max_calls=1)
+    budget.reserve_call()
+    
+    with pytest.raises(BudgetExhausted):
+        asyncio.run(validate_in_slot(batcher, make_question(1), PASSAGE, budget))
+    assert qc.batches == []
+
+
+def test_a_batch_is_cancelled_once_every_waiter_is():
+    qc = StubQualityControl(delay=10)
+    batcher = ValidationBatcher(qc, window=0.01)
+    
+    async def run():
+        slots = [asyncio.ensure_future(validate_in_slot(batcher, make_question(n), PASSAGE)) for n in (1, 2)]
+        while not qc.batches:
+            await asyncio.sleep(0.01)
+        slots[0].cancel()
+        await asyncio.sleep(0.01)
+        first_cancel_stopped_it = qc.cancelled
+        slots[1].cancel()
+        await asyncio.gather(*slots, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return first_cancel_stopped_it
+    
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5)) is False
+    assert qc.cancelled
+    assert not batcher._running
+
+
+def test_checks_without_a_batched_verdict_are_run_per_question(fake_client):
+    def responder(request):
+        if "CROSS-QUESTION EVALUATION" in prompt_text(request) or "BATCH EVALUATION" in prompt_text(request):
+            return "<answer>I could not decide.</answer>"
+        return '<answer>{"score": 1, "reasoning": "fine"}</answer>'
+    
+    fake_client.responder = responder
+    batcher = ValidationBatcher(QuestionQualityControl(api_key="sk-test-key-for-unit-tests"), window=0.01)
+    
+    async def run():
+        return await asyncio.gather(
+            validate_in_slot(batcher, make_question(1), PASSAGE),
+            validate_in_slot(batcher, make_question(2), PASSAGE)
+        )
+    
+    results = asyncio.run(run())
+    
+    assert all(result["is_valid"] for result in results)
+    cross_question = [request for request in fake_client.requests
+                      if "CROSS-QUESTION EVALUATION" in prompt_text(request)]
+    assert cross_question
+    assert len(fake_client.requests) > len(cross_question)
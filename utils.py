@@ -15,6 +15,7 @@ def with_retry(
     max_retries: int = 3,
     retry_delay: float = 1.0,
     exceptions_to_retry: List[Type[Exception]] = None,
+    exceptions_not_to_retry: List[Type[Exception]] = None,
     backoff_factor: float = 2.0,
     jitter_factor: float = 0.5,
     timeout: Optional[float] = None
@@ -27,6 +28,8 @@ def with_retry(
         retry_delay: Initial delay between retries in seconds.
         exceptions_to_retry: List of exception types to retry on. 
                             If None, retries on all exceptions.
+        exceptions_not_to_retry: Exception types that are re-raised at once,
+                                 even if they match exceptions_to_retry.
         backoff_factor: Factor to multiply delay by after each retry.
         jitter_factor: Maximum fraction of delay to add as random jitter.
         timeout: Optional timeout for each function call.
@@ -35,6 +38,7 @@ def with_retry(
         The decorated function with retry logic.
     """
     exceptions_to_retry = exceptions_to_retry or [Exception]
+    exceptions_not_to_retry = tuple(exceptions_not_to_retry or [])
     
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
@@ -49,6 +53,8 @@ def with_retry(
                     else:
                         return await func(*args, **kwargs)
                         
+                except exceptions_not_to_retry:
+                    raise
                 except tuple(exceptions_to_retry) as e:
                     error_messages.append(f"Attempt {attempt+1}: {type(e).__name__}: {str(e)}")
                     logger.warning(f"Attempt {attempt+1}/{max_retries} failed with error: {str(e)}")
@@ -91,6 +97,8 @@ def with_retry(
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
+                except exceptions_not_to_retry:
+                    raise
                 except tuple(exceptions_to_retry) as e:
                     error_messages.append(f"Attempt {attempt+1}: {type(e).__name__}: {str(e)}")
                     logger.warning(f"Attempt {attempt+1}/{max_retries} failed with error: {str(e)}")